@@ -3,6 +3,24 @@
 展示如何將數據與行為打包，以及私有屬性的應用
 """
 
+import hashlib
+import hmac
+import os
+import secrets
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from contextlib import nullcontext
+from functools import wraps
+from itertools import accumulate, chain, compress, count, islice
+from operator import mul
+
 print("=" * 80)
 print("封裝特性：將數據與行為打包成獨立單元")
 print("=" * 80)
@@ -10,41 +28,118 @@ print("=" * 80)
 # ========== 基礎封裝：類別與實例 ==========
 print("\n【1. 基礎封裝：類別作為藍圖】")
 
+# 每個帳戶的全域鎖定順序：同時鎖多個帳戶時一律由小到大取得，不會死結
+_lock_orders = count()
+
+
+class BatchSummary(namedtuple("BatchSummary", [
+        "applied", "deposited", "withdrawn", "balance",
+        "failed_index", "reason"])):
+    """
+    批次交易的結果摘要
+    failed_index 為 None 表示整批已入帳；否則整批都沒有入帳，
+    failed_index 是第一筆無法執行的交易位置（從 0 開始），reason 說明原因
+    """
+    __slots__ = ()
+    
+    @property
+    def ok(self):
+        return self.failed_index is None
+
+
 class BankAccount:
     """銀行帳戶類別 - 展示封裝的基本概念"""
     
-    def __init__(self, account_holder, initial_balance=0):
+    def __init__(self, account_holder, initial_balance=0, thread_safe=False):
         """
         建構器：在創建實例時自動調用
         :param account_holder: 帳戶持有人
         :param initial_balance: 初始餘額，預設為 0
+        :param thread_safe: 為 True 時，「檢查餘額再扣款」等操作以鎖保護，
+                            可由多個執行緒同時存提款與轉帳
         """
         # 實例變數：每個實例獨有的數據
         self.account_holder = account_holder
         self.balance = initial_balance
+        # 單底線：供同一模組的 transfer() 使用
+        self._lock = threading.RLock() if thread_safe else nullcontext()
+        self._lock_order = next(_lock_orders)
         print(f"✓ 已創建帳戶：{account_holder}，初始餘額：${initial_balance}")
     
     def deposit(self, amount):
         """存款方法 - 行為與數據封裝在一起"""
-        if amount > 0:
-            self.balance += amount
-            print(f"✓ {self.account_holder} 存款 ${amount}，餘額：${self.balance}")
-        else:
-            print("✗ 存款金額必須大於 0")
+        with self._lock:
+            if amount > 0:
+                self.balance += amount
+                print(f"✓ {self.account_holder} 存款 ${amount}，餘額：${self.balance}")
+            else:
+                print("✗ 存款金額必須大於 0")
     
     def withdraw(self, amount):
-        """提款方法"""
-        if amount > self.balance:
-            print(f"✗ 餘額不足！目前餘額：${self.balance}")
-        elif amount <= 0:
-            print("✗ 提款金額必須大於 0")
-        else:
-            self.balance -= amount
-            print(f"✓ {self.account_holder} 提款 ${amount}，餘額：${self.balance}")
+        """提款方法；成功時回傳 True"""
+        with self._lock:
+            if amount > self.balance:
+                print(f"✗ 餘額不足！目前餘額：${self.balance}")
+            elif amount <= 0:
+                print("✗ 提款金額必須大於 0")
+            else:
+                self.balance -= amount
+                print(f"✓ {self.account_holder} 提款 ${amount}，餘額：${self.balance}")
+                return True
+            return False
+    
+    def _debit(self, amount, pin=None):
+        """
+        轉出（由 transfer() 在兩個帳戶都鎖住時呼叫）
+        成功時回傳收尾函式，transfer() 放開鎖之後才呼叫；失敗時回傳 None
+        """
+        if not self.withdraw(amount):
+            return None
+        return lambda: None
+    
+    def _credit(self, amount):
+        """轉入（由 transfer() 在鎖內呼叫，金額已驗證）；回傳放開鎖之後要呼叫的收尾函式"""
+        with self._lock:
+            self.balance += amount
+            balance = self.balance
+        return lambda: print(
+            f"✓ {self.account_holder} 轉入 ${amount}，餘額：${balance}")
     
     def get_balance(self):
         """查詢餘額方法"""
         return self.balance
+    
+    def apply_batch(self, amounts):
+        """
+        批次交易：正數為存款、負數為提款，整批一起驗證
+        以前綴和（accumulate）一次算出每筆之後的餘額來檢查透支，
+        全部通過才一起入帳；否則不做任何變更，並回報第一筆失敗的位置
+        不逐筆輸出，回傳 BatchSummary
+        """
+        amounts = list(amounts)
+        with self._lock:
+            return self.__apply_batch(amounts)
+    
+    def __apply_batch(self, amounts):
+        failed_index, reason = None, None
+        if 0 in amounts:
+            failed_index, reason = amounts.index(0), "交易金額不能為 0"
+        balances = list(accumulate(chain((self.balance,), amounts)))
+        if min(balances) < 0:
+            # balances[i + 1] 是第 i 筆之後的餘額；只有提款會造成透支
+            overdraft = next((i for i, (amount, balance)
+                              in enumerate(zip(amounts, balances[1:]))
+                              if amount < 0 and balance < 0), None)
+            if overdraft is not None and (failed_index is None
+                                          or overdraft < failed_index):
+                failed_index, reason = overdraft, "餘額不足"
+        if failed_index is not None:
+            return BatchSummary(0, 0, 0, self.balance, failed_index, reason)
+        deposited = sum(amount for amount in amounts if amount > 0)
+        withdrawn = deposited - (balances[-1] - self.balance)
+        self.balance = balances[-1]
+        return BatchSummary(len(amounts), deposited, withdrawn, self.balance,
+                            None, None)
 
 
 # 創建實例（物件）
@@ -60,78 +155,751 @@ print("\n每個實例擁有獨立的數據：")
 account2.deposit(300)
 print(f"李四的餘額：${account2.get_balance()}")
 
+print("\n批次交易：整批驗證，全部通過才入帳")
+summary = account2.apply_batch([200, -50, -100])
+print(f"✓ 入帳 {summary.applied} 筆，存入 ${summary.deposited}，"
+      f"提出 ${summary.withdrawn}，餘額：${summary.balance}")
+summary = account2.apply_batch([100, -5000, 0])
+print(f"✗ 第 {summary.failed_index + 1} 筆失敗（{summary.reason}），"
+      f"整批未入帳，餘額：${summary.balance}")
+
 
 # ========== 進階封裝：私有屬性與訪問控制 ==========
 print("\n" + "=" * 80)
 print("【2. 進階封裝：私有屬性與訪問控制】")
 print("=" * 80)
 
+def _to_cents(amount):
+    """
+    金額換算成整數的「分」，避免浮點數累加誤差
+    不足一分的部分取最接近的分（例如 0.001 視為 0 分）
+    """
+    return round(amount * 100)
+
+
+def _dollars(cents):
+    """整數的「分」換回金額；整數元就回傳 int，顯示時與原本的寫法相同"""
+    return cents // 100 if cents % 100 == 0 else cents / 100
+
+
+# 交易時間戳記是 Unix 紀元的奈秒（寫進日誌，換一個程式復原也能比較）；
+# 以啟動時的差值加上單調時鐘換算，執行期間系統時鐘被調整也不會倒退
+_EPOCH_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def _now_ns():
+    return time.monotonic_ns() + _EPOCH_OFFSET_NS
+
+
+class TransactionLedger:
+    """
+    交易紀錄：以平行的型別陣列保存（操作代碼、金額（分）、時間戳記）
+    每 checkpoint_interval 筆記錄一次各操作的累計金額，查詢某個時間點的餘額
+    或某段期間的總額時最多只需重播一個區段；文字只在顯示時才產生
+    """
+    
+    DEPOSIT = 0
+    WITHDRAW = 1
+    LABELS = ("存款", "提款")
+    SIGNS = (1, -1)  # 對餘額的影響
+    
+    def __init__(self, opening_balance=0, checkpoint_interval=1024):
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval 必須大於 0")
+        self.opening = _to_cents(opening_balance)
+        self.interval = checkpoint_interval
+        self.ops = array("B")
+        self.amounts = array("q")
+        self.timestamps = array("q")  # Unix 紀元的奈秒
+        self.__totals = [0] * len(self.LABELS)  # 各操作目前的累計（分）
+        # 第 j 個檢查點 = 前 j * interval 筆中各操作的累計
+        self.__checkpoints = [array("q") for _ in self.LABELS]
+    
+    def record(self, op, amount, when=None):
+        """新增一筆交易（O(1)）"""
+        cents = _to_cents(amount)
+        if cents <= 0:
+            raise ValueError("交易金額必須大於 0")
+        if when is None:
+            when = _now_ns()
+        elif self.timestamps and when < self.timestamps[-1]:
+            raise ValueError("交易時間不能早於上一筆")
+        self._append_cents(op, cents, when)
+    
+    def _append_cents(self, op, cents, when):
+        """不做驗證的新增（供 record() 與日誌重播使用）"""
+        if len(self.ops) % self.interval == 0:
+            for checkpoints, total in zip(self.__checkpoints, self.__totals):
+                checkpoints.append(total)
+        self.ops.append(op)
+        self.amounts.append(cents)
+        self.timestamps.append(when)
+        self.__totals[op] += cents
+    
+    @classmethod
+    def _restore(cls, opening_cents, ops, amounts, timestamps,
+                 checkpoint_interval=1024):
+        """由快照中的陣列重建，檢查點以 accumulate 一次算出"""
+        ledger = cls(_dollars(opening_cents), checkpoint_interval)
+        ledger.ops, ledger.amounts, ledger.timestamps = ops, amounts, timestamps
+        for op in range(len(cls.LABELS)):
+            # 第 i 項 = 前 i 筆中操作 op 的累計
+            totals = list(accumulate(chain(
+                (0,), map(mul, amounts, map(op.__eq__, ops)))))
+            ledger.__checkpoints[op] = array(
+                "q", islice(totals, 0, len(ops), checkpoint_interval))
+            ledger.__totals[op] = totals[-1]
+        return ledger
+    
+    def copy(self):
+        """複製一份獨立的交易紀錄（之後對副本或原本的修改互不影響）"""
+        ledger = type(self)(_dollars(self.opening), self.interval)
+        for name in ("ops", "amounts", "timestamps"):
+            column = getattr(self, name)
+            setattr(ledger, name, array(column.typecode, column))
+        ledger.__totals = list(self.__totals)
+        ledger.__checkpoints = [array("q", checkpoints)
+                                for checkpoints in self.__checkpoints]
+        return ledger
+    
+    def __len__(self):
+        return len(self.ops)
+    
+    def __total_before(self, op, position):
+        """前 position 筆交易中，操作 op 的累計金額（分）"""
+        if position == len(self.ops):
+            return self.__totals[op]
+        block = position // self.interval
+        start = block * self.interval
+        matches = map(op.__eq__, self.ops[start:position])
+        return (self.__checkpoints[op][block]
+                + sum(compress(self.amounts[start:position], matches)))
+    
+    def __balance_before(self, position):
+        return self.opening + sum(sign * self.__total_before(op, position)
+                                  for op, sign in enumerate(self.SIGNS))
+    
+    @property
+    def balance_cents(self):
+        return self.__balance_before(len(self.ops))
+    
+    @property
+    def balance(self):
+        return _dollars(self.balance_cents)
+    
+    def balance_at(self, when):
+        """時間點 when（含）之前所有交易完成後的餘額"""
+        return _dollars(self.__balance_before(
+            bisect_right(self.timestamps, when)))
+    
+    def total_between(self, op, start=None, end=None):
+        """時間在 [start, end) 之間、操作為 op 的總金額；省略表示不設限"""
+        first = 0 if start is None else bisect_left(self.timestamps, start)
+        last = (len(self.ops) if end is None
+                else bisect_left(self.timestamps, end))
+        if last <= first:
+            return 0
+        return _dollars(self.__total_before(op, last)
+                        - self.__total_before(op, first))
+    
+    def format_entry(self, position):
+        op = self.ops[position]
+        sign = "+" if self.SIGNS[op] > 0 else "-"
+        return f"{self.LABELS[op]}: {sign}${_dollars(self.amounts[position])}"
+    
+    def format_entries(self, start=0, stop=None):
+        """把交易轉成文字（例如 "存款: +$500"），只在顯示時呼叫"""
+        stop = len(self.ops) if stop is None else stop
+        return [self.format_entry(i) for i in range(start, stop)]
+
+
+# 附加寫入後可用 fdatasync 的平台只同步資料（檔案長度也包含在內）
+_fsync = getattr(os, "fdatasync", os.fsync)
+_CRC = struct.Struct("<I")
+
+
+class WriteAheadLog:
+    """
+    預寫日誌（WAL）：每筆交易先附加到日誌檔，fsync 之後才算完成
+    group commit：同時等待落盤的多個執行緒，由搶到寫檔鎖的那一個把大家的紀錄一起 fsync
+    帳戶每 snapshot_every 筆寫一次快照並清空日誌，
+    復原時只需載入快照，再重播快照之後的日誌尾段（序號不連續時拒絕開啟）
+    寫入或 fsync 失敗後無法得知哪些紀錄已落盤，日誌從此拒絕所有寫入，
+    必須重新開啟目錄並以 recover() 復原
+    :param sync_commit: 預設 True，commit() 等到紀錄已 fsync 才返回；
+        設為 False 時交易在落盤前就回報成功（非同步落盤），當機可能遺失最後一組紀錄
+    :param group_size: 只用於 sync_commit=False：累積幾筆才 fsync
+    :param flush_interval: 只用於 sync_commit=False：秒數；由背景執行緒定期 fsync，
+        限制資料未落盤的最長時間
+    """
+    
+    # 序號、操作代碼、金額（分）、時間戳記，最後是前面欄位的 CRC32
+    _BODY = struct.Struct("<QBqq")
+    RECORD_SIZE = _BODY.size + _CRC.size
+    # 標記、快照涵蓋到的序號、內容長度（內容之後是內容的 CRC32）
+    _SNAPSHOT_HEADER = struct.Struct("<4sQI")
+    MAGIC = b"WAL1"
+    
+    def __init__(self, directory, sync_commit=True, group_size=256,
+                 flush_interval=None, snapshot_every=100_000):
+        if group_size < 1 or snapshot_every < 1:
+            raise ValueError("group_size 與 snapshot_every 必須大於 0")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sync_commit = sync_commit
+        self.group_size = group_size
+        self.snapshot_every = snapshot_every
+        self.__log_path = os.path.join(directory, "wal.log")
+        self.__snapshot_path = os.path.join(directory, "snapshot")
+        self.__buffer_lock = threading.Lock()  # 保護尚未寫入的緩衝
+        self.__file_lock = threading.Lock()    # 同一時間只有一個執行緒寫檔
+        self.__pending = []        # 已編碼、尚未寫入的紀錄
+        self.__pending_since = []  # 各紀錄進入緩衝的時間（統計落盤延遲用）
+        self.__failure = None      # 寫入失敗時的例外
+        
+        self.__snapshot, snapshot_seq = self.__read_snapshot()
+        self.__has_snapshot = self.__snapshot is not None
+        self.__tail = self.__read_tail(snapshot_seq)
+        self.__last_seq = self.__tail[-1][0] if self.__tail else snapshot_seq
+        self.__since_snapshot = len(self.__tail)
+        self.durable_seq = self.__last_seq  # 已確定寫入磁碟的最後序號
+        self.__fd = os.open(self.__log_path,
+                            os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        
+        # 統計：fsync 次數、寫入筆數、落盤延遲
+        self.fsync_count = 0
+        self.records_written = 0
+        self.total_latency_ns = 0
+        self.max_latency_ns = 0
+        
+        self.__closed = threading.Event()
+        self.__flusher = None
+        if flush_interval is not None:
+            self.__flusher = threading.Thread(
+                target=self.__flush_periodically, args=(flush_interval,),
+                daemon=True)
+            self.__flusher.start()
+    
+    def __read_snapshot(self):
+        """回傳 (快照內容, 涵蓋到的序號)；沒有快照時為 (None, 0)"""
+        try:
+            with open(self.__snapshot_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None, 0
+        try:
+            magic, seq, length = self._SNAPSHOT_HEADER.unpack_from(data)
+            start = self._SNAPSHOT_HEADER.size
+            payload = data[start:start + length]
+            (crc,) = _CRC.unpack_from(data, start + length)
+        except struct.error:
+            raise ValueError("快照檔已損毀") from None
+        if magic != self.MAGIC or zlib.crc32(payload) != crc:
+            raise ValueError("快照檔已損毀")
+        return payload, seq
+    
+    def __read_tail(self, snapshot_seq):
+        """讀出快照之後的完整紀錄；寫到一半就中斷的尾端會被截掉"""
+        try:
+            with open(self.__log_path, "rb") as file:
+                data = memoryview(file.read())
+        except FileNotFoundError:
+            return []
+        records = []
+        good = 0
+        body_size = self._BODY.size
+        for offset in range(0, len(data) - self.RECORD_SIZE + 1,
+                            self.RECORD_SIZE):
+            body = data[offset:offset + body_size]
+            (crc,) = _CRC.unpack_from(data, offset + body_size)
+            if zlib.crc32(body) != crc:
+                break
+            good = offset + self.RECORD_SIZE
+            record = self._BODY.unpack(body)
+            if record[0] > snapshot_seq:  # 快照已涵蓋的紀錄略過
+                expected = records[-1][0] + 1 if records else snapshot_seq + 1
+                if record[0] != expected:
+                    raise ValueError(f"日誌序號不連續：預期 {expected}，"
+                                     f"讀到 {record[0]}")
+                records.append(record)
+        if good < len(data):
+            with open(self.__log_path, "r+b") as file:
+                file.truncate(good)
+                os.fsync(file.fileno())
+        return records
+    
+    def recover(self):
+        """回傳 (快照內容, [(序號, 操作代碼, 金額（分）, 時間戳記), ...])，只能取一次"""
+        snapshot, tail = self.__snapshot, self.__tail
+        self.__snapshot, self.__tail = None, []
+        return snapshot, tail
+    
+    @property
+    def has_snapshot(self):
+        return self.__has_snapshot
+    
+    @property
+    def last_seq(self):
+        return self.__last_seq
+    
+    @property
+    def snapshot_due(self):
+        return self.__since_snapshot >= self.snapshot_every
+    
+    def append(self, op, cents, when):
+        """加入緩衝並回傳序號；要等 commit() 或 flush() 之後才保證寫入磁碟"""
+        with self.__buffer_lock:
+            self.__check_failure()
+            self.__last_seq += 1
+            body = self._BODY.pack(self.__last_seq, op, cents, when)
+            self.__pending.append(body + _CRC.pack(zlib.crc32(body)))
+            self.__pending_since.append(time.monotonic_ns())
+            self.__since_snapshot += 1
+            return self.__last_seq
+    
+    def commit(self, seq):
+        """
+        交易完成時呼叫（不要持有其他鎖）：sync_commit=True 時等到序號 seq 已落盤才返回，
+        等待寫檔鎖的期間其他執行緒的紀錄也會進入緩衝，下一次 fsync 一起寫入；
+        sync_commit=False 時只在湊滿 group_size 筆才 flush
+        """
+        if not self.sync_commit:
+            if len(self.__pending) >= self.group_size:
+                self.flush()
+            return
+        while self.durable_seq < seq:
+            with self.__file_lock:
+                # 前一個持有者的 fsync 可能已經涵蓋這筆紀錄
+                if self.durable_seq < seq:
+                    self.__flush_locked()
+    
+    def flush(self):
+        """把緩衝中的所有紀錄寫入日誌，只 fsync 一次"""
+        with self.__file_lock:
+            self.__flush_locked()
+    
+    def __check_failure(self):
+        if self.__failure is not None:
+            raise OSError(
+                "預寫日誌先前寫入失敗，請重新開啟目錄並以 recover() 復原"
+            ) from self.__failure
+    
+    def __flush_locked(self):
+        self.__check_failure()
+        with self.__buffer_lock:
+            records, since = self.__pending, self.__pending_since
+            self.__pending, self.__pending_since = [], []
+            last = self.__last_seq
+        if not records:
+            return
+        data = memoryview(b"".join(records))
+        try:
+            while data:
+                data = data[os.write(self.__fd, data):]
+            _fsync(self.__fd)
+        except OSError as error:
+            # 這一批可能只寫了一部分，fsync 失敗後重試也可能謊報成功；
+            # 不能讓之後的 flush 把 durable_seq 推過這些紀錄，所以從此拒絕寫入
+            self.__failure = error
+            raise
+        done = time.monotonic_ns()
+        self.durable_seq = last
+        self.fsync_count += 1
+        self.records_written += len(records)
+        self.total_latency_ns += done * len(since) - sum(since)
+        self.max_latency_ns = max(self.max_latency_ns, done - since[0])
+    
+    def checkpoint(self, payload):
+        """
+        寫入涵蓋到目前最後一筆的快照，再清空日誌
+        呼叫端必須持有帳戶的鎖，確保 payload 與最後一筆紀錄一致
+        """
+        with self.__file_lock:
+            self.__flush_locked()
+            temp_path = self.__snapshot_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(self._SNAPSHOT_HEADER.pack(
+                    self.MAGIC, self.__last_seq, len(payload)))
+                file.write(payload)
+                file.write(_CRC.pack(zlib.crc32(payload)))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.__snapshot_path)
+            self.__sync_directory()
+            # 就算在截斷前當機，復原時也會依序號略過快照已涵蓋的紀錄
+            os.ftruncate(self.__fd, 0)
+            _fsync(self.__fd)
+            self.__has_snapshot = True
+            with self.__buffer_lock:
+                self.__since_snapshot = len(self.__pending)
+    
+    def __sync_directory(self):
+        """讓 os.replace 的改名也落盤（Windows 無法開啟目錄，略過）"""
+        if hasattr(os, "O_DIRECTORY"):
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    
+    def __flush_periodically(self, interval):
+        while not self.__closed.wait(interval):
+            try:
+                self.flush()
+            except OSError:
+                return  # 錯誤已記下，之後的寫入與 commit() 會拋出
+    
+    def close(self):
+        self.__closed.set()
+        if self.__flusher is not None:
+            self.__flusher.join()
+        try:
+            self.flush()
+        finally:
+            os.close(self.__fd)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AccountSession:
+    """
+    工作階段：驗證一次密碼後取得，到期或被撤銷之前可以代替密碼使用
+    """
+    
+    __slots__ = ("session_id", "token", "expires_at")
+    
+    def __init__(self, session_id, token, expires_at):
+        self.session_id = session_id
+        self.token = token
+        self.expires_at = expires_at  # time.monotonic() 的秒數
+    
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+
 class SecureBankAccount:
-    """安全銀行帳戶 - 使用私有屬性保護敏感數據"""
+    """
+    安全銀行帳戶 - 使用私有屬性保護敏感數據
+    密碼只保存加鹽的 PBKDF2 雜湊（刻意很慢）；需要連續操作時，
+    先以 open_session() 驗證一次，之後把工作階段當作密碼傳入
+    提供 WriteAheadLog 時，每筆交易都寫進日誌，可用 recover() 復原
+    """
     
-    def __init__(self, account_holder, pin_code, initial_balance=0):
+    PIN_ITERATIONS = 100_000
+    SESSION_TTL = 300  # 秒
+    # 快照開頭：PBKDF2 次數、鹽、密碼雜湊、期初餘額（分）、交易筆數、持有人名稱長度
+    _SNAPSHOT = struct.Struct("<I16s32sqQI")
+    
+    def __init__(self, account_holder, pin_code, initial_balance=0,
+                 thread_safe=False, wal=None):
         """
-        :param pin_code: 密碼（私有）
+        :param pin_code: 密碼（只保存雜湊）
+        :param thread_safe: 為 True 時以鎖保護餘額；密碼驗證在鎖外進行
+        :param wal: WriteAheadLog；目錄必須是新的，已有資料時請用 recover()
         """
+        if wal is not None and wal.has_snapshot:
+            raise ValueError("日誌目錄中已有帳戶資料，請改用 SecureBankAccount.recover()")
         self.account_holder = account_holder  # 公開屬性
-        self.__pin_code = pin_code  # 私有屬性（雙底線開頭）
-        self.__balance = initial_balance  # 私有屬性
-        self.__transaction_history = []  # 私有交易紀錄
+        self.__set_pin(pin_code)  # 私有屬性（雙底線開頭）
+        ledger = TransactionLedger(initial_balance)
+        self.__setup(ledger.opening, ledger, thread_safe, wal)
+        if wal is not None:
+            wal.checkpoint(self.__snapshot_payload())
         print(f"✓ 已創建安全帳戶：{account_holder}")
     
+    def __setup(self, balance_cents, ledger, thread_safe, wal):
+        self._lock = threading.RLock() if thread_safe else nullcontext()
+        self._lock_order = next(_lock_orders)
+        # 私有屬性；與交易紀錄一樣以整數的「分」保存，顯示時才換成金額
+        self.__balance = balance_cents
+        self.__ledger = ledger  # 私有交易紀錄
+        self.__wal = wal
+        self.__sessions = {}  # 工作階段編號 -> (token, 到期時間)
+        self.__next_session_id = 0
+    
+    @classmethod
+    def recover(cls, wal, thread_safe=False):
+        """
+        從日誌目錄復原帳戶：載入最後一次快照，只重播快照之後的日誌尾段
+        工作階段不會保存，復原後需要重新 open_session()
+        """
+        payload, tail = wal.recover()
+        if payload is None:
+            raise ValueError("日誌目錄中沒有帳戶資料")
+        (iterations, salt, pin_hash, opening, entries,
+         holder_length) = cls._SNAPSHOT.unpack_from(payload)
+        offset = cls._SNAPSHOT.size
+        holder = payload[offset:offset + holder_length].decode()
+        offset += holder_length
+        columns = []
+        for typecode in ("B", "q", "q"):  # 操作代碼、金額、時間戳記
+            column = array(typecode)
+            column.frombytes(payload[offset:offset + entries * column.itemsize])
+            if sys.byteorder == "big":
+                column.byteswap()
+            offset += entries * column.itemsize
+            columns.append(column)
+        ledger = TransactionLedger._restore(opening, *columns)
+        for _seq, op, cents, when in tail:
+            ledger._append_cents(op, cents, when)
+        
+        account = cls.__new__(cls)
+        account.account_holder = holder
+        account.PIN_ITERATIONS = iterations
+        account.__pin_salt = salt
+        account.__pin_hash = pin_hash
+        account.__setup(ledger.balance_cents, ledger, thread_safe, wal)
+        print(f"✓ 已復原安全帳戶：{holder}（重播日誌 {len(tail)} 筆）")
+        return account
+    
+    def __snapshot_payload(self):
+        """快照內容：密碼雜湊與完整的交易紀錄（陣列與標頭一樣以小端序保存）"""
+        ledger = self.__ledger
+        holder = self.account_holder.encode()
+        header = self._SNAPSHOT.pack(self.PIN_ITERATIONS, self.__pin_salt,
+                                     self.__pin_hash, ledger.opening,
+                                     len(ledger), len(holder))
+        columns = [ledger.ops, ledger.amounts, ledger.timestamps]
+        if sys.byteorder == "big":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        return b"".join((header, holder,
+                         *(column.tobytes() for column in columns)))
+    
+    def __log_last(self):
+        """把交易紀錄的最後一筆加入日誌緩衝並回傳序號（在鎖內呼叫）"""
+        if self.__wal is None:
+            return None
+        ledger = self.__ledger
+        return self.__wal.append(ledger.ops[-1], ledger.amounts[-1],
+                                 ledger.timestamps[-1])
+    
+    def __after_write(self, seq):
+        """在鎖外呼叫：等這筆交易落盤（group commit），累積夠多筆就寫快照"""
+        wal = self.__wal
+        if wal is None:
+            return
+        wal.commit(seq)
+        if wal.snapshot_due:
+            with self._lock:
+                if wal.snapshot_due:
+                    wal.checkpoint(self.__snapshot_payload())
+    
+    def __hash_pin(self, pin, salt):
+        return hashlib.pbkdf2_hmac("sha256", str(pin).encode(), salt,
+                                   self.PIN_ITERATIONS)
+    
+    def __set_pin(self, pin):
+        self.__pin_salt = secrets.token_bytes(16)
+        self.__pin_hash = self.__hash_pin(pin, self.__pin_salt)
+    
     def __verify_pin(self, pin):
         """私有方法：驗證密碼（外部無法直接調用）"""
-        return pin == self.__pin_code
+        return hmac.compare_digest(self.__hash_pin(pin, self.__pin_salt),
+                                   self.__pin_hash)
     
-    def deposit(self, amount, pin):
-        """存款需要密碼驗證"""
+    def __authorize(self, credential):
+        """
+        私有方法：credential 可以是密碼或工作階段
+        工作階段只做常數時間的 token 比對，不必重新計算密碼雜湊
+        """
+        if not isinstance(credential, AccountSession):
+            if self.__verify_pin(credential):
+                return True
+            print("✗ 密碼錯誤！")
+            return False
+        entry = self.__sessions.get(credential.session_id)
+        if entry is not None and time.monotonic() >= entry[1]:
+            self.__sessions.pop(credential.session_id, None)
+            entry = None
+        if entry is None or not hmac.compare_digest(entry[0],
+                                                    credential.token):
+            print("✗ 工作階段已過期或已撤銷！")
+            return False
+        return True
+    
+    def open_session(self, pin, ttl=None):
+        """驗證一次密碼，取得可代替密碼使用的工作階段"""
         if not self.__verify_pin(pin):
             print("✗ 密碼錯誤！")
+            return None
+        with self._lock:
+            now = time.monotonic()
+            # 順便清掉已過期的工作階段
+            for session_id in [session_id for session_id, (_, expires_at)
+                               in self.__sessions.items() if now >= expires_at]:
+                del self.__sessions[session_id]
+            self.__next_session_id += 1
+            session = AccountSession(
+                self.__next_session_id, secrets.token_bytes(32),
+                now + (self.SESSION_TTL if ttl is None else ttl))
+            self.__sessions[session.session_id] = (session.token,
+                                                   session.expires_at)
+            return session
+    
+    def close_session(self, session):
+        """登出：撤銷指定的工作階段；token 不符（例如偽造的編號）時不做任何事"""
+        with self._lock:
+            entry = self.__sessions.get(session.session_id)
+            if entry is not None and hmac.compare_digest(entry[0],
+                                                         session.token):
+                del self.__sessions[session.session_id]
+    
+    def deposit(self, amount, pin):
+        """存款需要密碼驗證；金額以分為單位，不足一分的部分取最接近的分"""
+        if not self.__authorize(pin):
             return
         
-        if amount > 0:
-            self.__balance += amount
-            self.__transaction_history.append(f"存款: +${amount}")
-            print(f"✓ 存款 ${amount} 成功，餘額：${self.__balance}")
+        cents = _to_cents(amount)
+        if cents > 0:
+            amount = _dollars(cents)
+            with self._lock:
+                self.__ledger.record(TransactionLedger.DEPOSIT, amount)
+                seq = self.__log_last()
+                self.__balance += cents
+                balance = _dollars(self.__balance)
+            # 交易落盤之後才回報成功
+            self.__after_write(seq)
+            print(f"✓ 存款 ${amount} 成功，餘額：${balance}")
         else:
             print("✗ 存款金額必須大於 0")
     
     def withdraw(self, amount, pin):
-        """提款需要密碼驗證"""
-        if not self.__verify_pin(pin):
-            print("✗ 密碼錯誤！")
-            return
-        
-        if amount > self.__balance:
-            print(f"✗ 餘額不足！目前餘額：${self.__balance}")
-        elif amount <= 0:
+        """提款需要密碼驗證；成功時回傳 True（金額同樣取最接近的分）"""
+        if not self.__authorize(pin):
+            return False
+        with self._lock:
+            finish = self.__debit(amount)
+        if finish is None:
+            return False
+        finish()
+        return True
+    
+    def _debit(self, amount, pin):
+        """
+        轉出（由 transfer() 在兩個帳戶都鎖住時呼叫，pin 為工作階段）
+        成功時回傳收尾函式，transfer() 放開鎖之後才呼叫；失敗時回傳 None
+        """
+        if not self.__authorize(pin):
+            return None
+        return self.__debit(amount)
+    
+    def __debit(self, amount):
+        """
+        在鎖內檢查餘額、扣款並把紀錄加入日誌緩衝
+        回傳的收尾函式在鎖外等交易落盤，之後才回報成功
+        """
+        cents = _to_cents(amount)
+        amount = _dollars(cents)
+        if cents <= 0:
             print("✗ 提款金額必須大於 0")
-        else:
-            self.__balance -= amount
-            self.__transaction_history.append(f"提款: -${amount}")
-            print(f"✓ 提款 ${amount} 成功，餘額：${self.__balance}")
+            return None
+        if cents > self.__balance:
+            print(f"✗ 餘額不足！目前餘額：${_dollars(self.__balance)}")
+            return None
+        self.__ledger.record(TransactionLedger.WITHDRAW, amount)
+        seq = self.__log_last()
+        self.__balance -= cents
+        balance = _dollars(self.__balance)
+        
+        def finish():
+            self.__after_write(seq)
+            print(f"✓ 提款 ${amount} 成功，餘額：${balance}")
+        return finish
+    
+    def _credit(self, amount):
+        """
+        轉入（由 transfer() 在鎖內呼叫，金額已驗證；收款不需要收款人的密碼）
+        回傳放開鎖之後要呼叫的收尾函式：等交易落盤，之後才回報成功
+        """
+        cents = _to_cents(amount)
+        amount = _dollars(cents)
+        with self._lock:
+            self.__ledger.record(TransactionLedger.DEPOSIT, amount)
+            seq = self.__log_last()
+            self.__balance += cents
+            balance = _dollars(self.__balance)
+        
+        def finish():
+            self.__after_write(seq)
+            print(f"✓ 轉入 ${amount} 成功，餘額：${balance}")
+        return finish
     
     def get_balance(self, pin):
         """查詢餘額需要密碼"""
-        if not self.__verify_pin(pin):
-            print("✗ 密碼錯誤！")
+        if not self.__authorize(pin):
             return None
-        return self.__balance
+        return _dollars(self.__balance)
     
     def get_transaction_history(self, pin):
         """查詢交易紀錄需要密碼"""
-        if not self.__verify_pin(pin):
-            print("✗ 密碼錯誤！")
+        if not self.__authorize(pin):
             return []
-        return self.__transaction_history.copy()
+        with self._lock:
+            return self.__ledger.format_entries()
+    
+    def get_ledger(self, pin):
+        """
+        取得交易紀錄的副本，用來查詢某時間點的餘額或期間總額
+        副本與帳戶互不影響，修改副本不會改變帳戶的紀錄
+        """
+        if not self.__authorize(pin):
+            return None
+        with self._lock:
+            return self.__ledger.copy()
     
     def change_pin(self, old_pin, new_pin):
         """修改密碼"""
         if not self.__verify_pin(old_pin):
             print("✗ 舊密碼錯誤！")
             return
-        self.__pin_code = new_pin
-        print("✓ 密碼修改成功")
+        with self._lock:
+            self.__set_pin(new_pin)
+            revoked = len(self.__sessions)
+            self.__sessions.clear()
+            if self.__wal is not None:
+                # 密碼很少修改，直接寫一次快照
+                self.__wal.checkpoint(self.__snapshot_payload())
+        print(f"✓ 密碼修改成功（已撤銷 {revoked} 個工作階段）")
+
+
+def transfer(source, target, amount, pin=None):
+    """
+    轉帳：同時鎖住兩個帳戶再「檢查餘額、扣款、入帳」，中途不會被其他執行緒插隊
+    鎖一律依 _lock_order 由小到大取得，兩個方向同時轉帳也不會死結
+    source 是 SecureBankAccount 時，pin 為其密碼或工作階段；成功時回傳 True
+    金額先取最接近的分，轉出與轉入的金額完全相同；
+    兩筆紀錄在鎖內加入各自的日誌，放開鎖之後才等落盤，其他轉帳不必排隊等磁碟
+    """
+    if source is target:
+        raise ValueError("轉出與轉入不能是同一個帳戶")
+    if pin is not None and not isinstance(pin, AccountSession):
+        # 慢速的密碼雜湊在鎖外驗證，鎖內只比對工作階段的 token
+        session = source.open_session(pin)
+        if session is None:
+            return False
+        try:
+            return transfer(source, target, amount, session)
+        finally:
+            source.close_session(session)
+    amount = _dollars(_to_cents(amount))
+    first, second = sorted((source, target),
+                           key=lambda account: account._lock_order)
+    with first._lock, second._lock:
+        debited = (source._debit(amount) if pin is None
+                   else source._debit(amount, pin))
+        if debited is None:
+            return False
+        credited = target._credit(amount)
+    debited()
+    credited()
+    return True
 
 
 # 使用安全帳戶
@@ -144,6 +912,35 @@ secure_account.withdraw(200, "1234")
 balance = secure_account.get_balance("1234")
 print(f"餘額：${balance}")
 
+print("\n交易紀錄（以型別陣列保存，顯示時才轉成文字）：")
+for entry in secure_account.get_transaction_history("1234"):
+    print(f"  {entry}")
+ledger = secure_account.get_ledger("1234")
+print(f"第一筆交易後的餘額：${ledger.balance_at(ledger.timestamps[0])}")
+print(f"存款總額：${ledger.total_between(TransactionLedger.DEPOSIT)}")
+
+print("\n工作階段：驗證一次密碼，之後以工作階段代替密碼")
+session = secure_account.open_session("1234")
+for _ in range(3):
+    secure_account.deposit(100, session)
+secure_account.change_pin("1234", "5678")
+secure_account.withdraw(100, session)  # 修改密碼後工作階段失效
+secure_account.change_pin("5678", "1234")
+
+print("\n轉帳：同時鎖住兩個帳戶（thread_safe=True 時可由多個執行緒同時轉帳）")
+transfer(secure_account, account1, 300, "1234")
+
+print("\n預寫日誌：交易寫進日誌並落盤後才回報成功，程式重啟後可以復原")
+with tempfile.TemporaryDirectory() as directory:
+    with WriteAheadLog(directory) as wal:
+        durable_account = SecureBankAccount("孫七", "2468", 1000, wal=wal)
+        durable_session = durable_account.open_session("2468")
+        durable_account.deposit(300, durable_session)
+        durable_account.withdraw(100, durable_session)
+    with WriteAheadLog(directory) as wal:
+        recovered_account = SecureBankAccount.recover(wal)
+        print(f"復原後的交易紀錄：{recovered_account.get_transaction_history('2468')}")
+
 print("\n錯誤密碼操作：")
 secure_account.withdraw(100, "0000")  # 密碼錯誤
 secure_account.get_balance("9999")  # 密碼錯誤
@@ -156,7 +953,9 @@ except AttributeError as e:
     print(f"✗ 無法訪問：{e}")
 
 print("\nPython 的 name mangling 機制：")
-print(f"實際屬性名稱被改寫為：{dir(secure_account)[-3:]}")  # _SecureBankAccount__balance
+mangled = [name for name in vars(secure_account)
+           if name.startswith("_SecureBankAccount__")]
+print(f"實際屬性名稱被改寫為：{mangled}")  # 例如 _SecureBankAccount__balance
 
 
 # ========== 屬性裝飾器 (Property) ==========
@@ -164,18 +963,93 @@ print("\n" + "=" * 80)
 print("【3. 使用 @property 裝飾器：優雅的訪問控制】")
 print("=" * 80)
 
+def _derived(method):
+    """
+    由餘額推導的唯讀屬性：第一次讀取時計算並快取，
+    之後直接回傳快取，直到 balance setter 清除為止
+    被裝飾的方法應讀取私有的 __balance，不要經過會輸出訊息的 balance getter
+    """
+    name = method.__name__
+    
+    @property
+    @wraps(method)
+    def getter(self):
+        cache = self._derived
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = method(self)
+            return value
+    
+    return getter
+
+
+class ChangeHub:
+    """
+    變更通知中心：帳戶餘額改變時只記下最新的值，flush() 時才一次通知所有訂閱者
+    兩次 flush 之間同一個帳戶改變多次，訂閱者只會收到最後的值，不必逐一輪詢帳戶
+    訂閱者應使用收到的餘額，不要再讀 account.balance（getter 會輸出訊息）
+    """
+    
+    def __init__(self):
+        self.__subscribers = []
+        self.__pending = {}  # 帳戶 -> 最新餘額
+        self.__lock = threading.Lock()
+    
+    def subscribe(self, callback):
+        """callback({帳戶: 最新餘額, ...})；回傳 callback，也可以當作裝飾器"""
+        self.__subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        self.__subscribers.remove(callback)
+    
+    def publish(self, account, value):
+        with self.__lock:
+            self.__pending[account] = value
+    
+    @property
+    def pending(self):
+        return len(self.__pending)
+    
+    def flush(self):
+        """
+        把累積的變更交給每個訂閱者，回傳變更的帳戶數
+        某個訂閱者拋出例外時，其餘訂閱者仍會收到這批變更，全部通知完才拋出第一個例外
+        """
+        with self.__lock:
+            changes, self.__pending = self.__pending, {}
+        if changes:
+            errors = []
+            for callback in list(self.__subscribers):
+                try:
+                    callback(changes)
+                except Exception as error:
+                    errors.append(error)
+            if errors:
+                raise errors[0]
+        return len(changes)
+
+
 class SmartBankAccount:
-    """智慧銀行帳戶 - 使用 property 提供受控的屬性訪問"""
+    """
+    智慧銀行帳戶 - 使用 property 提供受控的屬性訪問
+    formatted_balance 等推導屬性會快取，只有 balance setter 會讓快取失效；
+    提供 ChangeHub 時，餘額變更會交給它合併後再通知訂閱者
+    """
     
-    def __init__(self, account_holder, initial_balance=0):
+    def __init__(self, account_holder, initial_balance=0, hub=None):
         self.account_holder = account_holder
         self.__balance = initial_balance
+        self.__hub = hub
+        self._derived = {}  # 推導屬性的快取（供 _derived 使用）
     
     @property
     def balance(self):
         """
         使用 @property 將方法轉換為屬性
         可以像訪問屬性一樣調用，但實際執行的是方法
+        （示範用的訊息只在這裡輸出；推導屬性與 ChangeHub 的訂閱者不經過這裡）
         """
         print("(正在檢查餘額...)")
         return self.__balance
@@ -190,10 +1064,13 @@ class SmartBankAccount:
             raise ValueError("餘額不能為負數！")
         print(f"(正在更新餘額：${self.__balance} -> ${value})")
         self.__balance = value
+        self._derived.clear()
+        if self.__hub is not None:
+            self.__hub.publish(self, value)
     
-    @property
+    @_derived
     def formatted_balance(self):
-        """只讀屬性：格式化的餘額顯示"""
+        """只讀屬性：格式化的餘額顯示（快取到下次修改餘額為止）"""
         return f"${self.__balance:,.2f}"
 
 
@@ -216,6 +1093,18 @@ try:
 except ValueError as e:
     print(f"✗ 錯誤：{e}")
 
+print("\n變更通知：多次修改只通知最後的值，flush() 時一次送出")
+hub = ChangeHub()
+hub.subscribe(lambda changes: print(
+    "通知：" + "、".join(f"{account.account_holder} ${value:,.2f}"
+                        for account, value in changes.items())))
+watched = [SmartBankAccount("錢八", 100, hub=hub),
+           SmartBankAccount("周九", 200, hub=hub)]
+watched[0].balance = 150
+watched[0].balance = 180  # 覆蓋上一次的變更
+watched[1].balance = 250
+hub.flush()
+
 
 # ========== 總結 ==========
 print("\n" + "=" * 80)
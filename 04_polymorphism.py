@@ -3,6 +3,18 @@
 展示如何實現介面的靈活性，讓不同類別以統一方式交互
 """
 
+import heapq
+import math
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import chain
+
+try:
+    import numpy as np  # 選用：VectorArray 需要 NumPy
+except ImportError:
+    np = None
+
 print("=" * 80)
 print("多型特性：實現介面的靈活性")
 print("=" * 80)
@@ -86,6 +98,100 @@ def interact_with_animal(animal):
     print(f"  - {animal.move()}")
 
 
+class BatchDispatcher:
+    """
+    批次分派：先依具體類別分組，每個類別只解析一次介面方法，
+    再以未綁定的方法對整組物件呼叫，省去逐一物件的屬性查找
+    """
+    
+    def __init__(self, *method_names, abstract_base=None):
+        """
+        :param abstract_base: 介面的抽象基礎類別（例如 Animal）；
+            仍沿用它的抽象方法（只會拋出 NotImplementedError）的類別視為不符合介面
+        """
+        self.method_names = method_names
+        self.abstract_base = abstract_base
+        self.__resolved = {}  # 類別 -> 未綁定方法的 tuple；不符合介面則為 None
+    
+    def resolve(self, cls):
+        """回傳該類別實現的介面方法；缺少或未覆寫任何一個就回傳 None（結果快取）"""
+        try:
+            return self.__resolved[cls]
+        except KeyError:
+            pass
+        methods = tuple(getattr(cls, name, None) for name in self.method_names)
+        stubs = tuple(getattr(self.abstract_base, name, None)
+                      for name in self.method_names)
+        if not all(callable(method) and method is not stub
+                   for method, stub in zip(methods, stubs)):
+            methods = None
+        self.__resolved[cls] = methods
+        return methods
+    
+    def supports(self, obj):
+        return self.resolve(type(obj)) is not None
+    
+    def group(self, objects):
+        """
+        依類別分組，回傳 (groups, rejected)
+        groups 為 {類別: [物件, ...]}（依首次出現的順序），
+        rejected 為不符合介面的物件（同類別的排在一起）
+        """
+        groups = defaultdict(list)
+        for obj in objects:
+            groups[type(obj)].append(obj)
+        rejected = []
+        for cls in [cls for cls in groups if self.resolve(cls) is None]:
+            rejected += groups.pop(cls)
+        return groups, rejected
+    
+    def dispatch(self, objects, keep_order=False):
+        """
+        對每個物件呼叫所有介面方法，回傳 (objects, columns, rejected)
+        columns[k][i] 是 objects[i] 呼叫第 k 個方法的結果（欄式排列，不逐一建立 tuple）；
+        objects 預設依類別分組排列，keep_order=True 時依原本的順序排列。
+        不符合介面的物件在呼叫任何方法之前就整理到 rejected，不會中斷其餘物件
+        """
+        if keep_order:
+            objects = list(objects)  # 需要走訪兩次
+        groups, rejected = self.group(objects)
+        results = {cls: [members] + [list(map(method, members))
+                                     for method in self.__resolved[cls]]
+                   for cls, members in groups.items()}
+        width = len(self.method_names) + 1  # 物件本身 + 每個方法一欄
+        if keep_order:
+            # 依原本的類別順序，從各類別的每一欄依序取出下一個值
+            classes = [cls for cls in map(type, objects) if cls in results]
+            merged = []
+            for k in range(width):
+                column = {cls: iter(values[k]) for cls, values in results.items()}
+                merged.append(list(map(next, map(column.__getitem__, classes))))
+        else:
+            merged = [list(chain.from_iterable(values[k]
+                                               for values in results.values()))
+                      for k in range(width)]
+        return merged[0], merged[1:], rejected
+
+
+ANIMAL_PROTOCOL = BatchDispatcher("speak", "move", abstract_base=Animal)
+
+
+def interact_with_animals(animals, keep_order=False):
+    """
+    批次版的 interact_with_animal：同類別的動物一起處理，輸出一次寫出
+    不符合介面（缺少 speak 或 move）的物件會先列出來
+    """
+    animals, (sounds, movements), rejected = ANIMAL_PROTOCOL.dispatch(
+        animals, keep_order)
+    if rejected:
+        print(f"\n略過 {len(rejected)} 個不符合介面的物件："
+              f"{sorted({type(obj).__name__ for obj in rejected})}")
+    if animals:
+        print("\n".join(f"\n與 {animal.name} 互動：\n  - {sound}\n  - {movement}"
+                        for animal, sound, movement
+                        in zip(animals, sounds, movements)))
+
+
 # 創建不同類型的動物
 animals = [
     Dog("Buddy"),
@@ -98,6 +204,9 @@ print("\n多型實踐：用同一個函式處理不同的動物")
 for animal in animals:
     interact_with_animal(animal)
 
+print("\n批次分派：依類別分組，每個類別只查一次 speak / move")
+interact_with_animals(animals + [Dog("Rex"), "不是動物"], keep_order=True)
+
 print("\n✅ 關鍵點：")
 print("   - 無需使用 if-else 判斷動物類型")
 print("   - 統一的介面 (speak, move)")
@@ -113,28 +222,59 @@ print("=" * 80)
 class Vector:
     """向量類別 - 展示運算符重載"""
     
+    # 只允許 x、y 兩個屬性：實例不需要 __dict__，更省記憶體
+    __slots__ = ("x", "y")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
     
     def __add__(self, other):
-        """重載 + 運算符：向量相加"""
+        """重載 + 運算符：向量相加（產生新向量，型別與左運算元相同）"""
         if isinstance(other, Vector):
-            return Vector(self.x + other.x, self.y + other.y)
+            return type(self)(self.x + other.x, self.y + other.y)
         return NotImplemented
     
     def __sub__(self, other):
         """重載 - 運算符：向量相減"""
         if isinstance(other, Vector):
-            return Vector(self.x - other.x, self.y - other.y)
+            return type(self)(self.x - other.x, self.y - other.y)
         return NotImplemented
     
     def __mul__(self, scalar):
         """重載 * 運算符：向量縮放"""
         if isinstance(scalar, (int, float)):
-            return Vector(self.x * scalar, self.y * scalar)
+            return type(self)(self.x * scalar, self.y * scalar)
+        return NotImplemented
+    
+    def __iadd__(self, other):
+        """重載 += 運算符：直接修改自己，不建立新物件"""
+        if isinstance(other, Vector):
+            self.x += other.x
+            self.y += other.y
+            return self
+        return NotImplemented
+    
+    def __isub__(self, other):
+        """重載 -= 運算符"""
+        if isinstance(other, Vector):
+            self.x -= other.x
+            self.y -= other.y
+            return self
+        return NotImplemented
+    
+    def __imul__(self, scalar):
+        """重載 *= 運算符"""
+        if isinstance(scalar, (int, float)):
+            self.x *= scalar
+            self.y *= scalar
+            return self
         return NotImplemented
     
+    def norm(self):
+        """向量的精確長度（float），math.hypot 可避免平方後溢位或失準"""
+        return math.hypot(self.x, self.y)
+    
     def __eq__(self, other):
         """重載 == 運算符：向量相等判斷"""
         if isinstance(other, Vector):
@@ -150,8 +290,8 @@ class Vector:
         return f"Vector(x={self.x}, y={self.y})"
     
     def __len__(self):
-        """重載 len()：計算向量長度"""
-        return int((self.x ** 2 + self.y ** 2) ** 0.5)
+        """重載 len()：計算向量長度（len() 只能回傳整數，精確值請用 norm()）"""
+        return int(self.norm())
     
     def __getitem__(self, index):
         """重載 []：支持索引訪問"""
@@ -163,6 +303,41 @@ class Vector:
             raise IndexError("向量只有 x 和 y 兩個維度")
 
 
+class FrozenVector(Vector):
+    """
+    不可變向量 - 可以當作 dict 的鍵或放進 set
+    就地運算符（+=、-=、*=）會改為產生新的 FrozenVector
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, x, y):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenVector 不可修改")
+    
+    def __delattr__(self, name):
+        raise AttributeError("FrozenVector 不可修改")
+    
+    def __iadd__(self, other):
+        return NotImplemented  # 改用 __add__ 產生新向量
+    
+    def __isub__(self, other):
+        return NotImplemented
+    
+    def __imul__(self, scalar):
+        return NotImplemented
+    
+    def __hash__(self):
+        """與 == 一致：座標相同的向量雜湊值相同"""
+        return hash((self.x, self.y))
+    
+    def __repr__(self):
+        return f"FrozenVector(x={self.x}, y={self.y})"
+
+
 # 使用自定義的運算符
 print("\n創建向量並使用運算符：")
 v1 = Vector(3, 4)
@@ -179,19 +354,467 @@ print(f"v1 == Vector(3, 4) = {v1 == Vector(3, 4)}")
 
 print(f"\nlen(v1) = {len(v1)}")
 print(f"v1[0] = {v1[0]}, v1[1] = {v1[1]}")
+print(f"v2.norm() = {v2.norm():.4f}（len(v2) = {len(v2)} 只取整數）")
+
+print("\n就地運算符：累加時不必一直建立新物件")
+total = Vector(0, 0)
+for step in (v1, v2, Vector(-1, 1)):
+    total += step
+print(f"total = {total}")
+
+print("\n不可變向量可以當作 dict 的鍵：")
+visits = {FrozenVector(0, 0): "入口", FrozenVector(3, 4): "獅子區"}
+print(f"visits[FrozenVector(3, 4)] = {visits[FrozenVector(3, 4)]}")
+
+
+# ========== 批次向量運算：同一套運算符，一次處理整批 ==========
+
+class VectorArray:
+    """
+    向量陣列 - 以 NumPy 連續陣列保存大量向量
+    提供與 Vector 相同的運算符，但一次運算整批，不必為每個結果建立物件
+    """
+    
+    def __init__(self, x, y):
+        if np is None:
+            raise ImportError("VectorArray 需要 NumPy：pip install numpy")
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if self.x.ndim != 1 or self.x.shape != self.y.shape:
+            raise ValueError("x 與 y 必須是長度相同的一維陣列")
+    
+    @classmethod
+    def from_vectors(cls, vectors):
+        """從 Vector 列表建立"""
+        count = len(vectors)
+        return cls(np.fromiter((v.x for v in vectors), np.float64, count),
+                   np.fromiter((v.y for v in vectors), np.float64, count))
+    
+    def to_vectors(self):
+        """轉回 Vector 列表（座標為 float）"""
+        return [Vector(x, y) for x, y in zip(self.x.tolist(), self.y.tolist())]
+    
+    def __coordinates(self, other):
+        """取得另一個運算元的座標：VectorArray 逐一對應，Vector 套用到每一個"""
+        if isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise ValueError(f"長度不同：{len(self)} 與 {len(other)}")
+            return other.x, other.y
+        if isinstance(other, Vector):
+            return other.x, other.y
+        return None
+    
+    def __add__(self, other):
+        """重載 + 運算符：整批向量相加"""
+        coordinates = self.__coordinates(other)
+        if coordinates is None:
+            return NotImplemented
+        return VectorArray(self.x + coordinates[0], self.y + coordinates[1])
+    
+    __radd__ = __add__  # Vector + VectorArray
+    
+    def __sub__(self, other):
+        """重載 - 運算符：整批向量相減"""
+        coordinates = self.__coordinates(other)
+        if coordinates is None:
+            return NotImplemented
+        return VectorArray(self.x - coordinates[0], self.y - coordinates[1])
+    
+    def __rsub__(self, other):
+        """Vector - VectorArray"""
+        coordinates = self.__coordinates(other)
+        if coordinates is None:
+            return NotImplemented
+        return VectorArray(coordinates[0] - self.x, coordinates[1] - self.y)
+    
+    def __mul__(self, scalar):
+        """重載 * 運算符：整批向量縮放"""
+        if isinstance(scalar, (int, float, np.number)):
+            return VectorArray(self.x * scalar, self.y * scalar)
+        return NotImplemented
+    
+    __rmul__ = __mul__  # 2 * VectorArray
+    
+    def __eq__(self, other):
+        """重載 == 運算符：回傳每個位置是否相等的布林陣列"""
+        coordinates = self.__coordinates(other)
+        if coordinates is None:
+            return NotImplemented
+        return (self.x == coordinates[0]) & (self.y == coordinates[1])
+    
+    def __ne__(self, other):
+        mask = self.__eq__(other)
+        return mask if mask is NotImplemented else ~mask
+    
+    __hash__ = None  # == 不回傳 bool，因此不可雜湊
+    
+    def norms(self):
+        """每個向量的長度（float 陣列）"""
+        return np.hypot(self.x, self.y)
+    
+    def lengths(self):
+        """與 len(Vector) 相同的整數長度（無條件捨去）"""
+        return self.norms().astype(np.int64)
+    
+    def __len__(self):
+        """重載 len()：向量的個數（容器語意，每個向量的長度請用 lengths()）"""
+        return len(self.x)
+    
+    def __getitem__(self, index):
+        """重載 []：整數索引回傳 Vector，切片或布林陣列回傳 VectorArray"""
+        if isinstance(index, (int, np.integer)):
+            return Vector(float(self.x[index]), float(self.y[index]))
+        return VectorArray(self.x[index], self.y[index])
+    
+    def __iter__(self):
+        return iter(self.to_vectors())
+    
+    def __repr__(self):
+        return f"VectorArray(len={len(self)})"
+
+
+print("\n批次向量運算（VectorArray）：")
+if np is None:
+    print("  （未安裝 NumPy，略過此示範）")
+else:
+    points = VectorArray.from_vectors([Vector(3, 4), Vector(1, 2), Vector(0, 5)])
+    shifted = points + Vector(1, 1)
+    print(f"points + Vector(1, 1) = {shifted.to_vectors()}")
+    print(f"points * 2 的第一個 = {(points * 2)[0]}")
+    print(f"points == Vector(1, 2) → {(points == Vector(1, 2)).tolist()}")
+    print(f"各向量長度 = {points.lengths().tolist()}，向量個數 = {len(points)}")
+
+
+# ========== 空間索引：依位置快速找出附近的物件 ==========
+
+def _coordinates(position):
+    """Vector 或 (x, y) 都可以：只要支援 [0]、[1] 就行（鴨子型別）"""
+    if isinstance(position, Vector):
+        return float(position.x), float(position.y)
+    return float(position[0]), float(position[1])
+
+
+class SpatialGrid:
+    """
+    均勻網格空間索引
+    把平面切成 cell_size 見方的格子，查詢時只檢查附近的格子，不必兩兩比較
+    物件需可雜湊（一般類別的實例預設以身分雜湊）
+    """
+    
+    def __init__(self, cell_size=10.0):
+        if cell_size <= 0:
+            raise ValueError("格子大小必須大於 0")
+        self.cell_size = float(cell_size)
+        self.__cells = {}      # (格子 x, 格子 y) -> {物件: (x, y)}
+        self.__positions = {}  # 物件 -> (x, y, 格子)
+    
+    def __cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def insert(self, item, position):
+        """加入物件；已在索引中時改為移動到新位置"""
+        if item in self.__positions:
+            self.remove(item)
+        x, y = _coordinates(position)
+        cell = self.__cell(x, y)
+        self.__cells.setdefault(cell, {})[item] = (x, y)
+        self.__positions[item] = (x, y, cell)
+    
+    def remove(self, item):
+        """移除物件，不存在時拋出 KeyError"""
+        _x, _y, cell = self.__positions.pop(item)
+        bucket = self.__cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self.__cells[cell]
+    
+    def position_of(self, item):
+        x, y, _cell = self.__positions[item]
+        return Vector(x, y)
+    
+    def within(self, center, radius):
+        """距離 center 不超過 radius 的所有物件"""
+        if radius < 0:
+            raise ValueError("半徑不能為負數")
+        x, y = _coordinates(center)
+        low_x, low_y = self.__cell(x - radius, y - radius)
+        high_x, high_y = self.__cell(x + radius, y + radius)
+        limit = radius * radius
+        found = []
+        if (high_x - low_x + 1) * (high_y - low_y + 1) > len(self.__cells):
+            buckets = self.__cells.values()  # 範圍比已使用的格子還多，直接逐格檢查
+        else:
+            buckets = [self.__cells.get((cell_x, cell_y))
+                       for cell_x in range(low_x, high_x + 1)
+                       for cell_y in range(low_y, high_y + 1)]
+        for bucket in buckets:
+            if bucket:
+                for item, (item_x, item_y) in bucket.items():
+                    if (item_x - x) ** 2 + (item_y - y) ** 2 <= limit:
+                        found.append(item)
+        return found
+    
+    def nearest(self, center, k=1):
+        """
+        最近的 k 個物件，由近到遠
+        從中心格子開始一圈一圈往外找，確定外圈不可能更近就停止
+        """
+        if k < 1:
+            raise ValueError("k 必須大於 0")
+        x, y = _coordinates(center)
+        center_x, center_y = self.__cell(x, y)
+        best = []  # 最大堆積：(-距離平方, 序號, 物件)
+        ring = 0
+        while True:
+            if 8 * ring > len(self.__cells):
+                # 外圈的格子比已使用的格子還多：改為檢查全部物件
+                best = []
+                for bucket in self.__cells.values():
+                    self.__collect(bucket, x, y, k, best)
+                break
+            for cell in self.__ring(center_x, center_y, ring):
+                bucket = self.__cells.get(cell)
+                if bucket:
+                    self.__collect(bucket, x, y, k, best)
+            # 外圈任何一點與 center 的距離至少是 ring 個格子
+            reach = ring * self.cell_size
+            if len(best) == k and -best[0][0] <= reach * reach:
+                break
+            ring += 1
+        return [item for _distance, _order, item in sorted(best, reverse=True)]
+    
+    @staticmethod
+    def __ring(center_x, center_y, ring):
+        if ring == 0:
+            yield (center_x, center_y)
+            return
+        for offset in range(-ring, ring + 1):
+            yield (center_x + offset, center_y - ring)
+            yield (center_x + offset, center_y + ring)
+        for offset in range(-ring + 1, ring):
+            yield (center_x - ring, center_y + offset)
+            yield (center_x + ring, center_y + offset)
+    
+    @staticmethod
+    def __collect(bucket, x, y, k, best):
+        for item, (item_x, item_y) in bucket.items():
+            entry = (-((item_x - x) ** 2 + (item_y - y) ** 2), id(item), item)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[0] > best[0][0]:
+                heapq.heapreplace(best, entry)
+    
+    def __len__(self):
+        return len(self.__positions)
+    
+    def __contains__(self, item):
+        return item in self.__positions
+
+
+print("\n空間索引（SpatialGrid）：")
+grid = SpatialGrid(cell_size=5)
+grid.insert("獅子", Vector(3, 4))
+grid.insert("大象", (20, 20))  # 也接受 tuple
+grid.insert("鸚鵡", Vector(6, 1))
+print(f"距離 (0, 0) 5 以內：{grid.within((0, 0), 5)}")
+print(f"離 Vector(19, 18) 最近的：{grid.nearest(Vector(19, 18))}")
 
 
 # ========== 白皮書中的範例：哺乳動物 "相加" ==========
 print("\n" + "=" * 80)
-print("【4. 白皮書範例：哺乳動物的 "相加" 運算】")
+print("【4. 白皮書範例：哺乳動物的「相加」運算】")
 print("=" * 80)
 
+class Pedigree:
+    """
+    族譜：以整數編號記錄每個個體的父母（有向無環圖）
+    父母一定比子女先登記，所以父母的編號一定比較小；-1 表示來源不明
+    
+    編號連續、父母相同的個體（例如一整窩）只記成一段：
+    starts 是各段第一個編號，fathers / mothers 是各段的父母，
+    所以登記一窩的記憶體與窩的大小無關，查詢父母則以二分搜尋找出所在的段
+    
+    近交係數以 Meuwissen–Luo 方法計算：沿父母往上走一次，取得親緣矩陣 A = L·D·Lᵀ
+    中這個個體的 L 係數，需要時才算，每段只保存一個數字；
+    親緣係數由兩者的 L 係數與 D 算出，不保存任何兩兩之間的結果
+    """
+    
+    UNKNOWN = -1
+    
+    def __init__(self):
+        self.starts = array("q")
+        self.fathers = array("q")
+        self.mothers = array("q")
+        self.__size = 0
+        # 各段的近交係數與 D 的對角項，NaN 表示還沒算過
+        self.__inbreeding = array("d")
+        self.__variances = array("d")
+    
+    def add(self, father=UNKNOWN, mother=UNKNOWN):
+        """登記一個個體，回傳其編號"""
+        return self.add_many(father, mother, 1)
+    
+    def add_many(self, father, mother, count):
+        """登記同一對父母的 count 個子女，回傳第一個編號（其餘依序遞增）"""
+        for parent in (father, mother):
+            if not self.UNKNOWN <= parent < self.__size:
+                raise ValueError(f"族譜中沒有編號 {parent}")
+        first = self.__size
+        if count > 0:
+            # 與上一段父母相同時直接延長（例如連續登記的始祖）
+            if not (self.fathers and self.fathers[-1] == father
+                    and self.mothers[-1] == mother):
+                self.starts.append(first)
+                self.fathers.append(father)
+                self.mothers.append(mother)
+                self.__inbreeding.append(math.nan)
+                self.__variances.append(math.nan)
+            self.__size += count
+        return first
+    
+    def __run(self, node):
+        if not 0 <= node < self.__size:
+            raise IndexError(f"族譜中沒有編號 {node}")
+        return bisect_right(self.starts, node) - 1
+    
+    def parents(self, node):
+        run = self.__run(node)
+        return self.fathers[run], self.mothers[run]
+    
+    def ancestors(self, node):
+        """所有祖先的編號（不含自己），每次沿父母往上走一遍，回傳新的集合"""
+        found = set()
+        stack = [node]
+        while stack:
+            for parent in self.parents(stack.pop()):
+                if parent != self.UNKNOWN and parent not in found:
+                    found.add(parent)
+                    stack.append(parent)
+        return found
+    
+    def common_ancestors(self, a, b):
+        """兩個個體的共同祖先（個體本身若是另一方的祖先也算）"""
+        return ((self.ancestors(a) | {a}) & (self.ancestors(b) | {b}))
+    
+    def __path_weights(self, node):
+        """
+        A = L·D·Lᵀ 中 node 那一列的 L：回傳 ({自己或祖先: 係數}, {自己或祖先: 所在的段})
+        由編號大到小展開，每個個體把係數的一半傳給父母；
+        輪到某個祖先時，所有經過它的子孫都已處理完，它的係數已經是總和
+        """
+        self.__run(node)  # 檢查編號
+        starts, fathers, mothers = self.starts, self.fathers, self.mothers
+        weights = {node: 1.0}
+        runs = {}
+        heap = [-node]
+        while heap:
+            current = -heapq.heappop(heap)
+            run = runs[current] = bisect_right(starts, current) - 1
+            half = 0.5 * weights[current]
+            for parent in (fathers[run], mothers[run]):
+                if parent == self.UNKNOWN:
+                    continue
+                if parent not in weights:
+                    weights[parent] = 0.0
+                    heapq.heappush(heap, -parent)
+                weights[parent] += half
+        return weights, runs
+    
+    def __variance(self, run):
+        """D 的對角項：孟德爾取樣變異，由父母的近交係數決定（父母必須已算好）"""
+        value = self.__variances[run]
+        if math.isnan(value):
+            known = [parent for parent in (self.fathers[run], self.mothers[run])
+                     if parent != self.UNKNOWN]
+            value = self.__variances[run] = (
+                1.0 - 0.25 * len(known)
+                - 0.25 * sum(self.__inbreeding[self.__run(parent)]
+                             for parent in known))
+        return value
+    
+    def __ensure_inbreeding(self, runs):
+        """
+        算出 runs（{個體: 所在的段}）中還沒算過的近交係數
+        runs 必須包含每個成員的所有祖先（例如 __path_weights 的結果），
+        由編號小到大計算，輪到某個個體時它的祖先都已算好
+        """
+        cache = self.__inbreeding
+        missing = [node for node, run in runs.items() if math.isnan(cache[run])]
+        for node in sorted(missing):
+            run = runs[node]
+            if not math.isnan(cache[run]):
+                continue  # 同一窩的兄弟姊妹剛算過
+            if self.UNKNOWN in (self.fathers[run], self.mothers[run]):
+                cache[run] = 0.0  # 有一方來源不明，視為沒有近親繁殖
+                continue
+            weights, member_runs = self.__path_weights(node)
+            cache[run] = sum(weight * weight
+                             * self.__variance(member_runs[member])
+                             for member, weight in weights.items()) - 1.0
+    
+    def inbreeding(self, node):
+        """近交係數：等於父母之間的親緣係數（每段只算一次）"""
+        run = self.__run(node)
+        if math.isnan(self.__inbreeding[run]):
+            self.__ensure_inbreeding(self.__path_weights(node)[1])
+        return self.__inbreeding[run]
+    
+    def kinship(self, a, b):
+        """
+        親緣係數：從兩者各隨機取一個基因，兩者來自同一祖先基因的機率
+        等於 A[a][b] / 2，也就是兩者共同的 L 係數乘上 D 之後的總和除以 2
+        """
+        if self.UNKNOWN in (a, b):
+            return 0.0  # 來源不明的一方與任何個體都視為無親緣
+        if a == b:
+            return 0.5 * (1.0 + self.inbreeding(a))
+        weights_a, runs = self.__path_weights(a)
+        weights_b, runs_b = self.__path_weights(b)
+        runs.update(runs_b)
+        self.__ensure_inbreeding(runs)
+        if len(weights_b) < len(weights_a):
+            weights_a, weights_b = weights_b, weights_a
+        return 0.5 * sum(weight * weights_b[member] * self.__variance(runs[member])
+                         for member, weight in weights_a.items()
+                         if member in weights_b)
+    
+    def clear_cache(self):
+        """丟掉已算好的近交係數（之後需要時重新計算）"""
+        for run in range(len(self.__inbreeding)):
+            self.__inbreeding[run] = self.__variances[run] = math.nan
+    
+    def __len__(self):
+        return self.__size
+
+
 class Mammal:
     """哺乳動物類別 - 自定義 "相加" 的意義"""
     
-    def __init__(self, name, age):
+    # 所有哺乳動物共用的族譜（類別變數，模擬時可換成新的 Pedigree）
+    pedigree = Pedigree()
+    
+    def __init__(self, name, age, parents=None):
+        """
+        :param parents: (父, 母)；省略時視為來源不明的始祖
+        """
         self.name = name
         self.age = age
+        father, mother = parents or (None, None)
+        self.id = self.pedigree.add(
+            father.id if father else Pedigree.UNKNOWN,
+            mother.id if mother else Pedigree.UNKNOWN)
+    
+    @classmethod
+    def _registered(cls, name, age, node):
+        """建立已在族譜中登記過的個體（供 Litter 使用）"""
+        mammal = cls.__new__(cls)
+        mammal.name = name
+        mammal.age = age
+        mammal.id = node
+        return mammal
+    
+    def inbreeding_coefficient(self):
+        return self.pedigree.inbreeding(self.id)
     
     def __add__(self, other):
         """
@@ -202,7 +825,7 @@ class Mammal:
         if isinstance(other, Mammal):
             new_name = self.name + other.name
             new_age = max(self.age, other.age)
-            offspring = Mammal(new_name, new_age)
+            offspring = Mammal(new_name, new_age, parents=(self, other))
             print(f"✓ {self.name} 和 {other.name} 產生了後代！")
             return offspring
         return NotImplemented
@@ -217,18 +840,73 @@ class Mammal:
         if isinstance(other, Mammal):
             # 產生多個混合名字的後代
             offspring_count = 2
-            offspring_list = []
-            for i in range(offspring_count):
-                new_name = f"{self.name}{other.name}_{i+1}"
-                new_age = max(self.age, other.age)
-                offspring_list.append(Mammal(new_name, new_age))
+            offspring_list = list(self.breed(other, offspring_count))
             print(f"✓ {self.name} 和 {other.name} 產生了 {offspring_count} 個後代！")
             return offspring_list
         return NotImplemented
+    
+    def breed(self, other, litter_size):
+        """
+        產生一窩 litter_size 隻後代（惰性，不輸出訊息）
+        回傳 Litter：用到某一隻時才建立，記憶體不隨窩的大小增加
+        """
+        return Litter(self, other, litter_size)
+    
+    @staticmethod
+    def breed_pairs(pairs, litter_size):
+        """多對父母依序產生後代的產生器"""
+        for first, second in pairs:
+            yield from first.breed(second, litter_size)
+
+
+class Litter:
+    """
+    一窩後代 - 惰性序列
+    只記住父母名字的組合與年齡，名字與 Mammal 物件都在取用時才產生
+    """
+    
+    __slots__ = ("prefix", "age", "size", "first_id")
+    
+    def __init__(self, first, second, size):
+        if size < 0:
+            raise ValueError("一窩的數量不能為負數")
+        self.prefix = first.name + second.name  # 整窩只串接一次
+        self.age = max(first.age, second.age)
+        self.size = size
+        # 整窩一次在族譜中登記，取用同一隻時編號不變
+        self.first_id = Mammal.pedigree.add_many(first.id, second.id, size)
+    
+    def name(self, index):
+        """第 index 隻（從 0 開始）的名字"""
+        return f"{self.prefix}_{index + 1}"
+    
+    def names(self):
+        return (self.name(index) for index in range(self.size))
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("超出這一窩的範圍")
+        return Mammal._registered(self.name(index), self.age,
+                                  self.first_id + index)
+    
+    def __iter__(self):
+        for index in range(self.size):
+            yield Mammal._registered(self.name(index), self.age,
+                                     self.first_id + index)
+    
+    def __repr__(self):
+        return f"Litter({self.prefix!r}, size={self.size})"
 
 
 # 使用哺乳動物的多型
-print("\n創建哺乳動物並 "相加"：")
+print("\n創建哺乳動物並「相加」：")
 dog = Mammal("Max", 5)
 cat = Mammal("Pumpkin", 8)
 
@@ -244,6 +922,16 @@ multiple_offspring = dog * cat
 for child in multiple_offspring:
     print(f"  - {child}")
 
+print("\n大量繁殖：breed() 回傳惰性的一窩，用到時才建立後代")
+litter = dog.breed(cat, 10_000)
+print(f"{litter}，第 1 隻：{litter[0]}，最後一隻：{litter[-1]}")
+
+print("\n族譜：每次配對都記錄父母，可以查祖先與近交係數")
+brother, sister = litter[0], litter[1]
+pup = brother + sister  # 兄妹配對
+print(f"{pup.name} 的近交係數：{pup.inbreeding_coefficient()}")
+print(f"{pup.name} 的祖先編號：{sorted(Mammal.pedigree.ancestors(pup.id))}")
+
 
 # ========== Duck Typing：鴨子型別 ==========
 print("\n" + "=" * 80)
@@ -286,6 +974,24 @@ def make_it_quack(duck_like_object):
     print(f"  - {duck_like_object.swim()}")
 
 
+DUCK_PROTOCOL = BatchDispatcher("quack", "swim")
+
+
+def make_them_quack(objects, keep_order=False):
+    """
+    批次版的 make_it_quack：同類別一起呼叫 quack 和 swim，輸出一次寫出
+    沒有 quack 或 swim 的物件會先列出來，不會讓整批中斷
+    """
+    objects, (sounds, swimming), rejected = DUCK_PROTOCOL.dispatch(
+        objects, keep_order)
+    if rejected:
+        print(f"\n略過 {len(rejected)} 個不會叫或不會游的物件："
+              f"{sorted({type(obj).__name__ for obj in rejected})}")
+    if objects:
+        print("\n".join(f"\n{type(obj).__name__}:\n  - {sound}\n  - {swim}"
+                        for obj, sound, swim in zip(objects, sounds, swimming)))
+
+
 # 使用 Duck Typing
 print("\n測試 Duck Typing：")
 objects = [Duck(), Person(), Robot()]
@@ -294,6 +1000,9 @@ for obj in objects:
     print(f"\n{obj.__class__.__name__}:")
     make_it_quack(obj)
 
+print("\n批次版本：同類別一起處理，不符合介面的物件先列出")
+make_them_quack(objects + [Duck(), Dog("Buddy")])
+
 print("\n✅ Duck Typing 的優勢：")
 print("   - 不需要繼承關係")
 print("   - 只要有相同的介面就可以")
@@ -3,13 +3,195 @@
 整合封裝、繼承與多型三大特性的完整應用
 """
 
+import asyncio
+import bisect
+import csv
+import inspect
+import json
+import math
+import mmap
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from datetime import datetime
-from typing import List, Optional
+from functools import wraps
+from itertools import islice
+from operator import methodcaller
+from types import FunctionType
+from typing import (Awaitable, Callable, Dict, Iterable, Iterator, List,
+                    NamedTuple, Optional, Tuple, Union)
 
-print("=" * 80)
-print("綜合實戰案例：動物園管理系統")
-print("整合 OOP 三大特性：封裝、繼承、多型")
-print("=" * 80)
+# ========== 報表輸出：結構化紀錄與可替換的接收器 ==========
+
+class ReportRecord(NamedTuple):
+    """
+    一筆報表紀錄
+    只保存樣板與參數，直到有人需要文字時才呼叫 format()
+    """
+    animal_id: Optional[int]    # 動物園層級的訊息為 None
+    action: str                 # create / feed / activity / checkup / ...
+    template: str
+    args: tuple
+    food: Optional[str] = None
+    amount: Optional[float] = None
+    
+    def format(self) -> str:
+        return self.template.format(*self.args)
+
+
+class ReportSink:
+    """
+    報表接收器基礎類別
+    展示：多型（Zoo 與 Animal 只呼叫 emit()，不關心輸出去哪裡）
+    """
+    enabled = True  # False 時連紀錄都不建立
+    
+    def emit(self, record: ReportRecord):
+        raise NotImplementedError("子類別必須實現 emit 方法")
+    
+    def flush(self):
+        pass
+
+
+class ConsoleSink(ReportSink):
+    """直接印到終端機（預設行為，與原本的 print 相同）"""
+    
+    def emit(self, record: ReportRecord):
+        print(record.format())
+
+
+class NullSink(ReportSink):
+    """丟棄所有輸出"""
+    enabled = False
+    
+    def emit(self, record: ReportRecord):
+        pass
+
+
+class BufferSink(ReportSink):
+    """保存在記憶體中的紀錄，需要時才轉成文字"""
+    
+    def __init__(self):
+        self.records: List[ReportRecord] = []
+    
+    def emit(self, record: ReportRecord):
+        self.records.append(record)
+    
+    def lines(self):
+        for record in self.records:
+            yield record.format()
+    
+    def getvalue(self) -> str:
+        return "".join(line + "\n" for line in self.lines())
+    
+    def clear(self):
+        self.records.clear()
+
+
+class FileSink(ReportSink):
+    """
+    寫入檔案：累積一批紀錄後才一次格式化並寫出
+    搭配大型緩衝區，大幅減少系統呼叫次數
+    """
+    
+    def __init__(self, path: str, batch_size: int = 4096,
+                 buffer_size: int = 1 << 20):
+        self.__file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+        self.__batch_size = batch_size
+        self.__pending: List[ReportRecord] = []
+    
+    def emit(self, record: ReportRecord):
+        self.__pending.append(record)
+        if len(self.__pending) >= self.__batch_size:
+            self.__drain()
+    
+    def __drain(self):
+        if self.__pending:
+            self.__file.write("".join(record.format() + "\n"
+                                      for record in self.__pending))
+            self.__pending.clear()
+    
+    def flush(self):
+        self.__drain()
+        self.__file.flush()
+    
+    def close(self):
+        self.__drain()
+        self.__file.close()
+    
+    def __enter__(self) -> "FileSink":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# 目前使用中的接收器；ContextVar 讓不同執行緒或協程可以各自設定
+_current_sink: ContextVar[ReportSink] = ContextVar(
+    "report_sink", default=ConsoleSink())
+
+
+@contextmanager
+def use_sink(sink: ReportSink):
+    """在 with 區塊內把 Animal 與 Zoo 的輸出導向指定的接收器"""
+    token = _current_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _current_sink.reset(token)
+
+
+# ========== 特殊行為註冊表 ==========
+
+class BehaviorRegistry:
+    """
+    特殊行為註冊表
+    展示：多型（以「類別 -> 行為」查表取代 isinstance 判斷鏈）
+    
+    查找以具體類別為鍵，一次字典查詢即可；
+    沒有直接註冊的類別（例如 LionView）沿 MRO 找到最近的祖先，
+    結果快取起來，之後同一類別不再走 MRO。
+    """
+    
+    def __init__(self):
+        self.__behaviors: Dict[type, Callable] = {}
+        self.__resolved: Dict[type, Optional[Callable]] = {}
+    
+    def register(self, animal_class: type, behavior: Callable) -> Callable:
+        """
+        註冊某類別的特殊行為：behavior(animal)
+        以方法名稱登記（例如 methodcaller("hunt")），子類別覆寫的方法才會生效
+        """
+        self.__behaviors[animal_class] = behavior
+        # 新註冊可能改變其他類別沿 MRO 找到的結果
+        self.__resolved.clear()
+        return behavior
+    
+    def lookup(self, animal_class: type) -> Optional[Callable]:
+        """找出某類別的特殊行為；沒有則回傳 None"""
+        try:
+            return self.__resolved[animal_class]
+        except KeyError:
+            pass
+        behavior = None
+        for ancestor in animal_class.__mro__:
+            if ancestor in self.__behaviors:
+                behavior = self.__behaviors[ancestor]
+                break
+        self.__resolved[animal_class] = behavior
+        return behavior
+    
+    def __len__(self) -> int:
+        return len(self.__behaviors)
+
+
+special_behaviors = BehaviorRegistry()
 
 
 # ========== 基礎類別層次 ==========
@@ -21,6 +203,15 @@ class Animal:
     """
     # 類別變數：所有實例共享
     total_animals = 0
+    # 下一個可用的編號；批次建立會預先保留一段編號，所以與總數分開記錄
+    _next_id = 1
+    # 多個執行緒同時建立動物時，保護上面兩個計數器的「讀取-修改-寫回」
+    _counter_lock = threading.Lock()
+    # 以 __slots__ 宣告實例欄位（私有名稱同樣會被改寫成 _Animal__name 等），
+    # 實例不帶 __dict__，因此不能再任意新增屬性（例如 lion.nickname = ...）；
+    # 需要時讓子類別不宣告 __slots__，就會自動恢復 __dict__
+    __slots__ = ("__id", "__name", "__species", "__age", "__weight",
+                 "__health_status", "__last_checkup", "__weakref__")
     
     def __init__(self, name: str, species: str, age: int, weight: float):
         """
@@ -35,11 +226,54 @@ class Animal:
         self.__health_status = "健康"
         self.__last_checkup = None
         
-        # 增加動物總數
-        Animal.total_animals += 1
-        print(f"✓ 新增動物：{species} - {name}")
+        # 增加動物總數，並以流水號作為動物編號；
+        # 在 animal_batch() 之內建立時改由批次配發編號，也不逐一輸出
+        batch = _current_batch.get()
+        if batch is None:
+            self.__id = Animal._register()
+            self._report("create", "✓ 新增動物：{} - {}", species, name)
+        else:
+            self.__id = batch.next_id()
+    
+    @classmethod
+    def _register(cls, count: int = 1) -> int:
+        """登記 count 隻新動物，回傳第一隻的編號（執行緒安全）"""
+        with Animal._counter_lock:
+            first_id = Animal._next_id
+            Animal._next_id += count
+            Animal.total_animals += count
+        return first_id
+    
+    @classmethod
+    def _reserve_ids(cls, count: int) -> int:
+        """只保留 count 個編號、不計入總數，回傳第一個編號"""
+        with Animal._counter_lock:
+            first_id = Animal._next_id
+            Animal._next_id += count
+        return first_id
+    
+    @classmethod
+    def _count_created(cls, count: int):
+        """把已保留編號的 count 隻動物計入總數"""
+        with Animal._counter_lock:
+            Animal.total_animals += count
+    
+    def _report(self, action: str, template: str, *args,
+                food: Optional[str] = None, amount: Optional[float] = None):
+        """
+        輸出報表紀錄（受保護方法，供子類別使用）
+        紀錄交給目前的接收器，真正需要文字時才格式化
+        """
+        sink = _current_sink.get()
+        if sink.enabled:
+            sink.emit(ReportRecord(self.__id, action, template, args,
+                                   food, amount))
     
     # 使用 @property 提供受控的屬性訪問
+    @property
+    def animal_id(self) -> int:
+        return self.__id
+    
     @property
     def name(self) -> str:
         return self.__name
@@ -72,21 +306,33 @@ class Animal:
     def health_status(self) -> str:
         return self.__health_status
     
-    def health_checkup(self, status: str):
+    @property
+    def last_checkup(self) -> Optional[datetime]:
+        return self.__last_checkup
+    
+    def health_checkup(self, status: str, when: Optional[datetime] = None):
         """
         健康檢查
         展示：封裝（控制內部狀態的修改）
+        
+        :param when: 檢查時間，省略時為現在（補登紀錄時可指定）
         """
+        self._record_checkup(status, when or datetime.now())
+        self._report("checkup", "  ✓ {} 完成健康檢查，狀態：{}",
+                     self.__name, status)
+    
+    def _record_checkup(self, status: str, when: datetime):
+        """只更新檢查結果、不輸出（供批次檢查使用）"""
         self.__health_status = status
-        self.__last_checkup = datetime.now()
-        print(f"  ✓ {self.__name} 完成健康檢查，狀態：{status}")
+        self.__last_checkup = when
     
     def feed(self, food: str, amount: float):
         """
         餵食方法（抽象行為，期望子類別覆寫）
         展示：多型的基礎
         """
-        print(f"  餵食 {self.__name}：{food} {amount}kg")
+        self._report("feed", "  餵食 {}：{} {}kg", self.__name, food, amount,
+                     food=food, amount=amount)
     
     def make_sound(self) -> str:
         """
@@ -100,7 +346,7 @@ class Animal:
         日常活動（抽象方法）
         展示：多型
         """
-        print(f"  {self.__name} 正在活動")
+        self._report("activity", "  {} 正在活動", self.__name)
     
     def get_info(self) -> str:
         """獲取動物資訊"""
@@ -122,6 +368,7 @@ class Mammal(Animal):
     哺乳動物類別
     展示：繼承（is-a 關係）
     """
+    __slots__ = ("fur_color",)
     
     def __init__(self, name: str, species: str, age: int, weight: float, 
                  fur_color: str):
@@ -134,12 +381,15 @@ class Mammal(Animal):
         覆寫餵食方法
         展示：多型（相同介面，不同實現）
         """
-        print(f"  🥩 餵食哺乳動物 {self.name}：{food} {amount}kg")
-        print(f"     {self.name} 正在用牙齒咀嚼食物")
+        self._report("feed",
+                     "  🥩 餵食哺乳動物 {}：{} {}kg\n"
+                     "     {} 正在用牙齒咀嚼食物",
+                     self.name, food, amount, self.name,
+                     food=food, amount=amount)
     
     def nurse_young(self):
         """哺乳動物特有的行為"""
-        print(f"  🍼 {self.name} 正在哺育幼獸")
+        self._report("behavior", "  🍼 {} 正在哺育幼獸", self.name)
 
 
 class Bird(Animal):
@@ -147,6 +397,7 @@ class Bird(Animal):
     鳥類別
     展示：繼承
     """
+    __slots__ = ("wingspan",)
     
     def __init__(self, name: str, species: str, age: int, weight: float, 
                  wingspan: float):
@@ -158,12 +409,16 @@ class Bird(Animal):
         覆寫餵食方法
         展示：多型
         """
-        print(f"  🌾 餵食鳥類 {self.name}：{food} {amount}kg")
-        print(f"     {self.name} 正在用喙啄食")
+        self._report("feed",
+                     "  🌾 餵食鳥類 {}：{} {}kg\n"
+                     "     {} 正在用喙啄食",
+                     self.name, food, amount, self.name,
+                     food=food, amount=amount)
     
     def fly(self):
         """鳥類特有的行為"""
-        print(f"  🦅 {self.name} 展開 {self.wingspan}m 的翅膀，正在飛翔")
+        self._report("behavior", "  🦅 {} 展開 {}m 的翅膀，正在飛翔",
+                     self.name, self.wingspan)
 
 
 class Reptile(Animal):
@@ -171,6 +426,7 @@ class Reptile(Animal):
     爬行動物類別
     展示：繼承
     """
+    __slots__ = ("scale_type",)
     
     def __init__(self, name: str, species: str, age: int, weight: float, 
                  scale_type: str):
@@ -182,18 +438,22 @@ class Reptile(Animal):
         覆寫餵食方法
         展示：多型
         """
-        print(f"  🦎 餵食爬行動物 {self.name}：{food} {amount}kg")
-        print(f"     {self.name} 正在吞食獵物")
+        self._report("feed",
+                     "  🦎 餵食爬行動物 {}：{} {}kg\n"
+                     "     {} 正在吞食獵物",
+                     self.name, food, amount, self.name,
+                     food=food, amount=amount)
     
     def bask_in_sun(self):
         """爬行動物特有的行為：曬太陽"""
-        print(f"  ☀️ {self.name} 正在曬太陽調節體溫")
+        self._report("behavior", "  ☀️ {} 正在曬太陽調節體溫", self.name)
 
 
 # ========== 具體動物子類別 ==========
 
 class Lion(Mammal):
     """獅子類別 - 多層繼承"""
+    __slots__ = ("pride_size",)
     
     def __init__(self, name: str, age: int, weight: float, fur_color: str, 
                  pride_size: int = 1):
@@ -206,15 +466,20 @@ class Lion(Mammal):
     
     def daily_activity(self):
         """展示：多型"""
-        print(f"  🦁 {self.name} 正在巡視領地")
+        self._report("activity", "  🦁 {} 正在巡視領地", self.name)
     
     def hunt(self):
         """獅子特有的行為"""
-        print(f"  🎯 {self.name} 正在狩獵，獅群規模：{self.pride_size}")
+        self._report("behavior", "  🎯 {} 正在狩獵，獅群規模：{}",
+                     self.name, self.pride_size)
+
+
+special_behaviors.register(Lion, methodcaller("hunt"))
 
 
 class Elephant(Mammal):
     """大象類別"""
+    __slots__ = ("tusk_length",)
     
     def __init__(self, name: str, age: int, weight: float, fur_color: str, 
                  tusk_length: float):
@@ -225,15 +490,19 @@ class Elephant(Mammal):
         return "trumpet：嗚~~~"
     
     def daily_activity(self):
-        print(f"  🐘 {self.name} 正在用長鼻子噴水洗澡")
+        self._report("activity", "  🐘 {} 正在用長鼻子噴水洗澡", self.name)
     
     def spray_water(self):
         """大象特有的行為"""
-        print(f"  💦 {self.name} 用鼻子噴水")
+        self._report("behavior", "  💦 {} 用鼻子噴水", self.name)
+
+
+special_behaviors.register(Elephant, methodcaller("spray_water"))
 
 
 class Parrot(Bird):
     """鸚鵡類別"""
+    __slots__ = ("vocabulary_size",)
     
     def __init__(self, name: str, age: int, weight: float, wingspan: float, 
                  vocabulary_size: int = 0):
@@ -244,15 +513,19 @@ class Parrot(Bird):
         return "squawk：嘎嘎嘎！"
     
     def daily_activity(self):
-        print(f"  🦜 {self.name} 正在樹枝上跳躍")
+        self._report("activity", "  🦜 {} 正在樹枝上跳躍", self.name)
     
     def mimic_speech(self, phrase: str):
         """鸚鵡特有的行為：模仿說話"""
-        print(f"  🗣️ {self.name} 模仿說話：「{phrase}」")
+        self._report("behavior", "  🗣️ {} 模仿說話：「{}」", self.name, phrase)
+
+
+special_behaviors.register(Parrot, methodcaller("mimic_speech", "你好！"))
 
 
 class Snake(Reptile):
     """蛇類別"""
+    __slots__ = ("length", "is_venomous")
     
     def __init__(self, name: str, age: int, weight: float, scale_type: str, 
                  length: float, is_venomous: bool = False):
@@ -264,12 +537,1214 @@ class Snake(Reptile):
         return "hiss：嘶嘶嘶..."
     
     def daily_activity(self):
-        print(f"  🐍 {self.name} 正在草叢中爬行，長度：{self.length}m")
+        self._report("activity", "  🐍 {} 正在草叢中爬行，長度：{}m",
+                     self.name, self.length)
     
     def shed_skin(self):
         """蛇特有的行為：蛻皮"""
         venom_info = "有毒" if self.is_venomous else "無毒"
-        print(f"  🔄 {self.name} 正在蛻皮 ({venom_info})")
+        self._report("behavior", "  🔄 {} 正在蛻皮 ({})", self.name, venom_info)
+
+
+special_behaviors.register(Snake, methodcaller("shed_skin"))
+
+
+def _concrete_class(animal) -> type:
+    """動物的具體類別；代理（例如 LionView）回傳它所代表的 Lion"""
+    if isinstance(animal, AnimalView):
+        return animal.animal_class
+    return type(animal)
+
+
+def _animal_extras(animal) -> Dict[str, object]:
+    """
+    取出子類別專屬欄位（fur_color、wingspan 等）
+    包含各類別 __slots__ 中的欄位，以及未宣告 __slots__ 的子類別放在 __dict__ 的屬性；
+    代理的欄位存在儲存區，直接向儲存區讀取
+    """
+    if isinstance(animal, AnimalView):
+        return animal.extra_fields()
+    extras = {}
+    for klass in reversed(type(animal).__mro__):
+        for slot in vars(klass).get("__slots__", ()):
+            if not slot.startswith("_") and hasattr(animal, slot):
+                extras[slot] = getattr(animal, slot)
+    extras.update(getattr(animal, "__dict__", {}))
+    return extras
+
+
+# ========== 欄式儲存：大量動物的緊湊表示 ==========
+
+class _InternTable:
+    """字串駐留表：相同字串只存一份，欄位中只記錄整數代碼"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+class AnimalRowStore:
+    """
+    「以列編號存取動物」的儲存區基礎類別
+    展示：多型（Zoo 與 AnimalView 只依賴這組介面，不在意資料放在哪裡）
+    
+    子類別提供單列欄位的讀寫方法；序列介面、detach 與批次寫入
+    都以這些方法實作在這裡。
+    """
+    
+    # ----- 子類別必須提供的單列欄位存取 -----
+    
+    def animal_id(self, index: int) -> int:
+        raise NotImplementedError
+    
+    def name(self, index: int) -> str:
+        raise NotImplementedError
+    
+    def species(self, index: int) -> str:
+        raise NotImplementedError
+    
+    def age(self, index: int) -> int:
+        raise NotImplementedError
+    
+    def set_age(self, index: int, value: int):
+        raise NotImplementedError
+    
+    def weight(self, index: int) -> float:
+        raise NotImplementedError
+    
+    def set_weight(self, index: int, value: float):
+        raise NotImplementedError
+    
+    def health_status(self, index: int) -> str:
+        raise NotImplementedError
+    
+    def set_health_status(self, index: int, status: str):
+        raise NotImplementedError
+    
+    def last_checkup(self, index: int) -> Optional[datetime]:
+        raise NotImplementedError
+    
+    def set_last_checkup(self, index: int, when: Optional[datetime]):
+        raise NotImplementedError
+    
+    def animal_class(self, index: int) -> type:
+        raise NotImplementedError
+    
+    def extra_fields(self, index: int) -> Dict[str, object]:
+        raise NotImplementedError
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+    
+    # ----- 增刪（唯讀的儲存區不必覆寫） -----
+    
+    def append_row(self, animal_class: type, name: str, species: str,
+                   age: int, weight: float, health_status: str = "健康",
+                   last_checkup: Optional[datetime] = None,
+                   extras: Optional[Dict[str, object]] = None,
+                   animal_id: Optional[int] = None):
+        raise TypeError(f"{type(self).__name__} 不支援新增動物")
+    
+    def swap_remove(self, index: int) -> Animal:
+        raise TypeError(f"{type(self).__name__} 不支援移除動物")
+    
+    def set_extra_field(self, index: int, field: str, value: object):
+        raise AttributeError(f"{type(self).__name__} 不支援修改欄位 '{field}'")
+    
+    def append(self, animal: Animal):
+        """新增一隻動物（複製其欄位後即不再持有原物件）"""
+        self.append_row(_concrete_class(animal), animal.name, animal.species,
+                        animal.age, animal.weight, animal.health_status,
+                        animal._Animal__last_checkup, _animal_extras(animal),
+                        animal.animal_id)
+    
+    # ----- 以單列存取組合出的共用功能 -----
+    
+    def set_checkup_range(self, start: int, codes: bytes,
+                          statuses: List[str], when: datetime):
+        """
+        批次寫入健康檢查結果
+        codes[k] 是 statuses 的索引，對應第 start + k 列
+        """
+        for offset, code in enumerate(codes):
+            self.set_health_status(start + offset, statuses[code])
+            self.set_last_checkup(start + offset, when)
+    
+    def detach(self, index: int) -> Animal:
+        """
+        把某一列還原成獨立的 Animal 物件（不經過建構器，不計數也不輸出）
+        """
+        animal_class = self.animal_class(index)
+        animal = animal_class.__new__(animal_class)
+        animal._Animal__id = self.animal_id(index)
+        animal._Animal__name = self.name(index)
+        animal._Animal__species = self.species(index)
+        animal._Animal__age = self.age(index)
+        animal._Animal__weight = self.weight(index)
+        animal._Animal__health_status = self.health_status(index)
+        animal._Animal__last_checkup = self.last_checkup(index)
+        for field, value in self.extra_fields(index).items():
+            setattr(animal, field, value)
+        return animal
+    
+    def __getitem__(self, index: int) -> "AnimalView":
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("動物索引超出範圍")
+        return _view_class(self.animal_class(index))(self, index)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class ColumnarAnimalStore(AnimalRowStore):
+    """
+    欄式動物儲存區（Struct of Arrays）
+    展示：封裝（對外仍是「動物序列」，內部改用平行的型別陣列）
+
+    年齡、體重、健康狀態、檢查時間各存成一條 array；
+    物種與健康狀態字串經駐留表轉為整數代碼，名稱則以 UTF-8
+    連續存放在一個 bytearray 中，只記錄起點與長度。
+    store[i] 取出的是輕量的 AnimalView，而非完整的 Animal 物件。
+    """
+
+    def __init__(self):
+        self.__ids = array("q")
+        self.__ages = array("q")
+        self.__weights = array("d")
+        self.__health = array("B")
+        self.__checkups = array("d")      # NaN 表示尚未做過健康檢查
+        self.__species = array("I")
+        self.__name_starts = array("Q")
+        self.__name_lengths = array("I")
+        self.__name_bytes = bytearray()
+        self.__kinds = array("B")
+        self.__extras: List[tuple] = []   # 子類別專屬欄位（fur_color 等）
+        self.__species_table = _InternTable()
+        self.__status_table = _InternTable()
+        self.__kind_classes: List[type] = []
+        self.__kind_fields: List[tuple] = []
+        self.__kind_codes: Dict[type, int] = {}
+
+    def __kind_code(self, animal_class: type, fields: tuple) -> int:
+        code = self.__kind_codes.get(animal_class)
+        if code is None:
+            code = len(self.__kind_classes)
+            self.__kind_classes.append(animal_class)
+            self.__kind_fields.append(fields)
+            self.__kind_codes[animal_class] = code
+        return code
+
+    def append_row(self, animal_class: type, name: str, species: str,
+                   age: int, weight: float, health_status: str = "健康",
+                   last_checkup: Optional[datetime] = None,
+                   extras: Optional[Dict[str, object]] = None,
+                   animal_id: Optional[int] = None):
+        """
+        直接以欄位值新增一列，不必先建立 Animal 物件
+        未指定 animal_id 時視為新動物，登記到 Animal.total_animals
+        """
+        extras = extras or {}
+        kind = self.__kind_code(animal_class, tuple(extras))
+        fields = self.__kind_fields[kind]
+        if animal_id is None:
+            animal_id = Animal._register()
+        self.__ids.append(animal_id)
+        self.__ages.append(age)
+        self.__weights.append(weight)
+        self.__health.append(self.__status_table.intern(health_status))
+        self.__checkups.append(
+            last_checkup.timestamp() if last_checkup else math.nan)
+        self.__species.append(self.__species_table.intern(species))
+        encoded = name.encode("utf-8")
+        self.__name_starts.append(len(self.__name_bytes))
+        self.__name_lengths.append(len(encoded))
+        self.__name_bytes += encoded
+        self.__kinds.append(kind)
+        self.__extras.append(
+            tuple(extras.get(field) for field in fields) if fields else ())
+    
+    # ----- 單列欄位存取（供 AnimalView 使用） -----
+
+    def animal_id(self, index: int) -> int:
+        return self.__ids[index]
+
+    def name(self, index: int) -> str:
+        start = self.__name_starts[index]
+        end = start + self.__name_lengths[index]
+        return self.__name_bytes[start:end].decode("utf-8")
+
+    def species(self, index: int) -> str:
+        return self.__species_table.values[self.__species[index]]
+
+    def age(self, index: int) -> int:
+        return self.__ages[index]
+
+    def set_age(self, index: int, value: int):
+        self.__ages[index] = value
+
+    def weight(self, index: int) -> float:
+        return self.__weights[index]
+
+    def set_weight(self, index: int, value: float):
+        self.__weights[index] = value
+
+    def health_status(self, index: int) -> str:
+        return self.__status_table.values[self.__health[index]]
+
+    def set_health_status(self, index: int, status: str):
+        self.__health[index] = self.__status_table.intern(status)
+
+    def last_checkup(self, index: int) -> Optional[datetime]:
+        timestamp = self.__checkups[index]
+        if math.isnan(timestamp):
+            return None
+        return datetime.fromtimestamp(timestamp)
+
+    def set_last_checkup(self, index: int, when: Optional[datetime]):
+        self.__checkups[index] = when.timestamp() if when else math.nan
+
+    def animal_class(self, index: int) -> type:
+        return self.__kind_classes[self.__kinds[index]]
+
+    def extra_fields(self, index: int) -> Dict[str, object]:
+        fields = self.__kind_fields[self.__kinds[index]]
+        return dict(zip(fields, self.__extras[index]))
+
+    def set_extra_field(self, index: int, field: str, value: object):
+        fields = self.__kind_fields[self.__kinds[index]]
+        if field not in fields:
+            raise AttributeError(
+                f"{self.animal_class(index).__name__} 沒有欄位 '{field}'")
+        values = list(self.__extras[index])
+        values[fields.index(field)] = value
+        self.__extras[index] = tuple(values)
+
+    def set_checkup_range(self, start: int, codes: bytes,
+                          statuses: List[str], when: datetime):
+        """以陣列切片一次寫入整個分片"""
+        end = start + len(codes)
+        table = bytearray(range(256))
+        for code, status in enumerate(statuses):
+            table[code] = self.__status_table.intern(status)
+        self.__health[start:end] = array("B", codes.translate(table))
+        timestamps = array("d", [when.timestamp()]) * len(codes)
+        self.__checkups[start:end] = timestamps
+    
+    def swap_remove(self, index: int) -> Animal:
+        """
+        移除一列：把最後一列搬到被移除的位置，因此是 O(1)
+        回傳被移除動物的獨立副本；名稱緩衝區只增不減
+        """
+        removed = self.detach(index)
+        columns = (self.__ids, self.__ages, self.__weights, self.__health,
+                   self.__checkups, self.__species, self.__name_starts,
+                   self.__name_lengths, self.__kinds, self.__extras)
+        for column in columns:
+            column[index] = column[-1]
+            column.pop()
+        return removed
+
+    def column(self, field: str) -> memoryview:
+        """
+        取得數值欄位的唯讀視圖（age / weight / last_checkup）
+        適合整欄統計，完全不需要建立任何動物物件
+        """
+        columns = {"age": self.__ages, "weight": self.__weights,
+                   "last_checkup": self.__checkups}
+        if field not in columns:
+            raise KeyError(f"沒有數值欄位：{field}")
+        return memoryview(columns[field]).toreadonly()
+    
+    def __len__(self) -> int:
+        return len(self.__ages)
+
+
+class AnimalView(Animal):
+    """
+    欄式儲存中某一列的輕量代理
+    展示：多型（代理物件仍是 Lion / Parrot 等的實例）
+
+    Animal 的方法透過名稱改寫存取 self._Animal__name 等屬性，
+    這裡把這些名稱定義成 property，讀寫直接轉向儲存區的欄位，
+    因此 feed()、health_checkup() 與屬性驗證都不必重寫。
+    
+    這裡不宣告 __slots__：_store 與 _index 放在 __dict__，
+    LionView 才能同時繼承 AnimalView 與帶有自己欄位的 Lion。
+    """
+    
+    def __init__(self, store: AnimalRowStore, index: int):
+        # 不呼叫 super().__init__()：代理不是新動物，不計數也不輸出
+        self._store = store
+        self._index = index
+
+    @property
+    def animal_class(self) -> type:
+        return self._store.animal_class(self._index)
+
+    def extra_fields(self) -> Dict[str, object]:
+        return self._store.extra_fields(self._index)
+
+    def __getattr__(self, attr: str):
+        # 只在一般查找失敗時才會被呼叫：用來提供 fur_color 等子類別欄位
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        extras = self.extra_fields()
+        if attr not in extras:
+            raise AttributeError(
+                f"{type(self).__name__} 沒有屬性 '{attr}'")
+        return extras[attr]
+
+    def __setattr__(self, attr: str, value: object):
+        # age 等 property 照常處理；fur_color 等子類別欄位寫回儲存區，
+        # 否則會落在繼承自 Mammal 等類別的 slot，重新取出的代理看不到
+        if attr.startswith("_") or isinstance(
+                getattr(type(self), attr, None), property):
+            super().__setattr__(attr, value)
+        else:
+            self._store.set_extra_field(self._index, attr, value)
+
+    @property
+    def _Animal__id(self) -> int:
+        return self._store.animal_id(self._index)
+
+    @property
+    def _Animal__name(self) -> str:
+        return self._store.name(self._index)
+
+    @property
+    def _Animal__species(self) -> str:
+        return self._store.species(self._index)
+
+    @property
+    def _Animal__age(self) -> int:
+        return self._store.age(self._index)
+
+    @_Animal__age.setter
+    def _Animal__age(self, value: int):
+        self._store.set_age(self._index, value)
+
+    @property
+    def _Animal__weight(self) -> float:
+        return self._store.weight(self._index)
+
+    @_Animal__weight.setter
+    def _Animal__weight(self, value: float):
+        self._store.set_weight(self._index, value)
+
+    @property
+    def _Animal__health_status(self) -> str:
+        return self._store.health_status(self._index)
+
+    @_Animal__health_status.setter
+    def _Animal__health_status(self, status: str):
+        self._store.set_health_status(self._index, status)
+
+    @property
+    def _Animal__last_checkup(self) -> Optional[datetime]:
+        return self._store.last_checkup(self._index)
+
+    @_Animal__last_checkup.setter
+    def _Animal__last_checkup(self, when: Optional[datetime]):
+        self._store.set_last_checkup(self._index, when)
+
+
+_VIEW_CLASSES: Dict[type, type] = {}
+
+
+def _view_class(animal_class: type) -> type:
+    """為每個具體類別建立（並快取）對應的代理類別，例如 LionView"""
+    view_class = _VIEW_CLASSES.get(animal_class)
+    if view_class is None:
+        if animal_class is Animal:
+            view_class = AnimalView
+        else:
+            view_class = type(f"{animal_class.__name__}View",
+                              (AnimalView, animal_class), {"__slots__": ()})
+        _VIEW_CLASSES[animal_class] = view_class
+    return view_class
+
+
+# ========== 記憶體映射快照 ==========
+#
+# 快照檔格式（小端序）：
+#   標頭      magic、動物數量、字串數量、字串位元組數、中繼資料長度
+#   紀錄區    每隻動物一筆固定寬度的紀錄（_SNAPSHOT_RECORD）
+#   字串表    (字串數量 + 1) 個 uint64 位移，接著是 UTF-8 位元組；
+#             存放名稱與子類別專屬欄位（JSON 陣列，相同內容只存一份）
+#   中繼資料  JSON：動物園名稱、物種、健康狀態、類別與其專屬欄位名稱
+
+_SNAPSHOT_MAGIC = b"ZOOSNAP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sQQQQ")
+# 編號、年齡、體重、檢查時間、名稱、專屬欄位、物種、健康狀態、類別
+_SNAPSHOT_RECORD = struct.Struct("<qqddIIHBB")
+_SNAPSHOT_AGE = (struct.Struct("<q"), 8)
+_SNAPSHOT_WEIGHT = (struct.Struct("<d"), 16)
+_SNAPSHOT_CHECKUP = (struct.Struct("<d"), 24)
+_SNAPSHOT_HEALTH = (struct.Struct("<B"), 42)
+# 字串表中相鄰的兩個位移：第 i 個字串的起點與終點
+_SNAPSHOT_STRING_SPAN = struct.Struct("<QQ")
+_NO_EXTRAS = 0xFFFFFFFF
+
+
+def _animal_classes() -> Dict[str, type]:
+    """目前已載入的 Animal 子類別：名稱 -> 類別（走訪一次繼承樹）"""
+    classes = {}
+    pending = [Animal]
+    while pending:
+        animal_class = pending.pop()
+        classes.setdefault(animal_class.__qualname__, animal_class)
+        pending.extend(animal_class.__subclasses__())
+    return classes
+
+
+def _animal_class_named(qualname: str) -> type:
+    """依名稱找出已載入的 Animal 子類別"""
+    try:
+        return _animal_classes()[qualname]
+    except KeyError:
+        raise ValueError(f"找不到動物類別：{qualname}") from None
+
+
+def _snapshot_rows(animals):
+    """逐列取出 (類別, 編號, 名稱, 物種, 年齡, 體重, 狀態, 檢查時間, 專屬欄位)"""
+    if isinstance(animals, AnimalRowStore):
+        for index in range(len(animals)):
+            yield (animals.animal_class(index), animals.animal_id(index),
+                   animals.name(index), animals.species(index),
+                   animals.age(index), animals.weight(index),
+                   animals.health_status(index),
+                   animals.last_checkup(index), animals.extra_fields(index))
+    else:
+        for animal in animals:
+            yield (_concrete_class(animal),
+                   animal.animal_id, animal.name, animal.species,
+                   animal.age, animal.weight, animal.health_status,
+                   animal._Animal__last_checkup, _animal_extras(animal))
+
+
+def _write_snapshot(path: str, zoo_name: str, animals) -> int:
+    species_table = _InternTable()
+    status_table = _InternTable()
+    extras_table: Dict[str, int] = {}
+    kind_codes: Dict[type, int] = {}
+    kind_fields: List[List[str]] = []
+    string_offsets = array("Q", [0])
+    string_bytes = bytearray()
+    
+    def add_string(text: str) -> int:
+        string_bytes.extend(text.encode("utf-8"))
+        string_offsets.append(len(string_bytes))
+        return len(string_offsets) - 2
+    
+    count = 0
+    with open(path, "wb") as file:
+        file.write(bytes(_SNAPSHOT_HEADER.size))
+        for (animal_class, animal_id, name, species, age, weight, status,
+             last_checkup, extras) in _snapshot_rows(animals):
+            kind = kind_codes.get(animal_class)
+            if kind is None:
+                kind = kind_codes[animal_class] = len(kind_fields)
+                kind_fields.append(list(extras))
+            extras_index = _NO_EXTRAS
+            if extras:
+                values = [extras.get(field) for field in kind_fields[kind]]
+                encoded = json.dumps(values, ensure_ascii=False)
+                extras_index = extras_table.get(encoded)
+                if extras_index is None:
+                    extras_index = extras_table[encoded] = add_string(encoded)
+            file.write(_SNAPSHOT_RECORD.pack(
+                animal_id, age, weight,
+                last_checkup.timestamp() if last_checkup else math.nan,
+                add_string(name), extras_index,
+                species_table.intern(species),
+                status_table.intern(status), kind))
+            count += 1
+        
+        meta = json.dumps({
+            "zoo": zoo_name,
+            "species": species_table.values,
+            "statuses": status_table.values,
+            "classes": [klass.__qualname__ for klass in kind_codes],
+            "fields": kind_fields,
+        }, ensure_ascii=False).encode("utf-8")
+        if sys.byteorder == "big":
+            string_offsets.byteswap()
+        file.write(string_offsets.tobytes())
+        file.write(string_bytes)
+        file.write(meta)
+        file.seek(0)
+        file.write(_SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC, count, len(string_offsets) - 1,
+            len(string_bytes), len(meta)))
+    return count
+
+
+class SnapshotAnimalStore(AnimalRowStore):
+    """
+    以 mmap 開啟的快照檔
+    展示：封裝（開檔只讀標頭與中繼資料，動物在被存取時才解碼）
+    
+    映射採用寫入時複製（ACCESS_COPY）：健康檢查、年齡與體重的修改
+    只存在於本行程，不會寫回檔案；快照不支援新增或移除動物。
+    """
+    
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.__mmap = mmap.mmap(file.fileno(), 0,
+                                    access=mmap.ACCESS_COPY)
+        (magic, count, string_count, string_size,
+         meta_size) = _SNAPSHOT_HEADER.unpack_from(self.__mmap, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            self.__mmap.close()
+            raise ValueError(f"{path} 不是動物園快照檔")
+        
+        self.__count = count
+        self.__records_at = _SNAPSHOT_HEADER.size
+        offsets_at = self.__records_at + count * _SNAPSHOT_RECORD.size
+        self.__offsets_at = offsets_at
+        self.__strings_at = offsets_at + 8 * (string_count + 1)
+        meta_at = self.__strings_at + string_size
+        meta = json.loads(self.__mmap[meta_at:meta_at + meta_size])
+        
+        self.zoo_name: str = meta["zoo"]
+        self.__species: List[str] = meta["species"]
+        self.__statuses: List[str] = meta["statuses"]
+        self.__status_codes = {status: code for code, status
+                               in enumerate(self.__statuses)}
+        classes = _animal_classes()
+        try:
+            self.__kind_classes = [classes[name] for name in meta["classes"]]
+        except KeyError as error:
+            raise ValueError(f"找不到動物類別：{error.args[0]}") from None
+        self.__kind_fields = [tuple(fields) for fields in meta["fields"]]
+    
+    def __record(self, index: int) -> tuple:
+        return _SNAPSHOT_RECORD.unpack_from(
+            self.__mmap, self.__records_at + index * _SNAPSHOT_RECORD.size)
+    
+    def __write(self, index: int, field, value):
+        packer, offset = field
+        packer.pack_into(self.__mmap, self.__records_at
+                         + index * _SNAPSHOT_RECORD.size + offset, value)
+    
+    def __string(self, string_index: int) -> str:
+        start, end = _SNAPSHOT_STRING_SPAN.unpack_from(
+            self.__mmap, self.__offsets_at + 8 * string_index)
+        start += self.__strings_at
+        end += self.__strings_at
+        return self.__mmap[start:end].decode("utf-8")
+    
+    def animal_id(self, index: int) -> int:
+        return self.__record(index)[0]
+    
+    def name(self, index: int) -> str:
+        return self.__string(self.__record(index)[4])
+    
+    def species(self, index: int) -> str:
+        return self.__species[self.__record(index)[6]]
+    
+    def age(self, index: int) -> int:
+        return self.__record(index)[1]
+    
+    def set_age(self, index: int, value: int):
+        self.__write(index, _SNAPSHOT_AGE, value)
+    
+    def weight(self, index: int) -> float:
+        return self.__record(index)[2]
+    
+    def set_weight(self, index: int, value: float):
+        self.__write(index, _SNAPSHOT_WEIGHT, value)
+    
+    def health_status(self, index: int) -> str:
+        return self.__statuses[self.__record(index)[7]]
+    
+    def set_health_status(self, index: int, status: str):
+        code = self.__status_codes.get(status)
+        if code is None:
+            code = self.__status_codes[status] = len(self.__statuses)
+            self.__statuses.append(status)
+        self.__write(index, _SNAPSHOT_HEALTH, code)
+    
+    def last_checkup(self, index: int) -> Optional[datetime]:
+        timestamp = self.__record(index)[3]
+        if math.isnan(timestamp):
+            return None
+        return datetime.fromtimestamp(timestamp)
+    
+    def set_last_checkup(self, index: int, when: Optional[datetime]):
+        self.__write(index, _SNAPSHOT_CHECKUP,
+                     when.timestamp() if when else math.nan)
+    
+    def animal_class(self, index: int) -> type:
+        return self.__kind_classes[self.__record(index)[8]]
+    
+    def extra_fields(self, index: int) -> Dict[str, object]:
+        record = self.__record(index)
+        if record[5] == _NO_EXTRAS:
+            return {}
+        values = json.loads(self.__string(record[5]))
+        return dict(zip(self.__kind_fields[record[8]], values))
+    
+    def __len__(self) -> int:
+        return self.__count
+    
+    def close(self):
+        self.__mmap.close()
+    
+    def __enter__(self) -> "SnapshotAnimalStore":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ========== 批量匯入 ==========
+
+_BATCH_ID_BLOCK = 1024
+
+
+class _AnimalBatch:
+    """
+    批次建立動物時的編號配發器，結束時才一次更新 Animal.total_animals
+    編號一次保留一段，多個執行緒各自批次建立時不會重複；
+    沒用完的編號會被跳過，因此編號可能不連續
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.__next = 0
+        self.__remaining = 0
+    
+    def next_id(self) -> int:
+        if not self.__remaining:
+            self.__next = Animal._reserve_ids(_BATCH_ID_BLOCK)
+            self.__remaining = _BATCH_ID_BLOCK
+        self.__remaining -= 1
+        self.__next += 1
+        self.count += 1
+        return self.__next - 1
+
+
+_current_batch: ContextVar[Optional[_AnimalBatch]] = ContextVar(
+    "current_batch", default=None)
+
+
+@contextmanager
+def animal_batch():
+    """
+    在區塊內建立的動物不逐一輸出「新增動物」，
+    Animal.total_animals 在離開區塊時只更新一次
+    """
+    if _current_batch.get() is not None:  # 已在批次中，沿用外層批次
+        yield _current_batch.get()
+        return
+    batch = _AnimalBatch()
+    token = _current_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _current_batch.reset(token)
+        Animal._count_created(batch.count)
+
+
+def _parse_bool(text: str) -> bool:
+    value = text.strip().lower()
+    if value in ("true", "1", "yes", "是"):
+        return True
+    if value in ("false", "0", "no", "否"):
+        return False
+    raise ValueError(f"無法解讀的布林值：{text}")
+
+
+_CONVERTERS: Dict[type, Callable] = {bool: _parse_bool, int: int,
+                                     float: float, str: str}
+_CONSTRUCTOR_FIELDS: Dict[type, Dict[str, Callable]] = {}
+
+
+def _constructor_fields(animal_class: type) -> Dict[str, Callable]:
+    """依建構器的型別註記，取得「參數名稱 -> 文字轉換函式」"""
+    fields = _CONSTRUCTOR_FIELDS.get(animal_class)
+    if fields is None:
+        parameters = inspect.signature(animal_class.__init__).parameters
+        fields = _CONSTRUCTOR_FIELDS[animal_class] = {
+            name: _CONVERTERS.get(parameter.annotation, str)
+            for name, parameter in parameters.items() if name != "self"
+        }
+    return fields
+
+
+def _animal_from_row(row: Dict[str, object], line: int, from_text: bool,
+                     classes: Dict[str, type]) -> Animal:
+    """
+    依 row["class"] 建立對應的子類別實例
+    其餘欄位對應建構器參數；CSV 的文字依型別註記轉換，空白欄位使用預設值
+    
+    :param classes: 匯入開始時建立的 _animal_classes()，每列只需查一次字典
+    """
+    try:
+        animal_class = classes.get(row["class"])
+        if animal_class is None:  # 匯入途中才定義的類別
+            animal_class = _animal_class_named(row["class"])
+        fields = _constructor_fields(animal_class)
+        kwargs = {}
+        for name, value in row.items():
+            if name == "class" or value is None or value == "":
+                continue
+            if name not in fields:
+                raise ValueError(f"{row['class']} 沒有欄位 {name}")
+            kwargs[name] = fields[name](value) if from_text else value
+        return animal_class(**kwargs)
+    except KeyError:
+        raise ValueError(f"第 {line} 列缺少 class 欄位") from None
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"第 {line} 列：{error}") from error
+
+
+def read_animals_csv(path: str) -> Iterator[Animal]:
+    """
+    逐列讀取 CSV 並產生動物（常數記憶體）
+    第一列為欄位名稱，例如：class,name,age,weight,fur_color,pride_size
+    """
+    classes = _animal_classes()
+    with open(path, newline="", encoding="utf-8") as file:
+        for line, row in enumerate(csv.DictReader(file), start=2):
+            yield _animal_from_row(row, line, True, classes)
+
+
+def read_animals_jsonl(path: str) -> Iterator[Animal]:
+    """
+    逐行讀取 JSON Lines 並產生動物（常數記憶體）
+    每行一個物件，例如：{"class": "Parrot", "name": "小綠", ...}
+    """
+    classes = _animal_classes()
+    with open(path, encoding="utf-8") as file:
+        for line, text in enumerate(file, start=1):
+            if text.strip():
+                yield _animal_from_row(json.loads(text), line, False, classes)
+
+
+# ========== 平行健康檢查 ==========
+
+CHECKUP_STATUSES = ["健康", "健康", "健康", "輕微感冒", "健康"]
+CHECKUP_SHARD_SIZE = 65536
+
+
+def _draw_checkup_shard(seed: int, shard: int, size: int,
+                        choices: int) -> bytes:
+    """
+    在工作行程中執行：為一個分片抽出健康狀態代碼
+    每個分片以 (seed, 分片編號) 建立自己的亂數產生器，
+    分片大小固定，因此結果與工作行程數量無關
+    """
+    rng = random.Random(f"{seed}:{shard}")
+    return bytes(rng.choices(range(choices), k=size))
+
+
+# ========== 健康檢查紀錄 ==========
+
+_NEVER = -math.inf  # 從未檢查過的動物，排在所有時間之前
+
+
+class _CheckupOrder:
+    """
+    依最後檢查時間排序的列位置（只增不減的平行陣列）
+    更新時舊項目直接作廢，失效項目超過一半才壓縮；
+    檢查時間通常遞增，新項目幾乎都附加在尾端，不需搬移
+    """
+    
+    def __init__(self, positions: array, codes: Optional[array] = None,
+                 code: int = 0):
+        self.times = array("d")
+        self.rows = array("q")
+        self.live = 0
+        self.in_order = True
+        # 列 -> 在本索引中的位置；各狀態的索引共用同一個陣列，
+        # 以 codes[列] == code 判斷該列目前屬於哪一個狀態
+        self.__positions = positions
+        self.__codes = codes
+        self.__code = code
+    
+    def __is_live(self, position: int) -> bool:
+        row = self.rows[position]
+        return (row < len(self.__positions)
+                and self.__positions[row] == position
+                and (self.__codes is None or self.__codes[row] == self.__code))
+    
+    def add(self, row: int, when: float):
+        if self.times and when < self.times[-1]:
+            self.in_order = False
+        self.__positions[row] = len(self.rows)
+        self.times.append(when)
+        self.rows.append(row)
+        self.live += 1
+        if len(self.rows) > 2 * self.live + 64:
+            self.compact()
+    
+    def discard(self, row: int):
+        self.__positions[row] = -1
+        self.live -= 1
+    
+    def relabel(self, old_row: int, new_row: int):
+        """列位置改變（與最後一列交換後刪除）時更新項目"""
+        position = self.__positions[old_row]
+        self.rows[position] = new_row
+        self.__positions[new_row] = position
+    
+    def compact(self):
+        entries = [(self.times[position], self.rows[position])
+                   for position in range(len(self.rows))
+                   if self.__is_live(position)]
+        if not self.in_order:
+            entries.sort()
+        self.times = array("d", [when for when, _row in entries])
+        self.rows = array("q", [row for _when, row in entries])
+        for position, (_when, row) in enumerate(entries):
+            self.__positions[row] = position
+        self.in_order = True
+    
+    def before(self, when: float) -> List[int]:
+        """最後檢查時間早於 when 的列：O(log n + k)"""
+        if not self.in_order or len(self.rows) > 2 * self.live:
+            self.compact()
+        end = bisect.bisect_left(self.times, when)
+        return [self.rows[position] for position in range(end)
+                if self.__is_live(position)]
+
+
+class CheckupHistory:
+    """
+    動物園的健康檢查紀錄
+    展示：封裝（以型別陣列保存紀錄，對外只提供查詢方法）
+    
+    每隻動物保留最近 size 筆紀錄（環狀緩衝區），並依最後檢查時間
+    維護排序索引，查詢逾期或特定狀態的動物不必掃描全部動物。
+    列位置與 Zoo 內部的動物位置一致，由 Zoo 同步新增與移除。
+    """
+    
+    def __init__(self, size: int = 8):
+        if size < 1:
+            raise ValueError("紀錄筆數必須大於 0")
+        self.size = size
+        self.__statuses = _InternTable()
+        self.__ids = array("q")        # 列 -> 動物編號
+        self.__written = array("Q")    # 列 -> 累計檢查次數
+        self.__times = array("d")      # 列 * size + k -> 檢查時間
+        self.__codes = array("H")      # 列 * size + k -> 狀態代碼
+        self.__current = array("H")    # 列 -> 目前的狀態代碼
+        self.__order_positions = array("q")
+        self.__status_positions = array("q")
+        self.__order = _CheckupOrder(self.__order_positions)
+        self.__by_status: List[_CheckupOrder] = []
+    
+    def __status_code(self, status: str) -> int:
+        code = self.__statuses.intern(status)
+        if code == len(self.__by_status):
+            self.__by_status.append(_CheckupOrder(
+                self.__status_positions, self.__current, code))
+        return code
+    
+    def append(self, animal_id: int, status: str,
+               last_checkup: Optional[datetime] = None):
+        """登記一隻新加入的動物（附加在最後一列）"""
+        row = len(self.__ids)
+        code = self.__status_code(status)
+        self.__ids.append(animal_id)
+        self.__written.append(0)
+        self.__times.extend([0.0] * self.size)
+        self.__codes.extend([0] * self.size)
+        self.__current.append(code)
+        self.__order_positions.append(-1)
+        self.__status_positions.append(-1)
+        when = _NEVER
+        if last_checkup is not None:
+            when = last_checkup.timestamp()
+            self.__write(row, code, when)
+        self.__order.add(row, when)
+        self.__by_status[code].add(row, when)
+    
+    def __write(self, row: int, code: int, when: float):
+        slot = row * self.size + self.__written[row] % self.size
+        self.__times[slot] = when
+        self.__codes[slot] = code
+        self.__written[row] += 1
+    
+    def record(self, row: int, status: str, when: datetime):
+        """記錄一次檢查，並更新排序索引"""
+        code = self.__status_code(status)
+        timestamp = when.timestamp()
+        self.__write(row, code, timestamp)
+        self.__order.discard(row)
+        self.__order.add(row, timestamp)
+        self.__by_status[self.__current[row]].discard(row)
+        self.__current[row] = code
+        self.__by_status[code].add(row, timestamp)
+    
+    def record_range(self, start: int, codes: bytes, statuses: List[str],
+                     when: datetime):
+        """記錄從 start 開始的連續列，codes[k] 為 statuses 的索引"""
+        for offset, code in enumerate(codes):
+            self.record(start + offset, statuses[code], when)
+    
+    def swap_remove(self, index: int):
+        """移除一列，最後一列搬到 index（與 Zoo 的移除方式一致）"""
+        last = len(self.__ids) - 1
+        self.__order.discard(index)
+        self.__by_status[self.__current[index]].discard(index)
+        if index != last:
+            self.__order.relabel(last, index)
+            self.__by_status[self.__current[last]].relabel(last, index)
+            size = self.size
+            self.__times[index * size:(index + 1) * size] = (
+                self.__times[last * size:])
+            self.__codes[index * size:(index + 1) * size] = (
+                self.__codes[last * size:])
+            for column in (self.__ids, self.__written, self.__current):
+                column[index] = column[last]
+        for column in (self.__times, self.__codes):
+            del column[last * self.size:]
+        for column in (self.__ids, self.__written, self.__current,
+                       self.__order_positions, self.__status_positions):
+            column.pop()
+    
+    def history(self, row: int) -> List[Tuple[datetime, str]]:
+        """最近的檢查紀錄，由舊到新"""
+        written = self.__written[row]
+        base = row * self.size
+        return [(datetime.fromtimestamp(self.__times[base + k % self.size]),
+                 self.__statuses.values[self.__codes[base + k % self.size]])
+                for k in range(max(0, written - self.size), written)]
+    
+    def checked_before(self, when: datetime) -> List[int]:
+        """最後檢查早於 when（或從未檢查）的列"""
+        return self.__order.before(when.timestamp())
+    
+    def with_status(self, status: str,
+                    checked_before: Optional[datetime] = None) -> List[int]:
+        """目前狀態為 status 的列，可再限制最後檢查早於 checked_before"""
+        code = self.__statuses.codes.get(status)
+        if code is None:
+            return []
+        limit = checked_before.timestamp() if checked_before else math.inf
+        return self.__by_status[code].before(limit)
+    
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+
+# ========== 多型呼叫量測 ==========
+
+class MethodStats(NamedTuple):
+    """單一 (類別, 方法) 的累計量測"""
+    class_name: str
+    method: str
+    calls: int
+    wall: float       # 含子呼叫的牆鐘時間（秒）
+    cpu: float        # 含子呼叫的 CPU 時間（秒）
+    self_wall: float  # 扣除被量測子呼叫後的牆鐘時間（秒）
+
+
+class MethodProfiler:
+    """
+    選用的多型呼叫量測
+    展示：多型（同一個方法名稱，在各類別的覆寫分別計算）
+    
+    enable() 時把各類別「自己定義」的方法換成計時包裝，disable() 時換回原函式，
+    因此停用時完全沒有額外成本。super() 的每一層（Lion → Mammal → Animal）
+    各自定義了方法，會分別記錄。enable() 之後才建立的類別不會被量測。
+    
+    同一個量測器可以巢狀啟用（計算次數，最外層 disable() 才換回原函式）；
+    另一個量測器啟用中時再 enable() 會拋出 ValueError，避免包裝互相覆蓋。
+    """
+    
+    DEFAULT_METHODS = ("__init__", "feed", "make_sound", "daily_activity",
+                       "get_info")
+    SORT_KEYS = ("calls", "wall", "cpu", "self_wall")
+    # 目前換上包裝的量測器；同一時間只能有一個
+    _active: Optional["MethodProfiler"] = None
+    _activation_lock = threading.Lock()
+    
+    def __init__(self, methods: Iterable[str] = DEFAULT_METHODS,
+                 roots: Optional[Iterable[type]] = None):
+        self.methods = tuple(methods)
+        self.__roots = tuple(roots) if roots is not None else None
+        self.__originals: List[tuple] = []
+        self.__depth = 0
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.reset()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.__depth > 0
+    
+    def reset(self):
+        """清除累計結果"""
+        # (類別名稱, 方法) -> [呼叫次數, 牆鐘時間, CPU 時間, 自身時間]
+        self.__stats: Dict[Tuple[str, str], List] = {}
+        # 摺疊堆疊 "Lion.feed;Mammal.feed" -> 自身牆鐘時間
+        self.__collapsed: Dict[str, float] = {}
+    
+    def __classes(self) -> Iterator[type]:
+        pending = list(self.__roots or (Animal,))
+        seen = set()
+        while pending:
+            klass = pending.pop()
+            if klass not in seen:
+                seen.add(klass)
+                yield klass
+                pending.extend(klass.__subclasses__())
+    
+    def enable(self) -> "MethodProfiler":
+        with MethodProfiler._activation_lock:
+            active = MethodProfiler._active
+            if active is not None and active is not self:
+                raise ValueError("另一個 MethodProfiler 正在量測，請先停用")
+            self.__depth += 1
+            if self.__depth > 1:
+                return self
+            for klass in self.__classes():
+                for method in self.methods:
+                    function = klass.__dict__.get(method)
+                    if isinstance(function, FunctionType):
+                        self.__originals.append((klass, method, function))
+                        setattr(klass, method,
+                                self.__wrap(function, klass.__name__, method))
+            MethodProfiler._active = self
+        return self
+    
+    def disable(self):
+        with MethodProfiler._activation_lock:
+            if self.__depth == 0:
+                return
+            self.__depth -= 1
+            if self.__depth > 0:
+                return
+            for klass, method, function in reversed(self.__originals):
+                setattr(klass, method, function)
+            self.__originals.clear()
+            MethodProfiler._active = None
+    
+    def __enter__(self) -> "MethodProfiler":
+        return self.enable()
+    
+    def __exit__(self, *exc_info):
+        self.disable()
+    
+    def __wrap(self, function: FunctionType, class_name: str,
+               method: str) -> Callable:
+        key = (class_name, method)
+        frame_name = f"{class_name}.{method}"
+        local = self.__local
+        
+        @wraps(function)
+        def timed_method(*args, **kwargs):
+            stack = getattr(local, "stack", None)
+            if stack is None:
+                stack = local.stack = []
+            path = f"{stack[-1][0]};{frame_name}" if stack else frame_name
+            frame = [path, 0.0]  # [堆疊路徑, 子呼叫的牆鐘時間]
+            stack.append(frame)
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - wall_start
+                cpu = time.thread_time() - cpu_start
+                stack.pop()
+                if stack:
+                    stack[-1][1] += wall
+                self.__record(key, path, wall, cpu, wall - frame[1])
+        
+        return timed_method
+    
+    def __record(self, key: Tuple[str, str], path: str, wall: float,
+                 cpu: float, self_wall: float):
+        with self.__lock:
+            stats = self.__stats.get(key)
+            if stats is None:
+                stats = self.__stats[key] = [0, 0.0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += wall
+            stats[2] += cpu
+            stats[3] += self_wall
+            self.__collapsed[path] = self.__collapsed.get(path, 0.0) + self_wall
+    
+    def report(self, sort_by: str = "wall") -> List[MethodStats]:
+        """依 sort_by（calls / wall / cpu / self_wall）由大到小排序的結果"""
+        if sort_by not in self.SORT_KEYS:
+            raise ValueError(f"無法依 {sort_by} 排序，可用：{'、'.join(self.SORT_KEYS)}")
+        rows = [MethodStats(class_name, method, *stats)
+                for (class_name, method), stats in self.__stats.items()]
+        return sorted(rows, key=lambda row: getattr(row, sort_by), reverse=True)
+    
+    def format_report(self, sort_by: str = "wall",
+                      limit: Optional[int] = None) -> str:
+        lines = [f"{'類別.方法':<28}{'次數':>10}{'牆鐘(ms)':>12}"
+                 f"{'CPU(ms)':>12}{'自身(ms)':>12}"]
+        for row in self.report(sort_by)[:limit]:
+            lines.append(f"{row.class_name + '.' + row.method:<28}"
+                         f"{row.calls:>10}{row.wall * 1e3:>12.2f}"
+                         f"{row.cpu * 1e3:>12.2f}{row.self_wall * 1e3:>12.2f}")
+        return "\n".join(lines)
+    
+    def write_collapsed(self, path: str):
+        """
+        輸出摺疊堆疊檔（每行「框架;框架 數值」，數值為自身時間的微秒數），
+        可直接交給 flamegraph.pl、speedscope 等火焰圖工具
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, seconds in sorted(self.__collapsed.items()):
+                file.write(f"{stack} {round(seconds * 1e6)}\n")
+
+
+# ========== 非同步排程：現場設備 ==========
+
+class ZooDevice:
+    """
+    現場設備（餵食器、保育員平板）的非同步介面
+    預設實作不做任何 I/O；實際設備覆寫這兩個方法即可
+    """
+    
+    async def dispense(self, animal: Animal) -> object:
+        """餵食器出料，回傳值會收集在 daily_feeding_async() 的結果中"""
+        return None
+    
+    async def record_activity(self, animal: Animal) -> object:
+        """在保育員平板上登錄活動"""
+        return None
+
+
+class SimulatedDevice(ZooDevice):
+    """以固定延遲模擬設備回應，供示範與量測使用"""
+    
+    def __init__(self, latency: float = 0.05):
+        if latency < 0:
+            raise ValueError("延遲不能為負數")
+        self.latency = latency
+        self.calls = 0
+    
+    async def dispense(self, animal: Animal) -> int:
+        await asyncio.sleep(self.latency)
+        self.calls += 1
+        return animal.animal_id
+    
+    async def record_activity(self, animal: Animal) -> int:
+        await asyncio.sleep(self.latency)
+        self.calls += 1
+        return animal.animal_id
 
 
 # ========== 動物園管理類別 ==========
@@ -280,88 +1755,446 @@ class Zoo:
     展示：封裝（管理複雜的狀態）、多型（統一處理不同動物）
     """
     
-    def __init__(self, name: str):
+    def __init__(self, name: str,
+                 store: Optional[AnimalRowStore] = None,
+                 sink: Optional[ReportSink] = None,
+                 thread_safe: bool = False,
+                 history_size: int = 0):
+        """
+        :param store: 選用的欄式儲存區；省略時以一般的 list 保存動物物件
+        :param sink: 選用的報表接收器；省略時沿用目前的接收器（預設為終端機）
+        :param thread_safe: 為 True 時，新增、移除與索引查詢以鎖保護，
+                            可由多個執行緒同時匯入動物
+        :param history_size: 大於 0 時，每隻動物保留最近幾筆健康檢查紀錄，
+                             並可查詢逾期未檢查或特定狀態的動物
+        """
         self.__name = name
-        self.__animals: List[Animal] = []
+        self.__sink = sink
+        self.__lock = threading.RLock() if thread_safe else nullcontext()
+        self.__animals: Union[List[Animal], AnimalRowStore] = (
+            store if store is not None else [])
+        # 物種索引：物種 -> 成員在 __animals 中的位置
+        # __member_slots[i] 記錄第 i 隻動物在其物種成員陣列中的位置，
+        # 讓移除時可以 O(1) 找到並刪除對應的成員；
+        # 傳入已有資料的儲存區（例如快照）時，索引在第一次使用時才建立
+        self.__species_members: Optional[Dict[str, array]] = None
+        self.__member_slots = array("q")
+        self.__history = (CheckupHistory(history_size)
+                          if history_size else None)
         self.__staff_count = 0
-        print(f"\n🏛️ {name} 動物園成立！")
+        self.__report("\n🏛️ {} 動物園成立！", name)
     
     def add_animal(self, animal: Animal):
         """
         添加動物
         展示：多型（接受任何 Animal 子類別）
         """
+        with self.__lock:
+            self.__append(animal)
+        self.__report("   ✓ {} 已加入動物園", animal)
+    
+    def add_animals(self, animals: Iterable[Animal],
+                    batch_size: int = 10_000) -> int:
+        """
+        批量加入動物，回傳加入的數量
+        animals 可以是產生器（例如 read_animals_csv()），每次只取 batch_size 隻；
+        在批次中建立的動物不逐一輸出，Animal.total_animals 每批只更新一次
+        """
+        if batch_size < 1:
+            raise ValueError("批次大小必須大於 0")
+        animals = iter(animals)
+        added = 0
+        while True:
+            # 先在鎖外建立整批動物，再一次持鎖加入
+            with animal_batch():
+                chunk = list(islice(animals, batch_size))
+            with self.__lock:
+                for animal in chunk:
+                    self.__append(animal)
+            added += len(chunk)
+            if len(chunk) < batch_size:
+                break
+        self.__report("   ✓ 批量加入 {} 隻動物", added)
+        return added
+    
+    def remove_animal(self, animal: Animal) -> Animal:
+        """
+        移除動物並同步更新物種索引
+        採用「與最後一隻交換後刪除」的方式，因此不保留加入順序；
+        先前從欄式儲存取得的 AnimalView 在移除後可能指向別的動物
+        """
+        with self.__lock:
+            removed = self.__remove_at(self.__locate(animal))
+        self.__report("   ✓ {} 已離開動物園", removed)
+        return removed
+    
+    def get_animals_by_species(self, species: str) -> List[Animal]:
+        """查詢某物種的所有動物：O(k)，k 為該物種數量"""
+        with self.__lock:
+            members = self.__species_index().get(species, ())
+            return [self.__animals[index] for index in members]
+    
+    def get_species_counts(self) -> Dict[str, int]:
+        """各物種的數量：直接讀取索引，不掃描動物"""
+        with self.__lock:
+            return {species: len(members)
+                    for species, members in self.__species_index().items()}
+    
+    def __reporting(self):
+        """讓動物的輸出也流向本動物園的接收器"""
+        return use_sink(self.__sink or _current_sink.get())
+    
+    def __reports_enabled(self) -> bool:
+        """目前的接收器是否需要紀錄；不需要時連報表參數都不必計算"""
+        return (self.__sink or _current_sink.get()).enabled
+    
+    def __report(self, template: str, *args,
+                 animal: Optional[Animal] = None):
+        sink = self.__sink or _current_sink.get()
+        if sink.enabled:
+            animal_id = animal.animal_id if animal is not None else None
+            sink.emit(ReportRecord(animal_id, "zoo", template, args))
+    
+    def __append(self, animal: Animal):
+        self.__species_index()
         self.__animals.append(animal)
-        print(f"   ✓ {animal} 已加入動物園")
+        self.__track(len(self.__animals) - 1, animal)
+    
+    def __remove_at(self, index: int) -> Animal:
+        self.__species_index()
+        last = len(self.__animals) - 1
+        species = self.__species_at(index)
+        last_species = self.__species_at(last)
+        
+        # 先從儲存區移除：唯讀的快照會在這裡拋出例外，索引與紀錄保持不變
+        if isinstance(self.__animals, AnimalRowStore):
+            removed = self.__animals.swap_remove(index)
+        else:
+            removed = self.__animals[index]
+            self.__animals[index] = self.__animals[last]
+            self.__animals.pop()
+        
+        self.__unindex_member(index, species)
+        if index != last:
+            # 最後一隻搬到 index，更新它在物種成員陣列中的位置
+            slot = self.__member_slots[last]
+            self.__species_members[last_species][slot] = index
+            self.__member_slots[index] = slot
+        self.__member_slots.pop()
+        if self.__history is not None:
+            self.__history.swap_remove(index)
+        return removed
+    
+    def __species_index(self) -> Dict[str, array]:
+        if self.__species_members is None:
+            self.__species_members = {}
+            for index in range(len(self.__animals)):
+                self.__track(index, self.__animals[index])
+        return self.__species_members
+    
+    def __track(self, index: int, animal: Animal):
+        """把第 index 隻動物加入物種索引與健康檢查紀錄"""
+        self.__index_member(index, animal.species)
+        if self.__history is not None:
+            self.__history.append(animal.animal_id, animal.health_status,
+                                  animal.last_checkup)
+    
+    def __checkup_history(self) -> CheckupHistory:
+        if self.__history is None:
+            raise ValueError(f"{self.__name} 動物園未啟用健康檢查紀錄"
+                             f"（history_size=0）")
+        self.__species_index()
+        return self.__history
+    
+    def health_checkup(self, animal: Animal, status: str,
+                       when: Optional[datetime] = None):
+        """為單一動物做健康檢查；啟用紀錄時一併寫入"""
+        with self.__lock:
+            self.__species_index()
+            index = self.__locate(animal)
+            with self.__reporting():
+                animal.health_checkup(status, when)
+            if self.__history is not None:
+                self.__history.record(index, status, animal.last_checkup)
+    
+    def checkup_history(self, animal: Animal) -> List[Tuple[datetime, str]]:
+        """某隻動物最近的健康檢查紀錄，由舊到新"""
+        with self.__lock:
+            history = self.__checkup_history()
+            return history.history(self.__locate(animal))
+    
+    def overdue_checkups(self, since: datetime) -> List[Animal]:
+        """從 since 之後就沒有檢查過的動物（含從未檢查），依最後檢查時間排序"""
+        with self.__lock:
+            rows = self.__checkup_history().checked_before(since)
+            return [self.__animals[index] for index in rows]
+    
+    def animals_with_status(self, status: str,
+                            checked_before: Optional[datetime] = None
+                            ) -> List[Animal]:
+        """目前健康狀態為 status 的動物，可再限制最後檢查早於 checked_before"""
+        with self.__lock:
+            rows = self.__checkup_history().with_status(status,
+                                                        checked_before)
+            return [self.__animals[index] for index in rows]
+    
+    def save_snapshot(self, path: str) -> int:
+        """
+        把所有動物寫成二進位快照檔，回傳動物數量
+        之後可用 Zoo.open_snapshot() 在毫秒內重新開啟
+        """
+        count = _write_snapshot(path, self.__name, self.__animals)
+        self.__report("💾 {} 已儲存快照：{} 隻動物", self.__name, count)
+        return count
+    
+    @classmethod
+    def open_snapshot(cls, path: str, lazy: bool = True,
+                      sink: Optional[ReportSink] = None) -> "Zoo":
+        """
+        從快照檔開啟動物園
+        lazy=True 時直接以 mmap 存取檔案，動物被用到時才解碼；
+        lazy=False 時把內容複製到 ColumnarAnimalStore，之後可以增刪動物
+        """
+        snapshot = SnapshotAnimalStore(path)
+        if lazy:
+            return cls(snapshot.zoo_name, store=snapshot, sink=sink)
+        with snapshot:
+            store = ColumnarAnimalStore()
+            for (animal_class, animal_id, name, species, age, weight,
+                 status, last_checkup, extras) in _snapshot_rows(snapshot):
+                store.append_row(animal_class, name, species, age, weight,
+                                 status, last_checkup, extras, animal_id)
+            return cls(snapshot.zoo_name, store=store, sink=sink)
+    
+    def __species_at(self, index: int) -> str:
+        if isinstance(self.__animals, AnimalRowStore):
+            return self.__animals.species(index)
+        return self.__animals[index].species
+    
+    def __index_member(self, index: int, species: str):
+        members = self.__species_members.get(species)
+        if members is None:
+            members = self.__species_members[species] = array("q")
+        self.__member_slots.append(len(members))
+        members.append(index)
+    
+    def __unindex_member(self, index: int, species: str):
+        members = self.__species_members[species]
+        slot = self.__member_slots[index]
+        moved = members.pop()
+        if slot < len(members):
+            members[slot] = moved
+            self.__member_slots[moved] = slot
+        if not members:
+            del self.__species_members[species]
+    
+    def __locate(self, animal: Animal) -> int:
+        """找出動物的位置：只需搜尋同物種的成員"""
+        if (isinstance(animal, AnimalView)
+                and animal._store is self.__animals):
+            return animal._index
+        for index in self.__species_index().get(animal.species, ()):
+            if self.__animals[index] is animal:
+                return index
+        raise ValueError(f"{animal} 不在 {self.__name} 動物園中")
     
     def daily_feeding(self):
         """
         每日餵食
         展示：多型的威力（統一處理不同類型的動物）
         """
-        print(f"\n📋 {self.__name} 開始每日餵食：")
-        for animal in self.__animals:
-            print(f"\n{animal.get_info()}")
-            animal.feed()  # 多型：每種動物有不同的餵食方式
+        self.__report("\n📋 {} 開始每日餵食：", self.__name)
+        with self.__reporting():
+            reporting = self.__reports_enabled()
+            for animal in self.__animals:
+                if reporting:
+                    self.__report("\n{}", animal.get_info(), animal=animal)
+                animal.feed()  # 多型：每種動物有不同的餵食方式
     
     def morning_activities(self):
         """
         晨間活動
         展示：多型
         """
-        print(f"\n🌅 {self.__name} 晨間活動：")
-        for animal in self.__animals:
-            print(f"\n{animal}:")
-            print(f"  聲音：{animal.make_sound()}")  # 多型
+        self.__report("\n🌅 {} 晨間活動：", self.__name)
+        with self.__reporting():
+            reporting = self.__reports_enabled()
+            for animal in self.__animals:
+                if reporting:
+                    self.__report("\n{}:\n  聲音：{}", animal,
+                                  animal.make_sound(), animal=animal)  # 多型
+                animal.daily_activity()  # 多型
+    
+    async def daily_feeding_async(self, device: Optional[ZooDevice] = None,
+                                  concurrency: int = 16,
+                                  timeout: Optional[float] = None) -> list:
+        """
+        每日餵食（非同步版本）
+        最多同時等待 concurrency 台設備，每隻動物最多等 timeout 秒；
+        回傳與動物順序相同的結果，失敗或逾時的位置放入例外物件
+        """
+        device = device or ZooDevice()
+        
+        async def feed(animal: Animal):
+            result = await device.dispense(animal)
+            if self.__reports_enabled():
+                self.__report("\n{}", animal.get_info(), animal=animal)
+            animal.feed()  # 多型：每種動物有不同的餵食方式
+            return result
+        
+        return await self.__run_routines(
+            "\n📋 {} 開始每日餵食（非同步）：", feed, concurrency, timeout)
+    
+    async def morning_activities_async(self,
+                                       device: Optional[ZooDevice] = None,
+                                       concurrency: int = 16,
+                                       timeout: Optional[float] = None
+                                       ) -> list:
+        """晨間活動（非同步版本），參數與回傳值同 daily_feeding_async()"""
+        device = device or ZooDevice()
+        
+        async def activity(animal: Animal):
+            result = await device.record_activity(animal)
+            if self.__reports_enabled():
+                self.__report("\n{}:\n  聲音：{}", animal,
+                              animal.make_sound(), animal=animal)  # 多型
             animal.daily_activity()  # 多型
+            return result
+        
+        return await self.__run_routines(
+            "\n🌅 {} 晨間活動（非同步）：", activity, concurrency, timeout)
     
-    def health_checkup_all(self):
+    async def __run_routines(self, title: str,
+                             routine: Callable[[Animal], Awaitable],
+                             concurrency: int,
+                             timeout: Optional[float]) -> list:
+        """
+        以 concurrency 個工作協程依序領取動物並執行 routine
+        工作協程數量固定，動物再多也不會一次建立大量任務
+        """
+        if concurrency < 1:
+            raise ValueError("並行數量必須大於 0")
+        self.__report(title, self.__name)
+        count = len(self.__animals)
+        results: list = [None] * count
+        next_index = 0
+        
+        async def worker():
+            nonlocal next_index
+            while next_index < count:
+                index = next_index
+                next_index += 1
+                try:
+                    results[index] = await asyncio.wait_for(
+                        routine(self.__animals[index]), timeout)
+                except Exception as error:  # 逾時或設備錯誤不影響其他動物
+                    results[index] = error
+        
+        with self.__reporting():
+            await asyncio.gather(*(worker()
+                                   for _ in range(min(concurrency, count))))
+        return results
+    
+    def health_checkup_all(self, workers: Optional[int] = None,
+                           seed: Optional[int] = None):
         """
         全體健康檢查
         展示：封裝（通過方法控制狀態修改）
+        
+        :param workers: 指定時以多個行程分片抽樣，結果再批次寫回
+        :param seed: 指定時結果可重現，且與 workers 數量無關
+        
+        只有抽樣會分散到工作行程；寫回在主行程進行。
+        欄式儲存以陣列切片整段寫入，動物物件清單則必須逐隻更新，
+        這段序列工作不隨 workers 增加而縮短（見 bench_parallel_checkup）
         """
-        print(f"\n🏥 {self.__name} 進行全體健康檢查：")
-        import random
-        statuses = ["健康", "健康", "健康", "輕微感冒", "健康"]
+        self.__report("\n🏥 {} 進行全體健康檢查：", self.__name)
+        if workers is not None or seed is not None:
+            self.__sharded_checkup(workers or 1, seed)
+            return
+        
+        history = self.__history
+        if history is not None:
+            self.__species_index()
+        with self.__reporting():
+            for index, animal in enumerate(self.__animals):
+                status = random.choice(CHECKUP_STATUSES)
+                animal.health_checkup(status)
+                if history is not None:
+                    history.record(index, status, animal.last_checkup)
+    
+    def __sharded_checkup(self, workers: int, seed: Optional[int]):
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        count = len(self.__animals)
+        starts = range(0, count, CHECKUP_SHARD_SIZE)
+        sizes = [min(CHECKUP_SHARD_SIZE, count - start) for start in starts]
+        args = ([seed] * len(sizes), range(len(sizes)), sizes,
+                [len(CHECKUP_STATUSES)] * len(sizes))
         
-        for animal in self.__animals:
-            status = random.choice(statuses)
-            animal.health_checkup(status)
+        when = datetime.now()
+        tallies = [0] * len(CHECKUP_STATUSES)
+        if self.__history is not None:
+            self.__species_index()
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self.__merge_checkups(pool.map(_draw_checkup_shard, *args),
+                                      starts, when, tallies)
+        else:
+            self.__merge_checkups(map(_draw_checkup_shard, *args),
+                                  starts, when, tallies)
+        
+        summary = {}
+        for code, status in enumerate(CHECKUP_STATUSES):
+            summary[status] = summary.get(status, 0) + tallies[code]
+        self.__report("  ✓ {} 隻動物完成健康檢查：{}", count,
+                      "、".join(f"{status} {number} 隻"
+                               for status, number in summary.items()))
+    
+    def __merge_checkups(self, results, starts, when: datetime,
+                         tallies: List[int]):
+        """依分片順序把抽樣結果批次寫回動物"""
+        for start, codes in zip(starts, results):
+            for code in range(len(tallies)):
+                tallies[code] += codes.count(code)
+            if isinstance(self.__animals, AnimalRowStore):
+                self.__animals.set_checkup_range(start, codes,
+                                                 CHECKUP_STATUSES, when)
+            else:
+                # 動物物件沒有可整段寫入的欄位，只能逐隻更新（序列尾段）
+                shard = islice(self.__animals, start, start + len(codes))
+                for animal, code in zip(shard, codes):
+                    animal._record_checkup(CHECKUP_STATUSES[code], when)
+            if self.__history is not None:
+                self.__history.record_range(start, codes, CHECKUP_STATUSES,
+                                            when)
     
     def show_special_behaviors(self):
         """
         展示特殊行為
         展示：多型（不同類別有不同的特殊方法）
         """
-        print(f"\n🎪 {self.__name} 特殊行為展示：")
+        self.__report("\n🎪 {} 特殊行為展示：", self.__name)
         
-        for animal in self.__animals:
-            print(f"\n{animal}:")
-            
-            # 使用 isinstance 檢查類型，調用特定方法
-            if isinstance(animal, Lion):
-                animal.hunt()
-            elif isinstance(animal, Elephant):
-                animal.spray_water()
-            elif isinstance(animal, Parrot):
-                animal.mimic_speech("你好！")
-            elif isinstance(animal, Snake):
-                animal.shed_skin()
+        lookup = special_behaviors.lookup
+        with self.__reporting():
+            for animal in self.__animals:
+                self.__report("\n{}:", animal, animal=animal)
+                
+                # 依具體類別查表，新增物種時不必修改 Zoo
+                behavior = lookup(type(animal))
+                if behavior is not None:
+                    behavior(animal)
     
     def get_statistics(self):
         """獲取統計資訊"""
-        print(f"\n📊 {self.__name} 統計資訊：")
-        print(f"  總動物數：{len(self.__animals)}")
-        
-        # 按類別分類
-        species_count = {}
-        for animal in self.__animals:
-            species = animal.species
-            species_count[species] = species_count.get(species, 0) + 1
+        self.__report("\n📊 {} 統計資訊：", self.__name)
+        self.__report("  總動物數：{}", len(self.__animals))
         
-        print(f"  動物分佈：")
-        for species, count in species_count.items():
-            print(f"    - {species}: {count} 隻")
+        # 按類別分類：物種索引隨增刪即時維護，不必逐一掃描
+        self.__report("  動物分佈：")
+        for species, count in self.get_species_counts().items():
+            self.__report("    - {}: {} 隻", species, count)
     
     def __len__(self) -> int:
         """
@@ -386,6 +2219,12 @@ class Zoo:
 def main():
     """主程式"""
     
+    # 標題放在 main() 內：平行健康檢查的工作行程會重新匯入本模組，不應再印一次
+    print("=" * 80)
+    print("綜合實戰案例：動物園管理系統")
+    print("整合 OOP 三大特性：封裝、繼承、多型")
+    print("=" * 80)
+    
     print("\n" + "=" * 80)
     print("開始建立動物園管理系統")
     print("=" * 80)
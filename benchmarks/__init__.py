@@ -0,0 +1,6 @@
+"""
+效能量測套件
+各案例檔名以數字開頭，無法以一般 import 載入，請透過 benchmarks.common.load_example
+（案例 05）或 load_definitions（案例 01~04，只載入定義、不執行示範）取得模組；
+完整套件以 python -m benchmarks 執行，結果輸出為 JSON
+"""
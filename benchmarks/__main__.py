@@ -0,0 +1,5 @@
+"""執行完整的效能量測套件：python -m benchmarks --help"""
+
+from benchmarks.suite import main
+
+main()
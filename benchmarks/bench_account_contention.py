@@ -0,0 +1,62 @@
+"""
+多執行緒轉帳：少數熱門帳戶之間互相轉帳，1 ~ 64 個執行緒的吞吐量
+同時檢查總額是否守恆、是否有帳戶被透支
+
+執行：python -m benchmarks.bench_account_contention [總轉帳次數]
+"""
+
+import random
+import sys
+import threading
+
+from benchmarks.common import load_definitions, print_table, silenced, timed
+
+encapsulation = load_definitions("02_encapsulation")
+
+HOT_ACCOUNTS = 4
+OPENING_BALANCE = 1_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def new_accounts():
+    with silenced():
+        return [encapsulation.BankAccount(f"熱門{i}", OPENING_BALANCE,
+                                          thread_safe=True)
+                for i in range(HOT_ACCOUNTS)]
+
+
+def worker(accounts, transfers: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(transfers):
+        source, target = rng.sample(accounts, 2)
+        encapsulation.transfer(source, target, rng.randint(1, 200))
+
+
+def run_threads(accounts, threads: int, total: int):
+    workers = [threading.Thread(target=worker,
+                                args=(accounts, total // threads, seed))
+               for seed in range(threads)]
+    with silenced():
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+
+def run(total: int):
+    rows = []
+    for threads in THREAD_COUNTS:
+        accounts = new_accounts()
+        _, seconds = timed(run_threads, accounts, threads, total)
+        balances = [account.balance for account in accounts]
+        consistent = (sum(balances) == OPENING_BALANCE * HOT_ACCOUNTS
+                      and min(balances) >= 0)
+        done = total // threads * threads
+        rows.append((threads, f"{seconds:.3f}", f"{done / seconds:,.0f}",
+                     "是" if consistent else "否"))
+    print_table(f"熱門帳戶：{HOT_ACCOUNTS}，總轉帳次數：{total:,}",
+                ("執行緒", "秒", "轉帳/秒", "總額守恆且無透支"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,49 @@
+"""
+工作階段：每次操作都驗證 PBKDF2 密碼 vs 驗證一次後以工作階段操作
+
+執行：python -m benchmarks.bench_account_session [工作階段的操作次數]
+"""
+
+import sys
+
+from benchmarks.common import load_definitions, print_table, silenced, timed
+
+encapsulation = load_definitions("02_encapsulation")
+
+PIN_OPERATIONS = 20  # 每次都算一次雜湊，少量就足以估計
+
+
+def new_account():
+    with silenced():
+        return encapsulation.SecureBankAccount("量測", "1234", 1_000)
+
+
+def deposit_withdraw(account, credential, count: int):
+    with silenced():
+        for _ in range(count // 2):
+            account.deposit(10, credential)
+            account.withdraw(10, credential)
+
+
+def run(count: int):
+    account = new_account()
+    rows = []
+    
+    _, seconds = timed(deposit_withdraw, account, "1234", PIN_OPERATIONS)
+    rows.append(("每次帶密碼", f"{PIN_OPERATIONS:,}",
+                 f"{seconds / PIN_OPERATIONS * 1e6:,.1f}",
+                 f"{PIN_OPERATIONS / seconds:,.0f}"))
+    
+    session, seconds = timed(account.open_session, "1234")
+    rows.append(("open_session（驗證一次密碼）", 1, f"{seconds * 1e6:,.1f}", "-"))
+    
+    _, seconds = timed(deposit_withdraw, account, session, count)
+    rows.append(("以工作階段操作", f"{count:,}", f"{seconds / count * 1e6:,.1f}",
+                 f"{count / seconds:,.0f}"))
+    
+    print_table(f"PBKDF2 迭代次數：{account.PIN_ITERATIONS:,}",
+                ("方式", "操作次數", "µs/次", "次/秒"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
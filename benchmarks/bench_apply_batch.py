@@ -0,0 +1,63 @@
+"""
+批次交易：逐筆 deposit / withdraw 與 apply_batch 一次驗證、一次入帳的比較
+
+執行：python -m benchmarks.bench_apply_batch [交易筆數]
+"""
+
+import random
+import sys
+
+from benchmarks.common import load_definitions, print_table, silenced, timed
+
+encapsulation = load_definitions("02_encapsulation")
+
+
+def signed_amounts(count: int):
+    """存款略多於提款，整批不會透支"""
+    rng = random.Random(2024)
+    return [rng.randint(1, 500) if i % 5 < 3 else -rng.randint(1, 500)
+            for i in range(count)]
+
+
+def new_account():
+    with silenced():
+        return encapsulation.BankAccount("量測", 1_000)
+
+
+def one_by_one(account, amounts):
+    with silenced():
+        for amount in amounts:
+            if amount > 0:
+                account.deposit(amount)
+            else:
+                account.withdraw(-amount)
+    return account.balance
+
+
+def run(count: int):
+    amounts = signed_amounts(count)
+    rows = []
+    
+    account = new_account()
+    balance, seconds = timed(one_by_one, account, amounts)
+    rows.append(("逐筆（輸出導向 /dev/null）", f"{seconds:.3f}",
+                 f"{seconds / count * 1e9:.0f}", balance))
+    
+    account = new_account()
+    summary, seconds = timed(account.apply_batch, amounts)
+    rows.append(("apply_batch（整批入帳）", f"{seconds:.3f}",
+                 f"{seconds / count * 1e9:.0f}", summary.balance))
+    
+    # 最後一筆透支：整批驗證後不入帳
+    failing = amounts + [-(summary.balance + 1_001)]
+    account = new_account()
+    summary, seconds = timed(account.apply_batch, failing)
+    rows.append((f"apply_batch（第 {summary.failed_index + 1:,} 筆失敗）",
+                 f"{seconds:.3f}", f"{seconds / count * 1e9:.0f}",
+                 summary.balance))
+    
+    print_table(f"交易筆數：{count:,}", ("方式", "秒", "ns/筆", "最後餘額"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,45 @@
+"""
+非同步排程：模擬延遲的餵食器下，不同並行數量的每日餵食吞吐量
+
+執行：python -m benchmarks.bench_async_routines [動物數量] [延遲秒數]
+"""
+
+import asyncio
+import sys
+
+from benchmarks.common import load_example, print_table, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+CONCURRENCY = (1, 8, 32, 128, 512)
+
+
+def build_zoo(count: int):
+    store = zoo_system.ColumnarAnimalStore()
+    for i in range(count):
+        store.append_row(zoo_system.Elephant, f"大象{i}", "大象", i % 40,
+                         5000.0, extras={"fur_color": "灰色",
+                                         "tusk_length": 1.5})
+    return zoo_system.Zoo("量測", store=store, sink=zoo_system.NullSink())
+
+
+def run(count: int, latency: float):
+    zoo = build_zoo(count)
+    expected = [zoo[i].animal_id for i in range(count)]
+    rows = []
+    baseline = None
+    for concurrency in CONCURRENCY:
+        device = zoo_system.SimulatedDevice(latency)
+        results, seconds = timed(asyncio.run, zoo.daily_feeding_async(
+            device, concurrency=concurrency))
+        baseline = baseline or seconds
+        rows.append((concurrency, f"{seconds:.3f}", f"{count / seconds:,.0f}",
+                     f"{baseline / seconds:.1f}x",
+                     "是" if results == expected else "否"))
+    print_table(f"每日餵食，動物數量：{count:,}，設備延遲：{latency * 1000:.0f} ms",
+                ("並行數", "秒", "隻/秒", "加速", "結果依序"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.01)
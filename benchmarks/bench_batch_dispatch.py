@@ -0,0 +1,69 @@
+"""
+批次分派：逐一呼叫 interact_with_animal / make_it_quack 與依類別分組的批次版本比較
+
+執行：python -m benchmarks.bench_batch_dispatch [物件數量]
+"""
+
+import sys
+
+from benchmarks.common import load_definitions, print_table, silenced, timed
+
+polymorphism = load_definitions("04_polymorphism")
+
+
+def build_animals(count: int):
+    kinds = [polymorphism.Dog, polymorphism.Cat, polymorphism.Bird,
+             polymorphism.Fish]
+    return [kinds[i % len(kinds)](f"動物{i}") for i in range(count)]
+
+
+def build_ducks(count: int):
+    kinds = [polymorphism.Duck, polymorphism.Person, polymorphism.Robot]
+    return [kinds[i % len(kinds)]() for i in range(count)]
+
+
+def each(function, objects):
+    for obj in objects:
+        function(obj)
+
+
+def call_each(objects, first: str, second: str):
+    """逐一查找並呼叫，結果同樣整理成兩欄"""
+    firsts = []
+    seconds = []
+    for obj in objects:
+        firsts.append(getattr(obj, first)())
+        seconds.append(getattr(obj, second)())
+    return firsts, seconds
+
+
+def run(count: int):
+    rows = []
+    for label, objects, single, batch, protocol, methods in [
+        ("interact_with_animal", build_animals(count),
+         polymorphism.interact_with_animal,
+         polymorphism.interact_with_animals,
+         polymorphism.ANIMAL_PROTOCOL, ("speak", "move")),
+        ("make_it_quack", build_ducks(count), polymorphism.make_it_quack,
+         polymorphism.make_them_quack, polymorphism.DUCK_PROTOCOL,
+         ("quack", "swim")),
+    ]:
+        with silenced():
+            _, single_seconds = timed(each, single, objects)
+            _, batch_seconds = timed(batch, objects)
+            _, ordered_seconds = timed(batch, objects, keep_order=True)
+        rows.append((f"{label}（含輸出）", f"{single_seconds:.3f}",
+                     f"{batch_seconds:.3f}", f"{ordered_seconds:.3f}"))
+        
+        _, single_seconds = timed(call_each, objects, *methods)
+        _, batch_seconds = timed(protocol.dispatch, objects)
+        _, ordered_seconds = timed(protocol.dispatch, objects, keep_order=True)
+        rows.append((f"{label}（只呼叫）", f"{single_seconds:.3f}",
+                     f"{batch_seconds:.3f}", f"{ordered_seconds:.3f}"))
+    
+    print_table(f"物件數量：{count:,}",
+                ("操作", "逐一 (秒)", "批次 (秒)", "批次保序 (秒)"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
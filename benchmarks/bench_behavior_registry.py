@@ -0,0 +1,73 @@
+"""
+特殊行為分派：isinstance 判斷鏈 vs 類別註冊表
+物種數量增加時，比較每隻動物的平均分派成本
+
+執行：python -m benchmarks.bench_behavior_registry [動物數量]
+"""
+
+import sys
+
+from benchmarks.common import load_example, print_table, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+SPECIES_COUNTS = (4, 16, 64, 256, 512)
+
+
+def make_species(count: int):
+    """動態建立 count 個 Mammal 子類別，模擬物種持續增加"""
+    return [type(f"物種{k}", (zoo_system.Mammal,), {}) for k in range(count)]
+
+
+def make_animals(classes, count: int):
+    animals = []
+    for i in range(count):
+        animal_class = classes[i % len(classes)]
+        animal = animal_class.__new__(animal_class)  # 不需要完整建構
+        animals.append(animal)
+    return animals
+
+
+def dispatch_chain(animals, classes, behavior):
+    for animal in animals:
+        for animal_class in classes:  # 相當於 if/elif isinstance(...) 判斷鏈
+            if isinstance(animal, animal_class):
+                behavior(animal)
+                break
+
+
+def dispatch_registry(animals, registry):
+    lookup = registry.lookup
+    for animal in animals:
+        found = lookup(type(animal))
+        if found is not None:
+            found(animal)
+
+
+def run(count: int):
+    calls = []
+
+    def behavior(animal):
+        calls.append(animal)
+
+    rows = []
+    for species_count in SPECIES_COUNTS:
+        classes = make_species(species_count)
+        registry = zoo_system.BehaviorRegistry()
+        for animal_class in classes:
+            registry.register(animal_class, behavior)
+        animals = make_animals(classes, count)
+
+        _, chain_seconds = timed(dispatch_chain, animals, classes, behavior)
+        _, registry_seconds = timed(dispatch_registry, animals, registry)
+        calls.clear()
+        rows.append((species_count,
+                     f"{chain_seconds / count * 1e9:.0f}",
+                     f"{registry_seconds / count * 1e9:.0f}"))
+
+    print_table(f"每隻動物的分派成本（ns），動物數量：{count:,}",
+                ("物種數", "isinstance 鏈", "註冊表"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,74 @@
+"""
+批量匯入：逐一 add_animal vs add_animals(read_animals_csv(...))
+
+執行：python -m benchmarks.bench_bulk_ingest [動物數量]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+
+from benchmarks.common import (load_example, print_table, silenced, timed,
+                               traced_memory)
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+COLUMNS = ("class", "name", "age", "weight", "fur_color", "pride_size",
+           "wingspan", "vocabulary_size")
+
+
+def write_census(path: str, count: int):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(COLUMNS)
+        for i in range(count):
+            if i % 2:
+                writer.writerow(("Lion", f"獅子{i}", i % 20, 190.0, "金色", 3,
+                                 "", ""))
+            else:
+                writer.writerow(("Parrot", f"鸚鵡{i}", i % 40, 0.5, "", "",
+                                 0.6, 50))
+
+
+def one_by_one(path: str):
+    """每列都建立物件並 add_animal，兩者都逐一輸出"""
+    fields = {"age": int, "weight": float, "pride_size": int,
+              "wingspan": float, "vocabulary_size": int}
+    with silenced():
+        zoo = zoo_system.Zoo("量測", store=zoo_system.ColumnarAnimalStore())
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                animal_class = getattr(zoo_system, row.pop("class"))
+                kwargs = {name: fields.get(name, str)(value)
+                          for name, value in row.items() if value}
+                zoo.add_animal(animal_class(**kwargs))
+    return zoo
+
+
+def bulk(path: str):
+    with silenced():
+        zoo = zoo_system.Zoo("量測", store=zoo_system.ColumnarAnimalStore())
+        zoo.add_animals(zoo_system.read_animals_csv(path))
+    return zoo
+
+
+def run(count: int):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "census.csv")
+        write_census(path, count)
+        rows = []
+        for label, loader in (("逐一 add_animal", one_by_one),
+                              ("add_animals + read_animals_csv", bulk)):
+            zoo, seconds = timed(loader, path)
+            assert len(zoo) == count
+            del zoo
+            _, retained = traced_memory(loader, path)
+            rows.append((label, f"{seconds:.3f}", f"{count / seconds:,.0f}",
+                         f"{retained / count:.0f}"))
+    print_table(f"匯入 CSV（欄式儲存），動物數量：{count:,}",
+                ("方式", "秒", "隻/秒", "bytes/隻"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
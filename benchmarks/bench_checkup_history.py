@@ -0,0 +1,70 @@
+"""
+健康檢查紀錄：以排序索引查詢逾期 / 特定狀態的動物 vs 全部掃描
+
+執行：python -m benchmarks.bench_checkup_history [動物數量]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import load_example, print_table, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+STATUSES = ("健康", "輕微感冒", "需要觀察")
+
+
+def build_zoo(count: int, rounds: int):
+    """每一輪隨機檢查一成的動物，檢查時間逐輪往後"""
+    store = zoo_system.ColumnarAnimalStore()
+    for i in range(count):
+        store.append_row(zoo_system.Parrot, f"鸚鵡{i}", "鸚鵡", i % 40, 0.5,
+                         extras={"wingspan": 0.6, "vocabulary_size": 50})
+    zoo = zoo_system.Zoo("量測", store=store, sink=zoo_system.NullSink(),
+                         history_size=8)
+    rng = random.Random(2024)
+    start = datetime(2026, 1, 1)
+    for day in range(rounds):
+        when = start + timedelta(days=day)
+        for index in rng.sample(range(count), count // 10):
+            zoo.health_checkup(zoo[index], rng.choice(STATUSES), when)
+    return zoo, start
+
+
+def scan_overdue(zoo, since):
+    return [animal for animal in zoo
+            if animal.last_checkup is None or animal.last_checkup < since]
+
+
+def scan_status(zoo, status, since):
+    return [animal for animal in zoo if animal.health_status == status
+            and animal.last_checkup is not None and animal.last_checkup < since]
+
+
+def run(count: int):
+    rounds = 30
+    zoo, start = build_zoo(count, rounds)
+    rows = []
+    for day in (1, 10, rounds):
+        since = start + timedelta(days=day)
+        indexed, indexed_seconds = timed(zoo.overdue_checkups, since)
+        scanned, scan_seconds = timed(scan_overdue, zoo, since)
+        assert len(indexed) == len(scanned)
+        rows.append((f"逾期（{day} 天前）", len(indexed),
+                     f"{indexed_seconds * 1000:.1f}",
+                     f"{scan_seconds * 1000:.1f}"))
+        
+        indexed, indexed_seconds = timed(zoo.animals_with_status, "需要觀察",
+                                         since)
+        scanned, scan_seconds = timed(scan_status, zoo, "需要觀察", since)
+        assert len(indexed) == len(scanned)
+        rows.append((f"需要觀察（{day} 天前）", len(indexed),
+                     f"{indexed_seconds * 1000:.1f}",
+                     f"{scan_seconds * 1000:.1f}"))
+    print_table(f"動物數量：{count:,}，檢查 {rounds} 輪",
+                ("查詢", "結果數", "索引 (ms)", "全部掃描 (ms)"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
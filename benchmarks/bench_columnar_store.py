@@ -0,0 +1,89 @@
+"""
+欄式儲存 vs 物件列表：記憶體與吞吐量比較
+
+執行：python -m benchmarks.bench_columnar_store [動物數量]
+"""
+
+import random
+import sys
+
+from benchmarks.common import (load_example, print_table, silenced, timed,
+                               traced_memory)
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+# (類別, 物種, 建構器的子類別參數)
+TEMPLATES = [
+    (zoo_system.Lion, "獅子", {"fur_color": "金色", "pride_size": 3}),
+    (zoo_system.Elephant, "大象", {"fur_color": "灰色", "tusk_length": 1.5}),
+    (zoo_system.Parrot, "鸚鵡", {"wingspan": 0.6, "vocabulary_size": 50}),
+    (zoo_system.Snake, "蛇", {"scale_type": "光滑鱗片", "length": 2.3,
+                              "is_venomous": False}),
+]
+
+
+def build_objects(count: int):
+    animals = []
+    with silenced():
+        for i in range(count):
+            animal_class, _species, extras = TEMPLATES[i % len(TEMPLATES)]
+            animals.append(animal_class(f"動物{i}", i % 30, 10.0 + i % 97,
+                                        **extras))
+    return animals
+
+
+def build_store(count: int):
+    store = zoo_system.ColumnarAnimalStore()
+    for i in range(count):
+        animal_class, species, extras = TEMPLATES[i % len(TEMPLATES)]
+        store.append_row(animal_class, f"動物{i}", species, i % 30,
+                         10.0 + i % 97, extras=extras)
+    return store
+
+
+def total_weight_objects(animals):
+    return sum(animal.weight for animal in animals)
+
+
+def total_weight_store(store):
+    return sum(store.column("weight"))
+
+
+def random_ages(animals, indices):
+    return sum(animals[i].age for i in indices)
+
+
+def all_sounds(animals):
+    return sum(len(animal.make_sound()) for animal in animals)
+
+
+def run(count: int):
+    objects, object_bytes = traced_memory(build_objects, count)
+    store, store_bytes = traced_memory(build_store, count)
+    del objects, store
+
+    objects, object_build = timed(build_objects, count)
+    store, store_build = timed(build_store, count)
+    indices = [random.randrange(count) for _ in range(count)]
+
+    rows = [
+        ("記憶體 (bytes/隻)", f"{object_bytes / count:.0f}",
+         f"{store_bytes / count:.0f}"),
+        ("建立 (秒)", f"{object_build:.3f}", f"{store_build:.3f}"),
+    ]
+    for label, object_case, store_case in [
+        ("總體重掃描 (秒)", (total_weight_objects, objects),
+         (total_weight_store, store)),
+        ("隨機存取 age (秒)", (random_ages, objects, indices),
+         (random_ages, store, indices)),
+        ("逐一 make_sound (秒)", (all_sounds, objects), (all_sounds, store)),
+    ]:
+        _, object_seconds = timed(*object_case)
+        _, store_seconds = timed(*store_case)
+        rows.append((label, f"{object_seconds:.3f}", f"{store_seconds:.3f}"))
+
+    print_table(f"動物數量：{count:,}", ("項目", "物件列表", "欄式儲存"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,106 @@
+"""
+__slots__ 緊湊模式：每個實例的位元組數與屬性存取延遲
+對照組是原本的類別配置：同一份原始碼去掉所有 __slots__ 宣告後另外載入，
+每一層都帶 __dict__（Python 3.11 起實例字典的值內嵌在物件中，差距比舊版小）
+
+執行：python -m benchmarks.bench_compact_animals [實例數量]
+"""
+
+import ast
+import importlib.util
+import sys
+import timeit
+
+from benchmarks.common import (ROOT, load_example, print_table, silenced,
+                               traced_memory)
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+
+class _WithoutSlots(ast.NodeTransformer):
+    """刪除類別本體中的 __slots__ = ... 宣告"""
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
+        node.body = [statement for statement in node.body
+                     if not (isinstance(statement, ast.Assign)
+                             and any(isinstance(target, ast.Name)
+                                     and target.id == "__slots__"
+                                     for target in statement.targets))]
+        node.body = node.body or [ast.Pass()]
+        return self.generic_visit(node)
+
+
+def load_dict_layout():
+    """載入去掉 __slots__ 的案例 05，類別與方法都相同，只有實例配置不同"""
+    name = "05_comprehensive_zoo_system__dict_layout"
+    module = sys.modules.get(name)
+    if module is None:
+        path = ROOT / "05_comprehensive_zoo_system.py"
+        tree = _WithoutSlots().visit(
+            ast.parse(path.read_text(encoding="utf-8"), str(path)))
+        module = importlib.util.module_from_spec(
+            importlib.util.spec_from_loader(name, loader=None))
+        module.__file__ = str(path)
+        sys.modules[name] = module
+        exec(compile(ast.fix_missing_locations(tree), str(path), "exec"),
+             module.__dict__)
+    return module
+
+
+dict_layout = load_dict_layout()
+
+PAIRS = [
+    ("Lion", dict_layout.Lion, zoo_system.Lion,
+     ("金色",), {"pride_size": 3}),
+    ("Parrot", dict_layout.Parrot, zoo_system.Parrot,
+     (0.6,), {"vocabulary_size": 50}),
+    ("Snake", dict_layout.Snake, zoo_system.Snake,
+     ("光滑鱗片",), {"length": 2.3, "is_venomous": True}),
+]
+
+ACCESSES = [
+    ("name（property）", "animal.name"),
+    ("age（property）", "animal.age"),
+    ("age = 5（驗證 setter）", "animal.age = 5"),
+    ("子類別欄位", None),
+]
+
+
+def build(animal_class, args, kwargs, count: int):
+    with silenced():
+        return [animal_class(f"動物{i}", i % 20, 10.0, *args, **kwargs)
+                for i in range(count)]
+
+
+def access_ns(statement: str, animal) -> float:
+    timer = timeit.Timer(statement, globals={"animal": animal})
+    loops, seconds = timer.autorange()
+    return seconds / loops * 1e9
+
+
+def run(count: int):
+    memory_rows = []
+    access_rows = []
+    for label, regular, compact, args, kwargs in PAIRS:
+        _, regular_bytes = traced_memory(build, regular, args, kwargs, count)
+        _, compact_bytes = traced_memory(build, compact, args, kwargs, count)
+        memory_rows.append((label, f"{regular_bytes / count:.0f}",
+                            f"{compact_bytes / count:.0f}"))
+
+        regular_animal = build(regular, args, kwargs, 1)[0]
+        compact_animal = build(compact, args, kwargs, 1)[0]
+        extra_field = next(iter(kwargs))
+        for access, statement in ACCESSES:
+            statement = statement or f"animal.{extra_field}"
+            access_rows.append((f"{label}.{access}",
+                                f"{access_ns(statement, regular_animal):.1f}",
+                                f"{access_ns(statement, compact_animal):.1f}"))
+
+    print_table(f"每個實例的位元組數（含名稱字串），實例數量：{count:,}",
+                ("類別", "原本（__dict__）", "__slots__"), memory_rows)
+    print_table("屬性存取延遲（ns）", ("存取", "原本（__dict__）", "__slots__"),
+                access_rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
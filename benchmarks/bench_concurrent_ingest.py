@@ -0,0 +1,73 @@
+"""
+多執行緒匯入：Zoo(thread_safe=True) 的壓力測試與吞吐量
+每個執行緒同時以 add_animal 與 add_animals 建立動物，
+結束後檢查動物數量、Animal.total_animals、編號唯一與物種索引是否一致
+
+執行：python -m benchmarks.bench_concurrent_ingest [每個執行緒的動物數量]
+"""
+
+import sys
+import threading
+
+from benchmarks.common import load_example, print_table, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def lions(worker: int, count: int):
+    for i in range(count):
+        yield zoo_system.Lion(f"獅子{worker}-{i}", i % 20, 190.0, "金色")
+
+
+def ingest(zoo, worker: int, count: int):
+    half = count // 2
+    # 新執行緒不會繼承呼叫端的接收器，需自行設定
+    with zoo_system.use_sink(zoo_system.NullSink()):
+        for i in range(half):
+            zoo.add_animal(zoo_system.Parrot(f"鸚鵡{worker}-{i}", i % 40,
+                                             0.5, 0.6))
+        zoo.add_animals(lions(worker, count - half), batch_size=500)
+
+
+def run_threads(zoo, threads: int, count: int):
+    workers = [threading.Thread(target=ingest, args=(zoo, worker, count))
+               for worker in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def check(zoo, created: int, expected: int) -> bool:
+    ids = {animal.animal_id for animal in zoo}
+    counts = zoo.get_species_counts()
+    return (len(zoo) == expected and created == expected
+            and len(ids) == expected and sum(counts.values()) == expected
+            and len(zoo.get_animals_by_species("獅子")) == counts["獅子"])
+
+
+def run(count: int):
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 頻繁切換執行緒，讓競爭更容易發生
+    rows = []
+    try:
+        for threads in THREAD_COUNTS:
+            zoo = zoo_system.Zoo("量測", store=zoo_system.ColumnarAnimalStore(),
+                                 sink=zoo_system.NullSink(), thread_safe=True)
+            before = zoo_system.Animal.total_animals
+            _, seconds = timed(run_threads, zoo, threads, count)
+            created = zoo_system.Animal.total_animals - before
+            expected = threads * count
+            rows.append((threads, f"{seconds:.3f}",
+                         f"{expected / seconds:,.0f}",
+                         "是" if check(zoo, created, expected) else "否"))
+    finally:
+        sys.setswitchinterval(previous_interval)
+    print_table(f"多執行緒匯入，每個執行緒 {count:,} 隻",
+                ("執行緒", "秒", "隻/秒", "結果一致"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
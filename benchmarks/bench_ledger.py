@@ -0,0 +1,90 @@
+"""
+交易紀錄：字串列表 vs 型別陣列的 TransactionLedger
+比較每筆的記憶體、新增速度，以及查詢某時間點餘額的成本
+
+執行：python -m benchmarks.bench_ledger [交易筆數]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.common import load_definitions, print_table, timed, traced_memory
+
+encapsulation = load_definitions("02_encapsulation")
+Ledger = encapsulation.TransactionLedger
+
+QUERIES = 20
+
+
+def operations(count: int):
+    rng = random.Random(2024)
+    return [(rng.random() < 0.6, rng.randint(1, 500)) for _ in range(count)]
+
+
+def build_strings(ops):
+    """原本的寫法：每筆交易存成一個字串（另存時間戳記才能依時間查詢）"""
+    history = []
+    timestamps = []
+    for is_deposit, amount in ops:
+        history.append(f"存款: +${amount}" if is_deposit else f"提款: -${amount}")
+        timestamps.append(time.monotonic_ns())
+    return history, timestamps
+
+
+def build_ledger(ops):
+    ledger = Ledger(0)
+    for is_deposit, amount in ops:
+        ledger.record(Ledger.DEPOSIT if is_deposit else Ledger.WITHDRAW, amount)
+    return ledger
+
+
+def replay_balance(history, timestamps, when):
+    """字串只能從頭解析重播"""
+    balance = 0
+    for entry, stamp in zip(history, timestamps):
+        if stamp > when:
+            break
+        sign, amount = entry.split("$")
+        balance += int(amount) if sign.endswith("+") else -int(amount)
+    return balance
+
+
+def ledger_balances(ledger, moments):
+    return [ledger.balance_at(when) for when in moments]
+
+
+def string_balances(strings, moments):
+    history, timestamps = strings
+    return [replay_balance(history, timestamps, when) for when in moments]
+
+
+def run(count: int):
+    ops = operations(count)
+    strings, string_bytes = traced_memory(build_strings, ops)
+    ledger, ledger_bytes = traced_memory(build_ledger, ops)
+    del strings, ledger
+    
+    strings, string_build = timed(build_strings, ops)
+    ledger, ledger_build = timed(build_ledger, ops)
+    rng = random.Random(7)
+    moments = [ledger.timestamps[rng.randrange(count)] for _ in range(QUERIES)]
+    _, string_query = timed(string_balances,
+                            (strings[0], ledger.timestamps), moments)
+    _, ledger_query = timed(ledger_balances, ledger, moments)
+    _, formatting = timed(ledger.format_entries)
+    
+    rows = [
+        ("記憶體 (bytes/筆)", f"{string_bytes / count:.1f}",
+         f"{ledger_bytes / count:.1f}"),
+        ("新增 (秒)", f"{string_build:.3f}", f"{ledger_build:.3f}"),
+        (f"時間點餘額 × {QUERIES} (秒)", f"{string_query:.3f}",
+         f"{ledger_query:.5f}"),
+        ("全部轉成文字 (秒)", "-", f"{formatting:.3f}"),
+    ]
+    print_table(f"交易筆數：{count:,}", ("項目", "字串列表", "TransactionLedger"),
+                rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,45 @@
+"""
+大量繁殖：一次建立整窩後代的列表 vs Mammal.breed() 的惰性 Litter
+Litter 的峰值包含在族譜登記整窩的成本（一窩只占一段，不隨數量增加）
+
+執行：python -m benchmarks.bench_litter [最大指數，預設 6]
+"""
+
+import sys
+
+from benchmarks.common import load_definitions, print_table, timed, traced_peak
+
+polymorphism = load_definitions("04_polymorphism")
+Mammal = polymorphism.Mammal
+
+
+def eager_total_age(first, second, size: int):
+    """原本 __mul__ 的寫法：先建好整個列表再使用"""
+    offspring = [Mammal(f"{first.name}{second.name}_{i + 1}",
+                        max(first.age, second.age)) for i in range(size)]
+    return sum(child.age for child in offspring)
+
+
+def lazy_total_age(first, second, size: int):
+    return sum(child.age for child in first.breed(second, size))
+
+
+def run(max_exponent: int):
+    first, second = Mammal("Max", 5), Mammal("Pumpkin", 8)
+    rows = []
+    for exponent in range(3, max_exponent + 1):
+        size = 10 ** exponent
+        _, eager_peak = traced_peak(eager_total_age, first, second, size)
+        _, lazy_peak = traced_peak(lazy_total_age, first, second, size)
+        _, eager_seconds = timed(eager_total_age, first, second, size)
+        _, lazy_seconds = timed(lazy_total_age, first, second, size)
+        rows.append((f"{size:,}", f"{eager_peak / 1024:,.0f}",
+                     f"{lazy_peak / 1024:,.0f}", f"{eager_seconds:.3f}",
+                     f"{lazy_seconds:.3f}"))
+    print_table("走訪整窩後代（計算年齡總和）",
+                ("一窩數量", "列表峰值 KiB", "Litter 峰值 KiB", "列表秒",
+                 "Litter 秒"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
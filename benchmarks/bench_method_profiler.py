@@ -0,0 +1,48 @@
+"""
+多型呼叫量測：停用 / 啟用時的額外成本，以及各覆寫方法的耗時報表
+
+執行：python -m benchmarks.bench_method_profiler [動物數量] [摺疊堆疊輸出檔]
+"""
+
+import sys
+from typing import Optional
+
+from benchmarks.bench_columnar_store import build_objects
+from benchmarks.common import load_example, print_table, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+
+def daily_routine(zoo):
+    zoo.daily_feeding()
+    zoo.morning_activities()
+    zoo.show_special_behaviors()
+
+
+def run(count: int, collapsed_path: Optional[str] = None):
+    zoo = zoo_system.Zoo("量測", sink=zoo_system.NullSink())
+    with zoo_system.use_sink(zoo_system.NullSink()):
+        zoo.add_animals(build_objects(count))
+    
+    profiler = zoo_system.MethodProfiler()
+    daily_routine(zoo)  # 暖身
+    _, before = timed(daily_routine, zoo)
+    with profiler:
+        _, enabled = timed(daily_routine, zoo)
+    _, after = timed(daily_routine, zoo)
+    print_table(f"每日例行工作，動物數量：{count:,}", ("量測狀態", "秒"), [
+        ("未啟用", f"{before:.3f}"),
+        ("啟用中", f"{enabled:.3f}"),
+        ("停用後", f"{after:.3f}"),
+    ])
+    
+    print("\n依自身時間排序：")
+    print(profiler.format_report("self_wall", limit=10))
+    if collapsed_path:
+        profiler.write_collapsed(collapsed_path)
+        print(f"\n摺疊堆疊已寫入 {collapsed_path}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,75 @@
+"""
+平行健康檢查：不同工作行程數量的耗時與結果一致性，
+以及主行程寫回結果（不會平行化的序列尾段）所佔的時間
+
+執行：python -m benchmarks.bench_parallel_checkup [動物數量]
+"""
+
+import os
+import sys
+
+from benchmarks.common import load_example, print_table, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+
+def build_zoo(count: int):
+    store = zoo_system.ColumnarAnimalStore()
+    for i in range(count):
+        store.append_row(zoo_system.Snake, f"蛇{i}", "蛇", i % 15, 2.5,
+                         extras={"scale_type": "光滑鱗片", "length": 2.3,
+                                 "is_venomous": False})
+    return zoo_system.Zoo("量測", store=store, sink=zoo_system.NullSink())
+
+
+def build_object_zoo(count: int):
+    zoo = zoo_system.Zoo("量測", sink=zoo_system.NullSink())
+    zoo.add_animals(zoo_system.Snake(f"蛇{i}", i % 15, 2.5, "光滑鱗片",
+                                     length=2.3, is_venomous=False)
+                    for i in range(count))
+    return zoo
+
+
+def draw_all(count: int):
+    """只做抽樣（可分散到工作行程的部分），不寫回"""
+    size = zoo_system.CHECKUP_SHARD_SIZE
+    statuses = len(zoo_system.CHECKUP_STATUSES)
+    for shard, start in enumerate(range(0, count, size)):
+        zoo_system._draw_checkup_shard(2024, shard,
+                                       min(size, count - start), statuses)
+
+
+def serial_tail(count: int):
+    """單一行程下，總耗時扣掉抽樣即為主行程寫回的時間"""
+    _, draw_seconds = timed(draw_all, count)
+    rows = []
+    for label, zoo in (("欄式儲存", build_zoo(count)),
+                       ("動物物件", build_object_zoo(count))):
+        _, total = timed(zoo.health_checkup_all, workers=1, seed=2024)
+        write_back = max(total - draw_seconds, 0.0)
+        rows.append((label, f"{draw_seconds:.3f}", f"{write_back:.3f}",
+                     f"{write_back / total:.0%}"))
+    print_table(f"寫回結果的序列尾段，動物數量：{count:,}",
+                ("儲存方式", "抽樣秒", "寫回秒", "寫回佔比"), rows)
+
+
+def run(count: int):
+    zoo = build_zoo(count)
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    rows = []
+    baseline = None
+    expected = None
+    for workers in worker_counts:
+        _, seconds = timed(zoo.health_checkup_all, workers=workers, seed=2024)
+        statuses = [zoo[i].health_status for i in range(0, count, 9973)]
+        if expected is None:
+            expected, baseline = statuses, seconds
+        rows.append((workers, f"{seconds:.3f}", f"{baseline / seconds:.2f}x",
+                     "是" if statuses == expected else "否"))
+    print_table(f"健康檢查，動物數量：{count:,}（CPU：{os.cpu_count()}）",
+                ("行程數", "秒", "加速", "結果一致"), rows)
+    serial_tail(count)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
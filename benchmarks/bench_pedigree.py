@@ -0,0 +1,61 @@
+"""
+族譜查詢：百萬個體的族譜中，祖先集合、近交係數與親緣係數的第一次 / 第二次成本
+祖先集合與親緣係數每次都沿父母往上走；近交係數每段（一窩）只算一次並保存
+模擬動物園的繁殖計畫：每代 1,000 隻種畜配成 500 對，每對產下一大窩，
+每窩前兩隻成為下一代的種畜
+
+執行：python -m benchmarks.bench_pedigree [總個體數]
+"""
+
+import random
+import sys
+
+from benchmarks.common import load_definitions, print_table, timed
+
+polymorphism = load_definitions("04_polymorphism")
+
+BREEDERS = 1_000
+GENERATIONS = 10
+QUERIES = 10_000
+
+
+def build(total: int, rng: random.Random):
+    pedigree = polymorphism.Pedigree()
+    breeders = [pedigree.add() for _ in range(BREEDERS)]
+    litter_size = max(2, total // (GENERATIONS * BREEDERS // 2))
+    for _ in range(GENERATIONS):
+        rng.shuffle(breeders)
+        next_breeders = []
+        for pair in range(0, BREEDERS, 2):
+            first = pedigree.add_many(breeders[pair], breeders[pair + 1],
+                                      litter_size)
+            next_breeders += [first, first + 1]
+        breeders = next_breeders
+    return pedigree
+
+
+def query_all(query, nodes):
+    for node in nodes:
+        query(node)
+
+
+def run(total: int):
+    rng = random.Random(2024)
+    pedigree, build_seconds = timed(build, total, rng)
+    nodes = [rng.randrange(len(pedigree)) for _ in range(QUERIES)]
+    pairs = [(rng.randrange(len(pedigree)), rng.randrange(len(pedigree)))
+             for _ in range(QUERIES)]
+    rows = [("建立族譜", f"{build_seconds:.3f}", "-")]
+    for label, query, items in (
+            ("祖先集合", pedigree.ancestors, nodes),
+            ("近交係數", pedigree.inbreeding, nodes),
+            ("親緣係數", lambda pair: pedigree.kinship(*pair), pairs)):
+        _, first = timed(query_all, query, items)
+        _, second = timed(query_all, query, items)
+        rows.append((f"{label} × {QUERIES:,}", f"{first:.3f}", f"{second:.3f}"))
+    print_table(f"族譜個體數：{len(pedigree):,}，{GENERATIONS} 代",
+                ("操作", "第一次 (秒)", "第二次 (秒)"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,57 @@
+"""
+報表接收器比較：每日餵食與晨間活動在不同輸出方式下的耗時
+
+執行：python -m benchmarks.bench_report_sinks [動物數量]
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.common import load_example, print_table, silenced, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+
+def build_zoo(count: int, sink):
+    store = zoo_system.ColumnarAnimalStore()
+    for i in range(count):
+        store.append_row(zoo_system.Lion, f"獅子{i}", "獅子", i % 20, 190.0,
+                         extras={"fur_color": "金色", "pride_size": 3})
+    with zoo_system.use_sink(zoo_system.NullSink()):
+        return zoo_system.Zoo("量測", store=store, sink=sink)
+
+
+def daily_routine(zoo):
+    zoo.daily_feeding()
+    zoo.morning_activities()
+
+
+def run(count: int):
+    rows = []
+    with silenced():
+        zoo = build_zoo(count, zoo_system.ConsoleSink())
+        _, seconds = timed(daily_routine, zoo)
+    rows.append(("ConsoleSink → /dev/null", f"{seconds:.3f}"))
+
+    _, seconds = timed(daily_routine, build_zoo(count, zoo_system.NullSink()))
+    rows.append(("NullSink", f"{seconds:.3f}"))
+
+    buffer = zoo_system.BufferSink()
+    _, seconds = timed(daily_routine, build_zoo(count, buffer))
+    rows.append(("BufferSink（不格式化）", f"{seconds:.3f}"))
+    _, seconds = timed(buffer.getvalue)
+    rows.append(("BufferSink.getvalue()", f"{seconds:.3f}"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.txt")
+        with zoo_system.FileSink(path) as sink:
+            _, seconds = timed(daily_routine, build_zoo(count, sink))
+        rows.append(("FileSink", f"{seconds:.3f}"))
+
+    print_table(f"每日餵食 + 晨間活動，動物數量：{count:,}",
+                ("接收器", "秒"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
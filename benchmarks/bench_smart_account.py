@@ -0,0 +1,90 @@
+"""
+智慧帳戶：formatted_balance 快取，以及輪詢所有帳戶 vs ChangeHub 合併通知
+
+執行：python -m benchmarks.bench_smart_account [帳戶數量]
+"""
+
+import random
+import sys
+
+from benchmarks.common import load_definitions, print_table, silenced, timed
+
+encapsulation = load_definitions("02_encapsulation")
+SmartBankAccount = encapsulation.SmartBankAccount
+
+TICKS = 100               # 畫面更新次數
+CHANGED_FRACTION = 0.01   # 每次更新之間有變動的帳戶比例
+UPDATES_PER_CHANGE = 5    # 每個變動帳戶在兩次更新之間被修改的次數
+
+# 未快取的計算：原本每次讀取都重新格式化
+format_uncached = SmartBankAccount.formatted_balance.fget.__wrapped__
+
+
+def read_all(accounts, read, rounds: int):
+    for _ in range(rounds):
+        for account in accounts:
+            read(account)
+
+
+def cached_read(account):
+    return account.formatted_balance
+
+
+def update_some(accounts, rng):
+    changed = rng.sample(accounts, max(1, int(len(accounts) * CHANGED_FRACTION)))
+    with silenced():
+        for account in changed:
+            for _ in range(UPDATES_PER_CHANGE):
+                account.balance = rng.randint(0, 10 ** 7) / 100
+
+
+def poll_ticks(accounts, seed: int):
+    """UI 每次更新都輪詢全部帳戶"""
+    rng = random.Random(seed)
+    screen = {}
+    reading = 0.0
+    for _ in range(TICKS):
+        update_some(accounts, rng)
+        _, seconds = timed(lambda: screen.update(
+            (account, account.formatted_balance) for account in accounts))
+        reading += seconds
+    return reading
+
+
+def hub_ticks(accounts, hub, seed: int):
+    """UI 訂閱 ChangeHub，每次更新只處理有變動的帳戶"""
+    rng = random.Random(seed)
+    screen = {}
+    hub.subscribe(lambda changes: screen.update(
+        (account, account.formatted_balance) for account in changes))
+    reading = 0.0
+    for _ in range(TICKS):
+        update_some(accounts, rng)
+        _, seconds = timed(hub.flush)
+        reading += seconds
+    return reading
+
+
+def run(count: int):
+    accounts = [SmartBankAccount(f"帳戶{i}", i * 1.25) for i in range(count)]
+    rows = []
+    _, uncached = timed(read_all, accounts, format_uncached, 10)
+    _, cached = timed(read_all, accounts, cached_read, 10)
+    rows.append((f"讀取 formatted_balance × {count * 10:,}",
+                 f"{uncached:.3f}", f"{cached:.3f}"))
+    
+    polling = poll_ticks(accounts, seed=1)
+    hub = encapsulation.ChangeHub()
+    watched = [SmartBankAccount(f"帳戶{i}", i * 1.25, hub=hub)
+               for i in range(count)]
+    notified = hub_ticks(watched, hub, seed=1)
+    rows.append((f"{TICKS} 次畫面更新（輪詢 vs ChangeHub）",
+                 f"{polling:.3f}", f"{notified:.3f}"))
+    
+    print_table(f"帳戶數量：{count:,}（每次更新約 {CHANGED_FRACTION:.0%} 帳戶變動 "
+                f"{UPDATES_PER_CHANGE} 次）", ("項目", "原本 (秒)", "改良 (秒)"),
+                rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
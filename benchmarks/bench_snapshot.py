@@ -0,0 +1,56 @@
+"""
+記憶體映射快照：重新開啟大型動物園 vs 逐一呼叫建構器重建
+
+執行：python -m benchmarks.bench_snapshot [動物數量]
+"""
+
+import os
+import sys
+import tempfile
+
+from benchmarks.bench_columnar_store import TEMPLATES, build_store
+from benchmarks.common import load_example, print_table, silenced, timed
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+
+
+def rebuild_with_constructors(count: int):
+    with silenced():
+        zoo = zoo_system.Zoo("量測")
+        for i in range(count):
+            animal_class, _species, extras = TEMPLATES[i % len(TEMPLATES)]
+            zoo.add_animal(animal_class(f"動物{i}", i % 30, 10.0 + i % 97,
+                                        **extras))
+    return zoo
+
+
+def open_and_touch(path: str, lazy: bool):
+    zoo = zoo_system.Zoo.open_snapshot(path, lazy=lazy,
+                                       sink=zoo_system.NullSink())
+    return zoo[len(zoo) // 2].name
+
+
+def run(count: int):
+    with silenced():
+        zoo = zoo_system.Zoo("量測", store=build_store(count),
+                             sink=zoo_system.NullSink())
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "zoo.snap")
+        _, save_seconds = timed(zoo.save_snapshot, path)
+        size = os.path.getsize(path)
+        _, lazy_seconds = timed(open_and_touch, path, True)
+        _, eager_seconds = timed(open_and_touch, path, False)
+        _, rebuild_seconds = timed(rebuild_with_constructors, count)
+    
+    rows = [
+        ("儲存快照", f"{save_seconds:.3f}"),
+        ("開啟快照（mmap）+ 第一次存取", f"{lazy_seconds:.4f}"),
+        ("開啟快照並載入欄式儲存", f"{eager_seconds:.3f}"),
+        ("呼叫建構器重建（輸出導向 /dev/null）", f"{rebuild_seconds:.3f}"),
+    ]
+    print_table(f"動物數量：{count:,}，快照大小：{size / count:.1f} bytes/隻",
+                ("項目", "秒"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
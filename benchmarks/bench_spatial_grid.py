@@ -0,0 +1,70 @@
+"""
+空間索引：SpatialGrid 與兩兩比較在 10^3 ~ 10^6 個點下的查詢成本
+
+執行：python -m benchmarks.bench_spatial_grid [最大指數，預設 6]
+"""
+
+import random
+import sys
+
+from benchmarks.common import load_definitions, print_table, timed
+
+polymorphism = load_definitions("04_polymorphism")
+
+QUERIES = 200
+RADIUS = 25.0          # 密度固定時，每次約找到 20 個點
+BRUTE_FORCE_LIMIT = 100_000
+
+
+def brute_force_within(points, center, radius):
+    limit = radius * radius
+    return [index for index, (x, y) in enumerate(points)
+            if (x - center[0]) ** 2 + (y - center[1]) ** 2 <= limit]
+
+
+def build(points):
+    grid = polymorphism.SpatialGrid(cell_size=10.0)
+    for index, point in enumerate(points):
+        grid.insert(index, point)
+    return grid
+
+
+def run_queries(query, centers):
+    for center in centers:
+        query(center)
+
+
+def run(max_exponent: int):
+    rng = random.Random(2024)
+    rows = []
+    for exponent in range(3, max_exponent + 1):
+        count = 10 ** exponent
+        side = (count * 100) ** 0.5  # 每 100 平方單位一個點
+        points = [(rng.uniform(0, side), rng.uniform(0, side))
+                  for _ in range(count)]
+        centers = [polymorphism.Vector(rng.uniform(0, side),
+                                       rng.uniform(0, side))
+                   for _ in range(QUERIES)]
+        
+        grid, build_seconds = timed(build, points)
+        _, within_seconds = timed(run_queries,
+                                  lambda c: grid.within(c, RADIUS), centers)
+        _, nearest_seconds = timed(run_queries,
+                                   lambda c: grid.nearest(c, 10), centers)
+        brute = "-"
+        if count <= BRUTE_FORCE_LIMIT:
+            _, brute_seconds = timed(
+                run_queries,
+                lambda c: brute_force_within(points, (c.x, c.y), RADIUS),
+                centers)
+            brute = f"{brute_seconds / QUERIES * 1e6:,.0f}"
+        rows.append((f"{count:,}", f"{build_seconds / count * 1e9:,.0f}",
+                     f"{within_seconds / QUERIES * 1e6:,.0f}",
+                     f"{nearest_seconds / QUERIES * 1e6:,.0f}", brute))
+    print_table(f"每次查詢的平均成本，半徑 {RADIUS}，k = 10",
+                ("點數", "插入 (ns/點)", "半徑查詢 (µs)", "k 近鄰 (µs)",
+                 "兩兩比較 (µs)"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
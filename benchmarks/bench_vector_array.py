@@ -0,0 +1,51 @@
+"""
+批次向量運算：Vector 物件列表 vs VectorArray（需要 NumPy）
+
+執行：python -m benchmarks.bench_vector_array [向量數量]
+"""
+
+import sys
+
+from benchmarks.common import load_definitions, print_table, timed
+
+polymorphism = load_definitions("04_polymorphism")
+Vector = polymorphism.Vector
+VectorArray = polymorphism.VectorArray
+
+
+def run(count: int):
+    if polymorphism.np is None:
+        print("未安裝 NumPy，無法量測 VectorArray")
+        return
+    positions = [Vector(i % 1000, i % 777) for i in range(count)]
+    velocities = [Vector(1, -1) for _ in range(count)]
+    position_array, from_seconds = timed(VectorArray.from_vectors, positions)
+    velocity_array = VectorArray.from_vectors(velocities)
+    _, to_seconds = timed(position_array.to_vectors)
+    
+    rows = []
+    for label, list_case, array_case in [
+        ("位置 + 速度", lambda: [p + v for p, v in zip(positions, velocities)],
+         lambda: position_array + velocity_array),
+        ("位置 - 原點", lambda: [p - Vector(0, 0) for p in positions],
+         lambda: position_array - Vector(0, 0)),
+        ("縮放 * 0.5", lambda: [p * 0.5 for p in positions],
+         lambda: position_array * 0.5),
+        ("== 比較", lambda: [p == Vector(1, 1) for p in positions],
+         lambda: position_array == Vector(1, 1)),
+        ("長度", lambda: [len(p) for p in positions],
+         position_array.lengths),
+    ]:
+        _, list_seconds = timed(list_case)
+        _, array_seconds = timed(array_case)
+        rows.append((label, f"{list_seconds * 1000:.1f}",
+                     f"{array_seconds * 1000:.1f}",
+                     f"{list_seconds / array_seconds:.0f}x"))
+    rows.append(("from_vectors / to_vectors", "-",
+                 f"{from_seconds * 1000:.1f} / {to_seconds * 1000:.1f}", "-"))
+    print_table(f"向量數量：{count:,}",
+                ("運算", "Vector 列表 (ms)", "VectorArray (ms)", "加速"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
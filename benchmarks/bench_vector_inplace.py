@@ -0,0 +1,71 @@
+"""
+Vector 累加迴圈：total = total + v vs total += v（就地運算）
+以計數子類別統計迴圈中建立的 Vector 物件數，並比較 __slots__ 的每個實例大小
+
+執行：python -m benchmarks.bench_vector_inplace [迴圈次數]
+"""
+
+import sys
+
+from benchmarks.common import (load_definitions, print_table, timed,
+                               traced_memory)
+
+polymorphism = load_definitions("04_polymorphism")
+Vector = polymorphism.Vector
+
+
+class CountingVector(Vector):
+    """每建立一個實例就計數一次（運算結果沿用左運算元的型別）"""
+    __slots__ = ()
+    created = 0
+    
+    def __init__(self, x, y):
+        CountingVector.created += 1
+        super().__init__(x, y)
+
+
+class DictVector:
+    """加上 __slots__ 之前的寫法，用來比較記憶體"""
+    
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def accumulate_new(steps, vector_class):
+    total = vector_class(0.0, 0.0)
+    for step in steps:
+        total = total + step
+    return total
+
+
+def accumulate_inplace(steps, vector_class):
+    total = vector_class(0.0, 0.0)
+    for step in steps:
+        total += step
+    return total
+
+
+def run(count: int):
+    steps = [Vector(0.5, -0.25) for _ in range(count)]
+    rows = []
+    for label, accumulate in (("total = total + v", accumulate_new),
+                              ("total += v", accumulate_inplace)):
+        CountingVector.created = 0
+        accumulate(steps, CountingVector)
+        created = CountingVector.created
+        _, seconds = timed(accumulate, steps, Vector)
+        rows.append((label, f"{created:,}", f"{seconds / count * 1e9:.0f}"))
+    print_table(f"累加 {count:,} 個向量", ("寫法", "建立的 Vector", "ns/次"), rows)
+    
+    _, slotted = traced_memory(lambda: [Vector(i, i) for i in range(count)])
+    _, dict_based = traced_memory(
+        lambda: [DictVector(i, i) for i in range(count)])
+    print_table("每個實例的位元組數（含整數座標）", ("類別", "bytes/個"), [
+        ("Vector（__slots__）", f"{slotted / count:.0f}"),
+        ("一般類別（__dict__）", f"{dict_based / count:.0f}"),
+    ])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
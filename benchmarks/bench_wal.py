@@ -0,0 +1,95 @@
+"""
+預寫日誌：同步落盤（group commit）與非同步落盤的吞吐量、落盤延遲，以及快照對復原時間的影響
+同步落盤時「筆/秒」是已落盤並回報成功的交易數；非同步落盤回報成功時資料可能還沒落盤，
+兩者的吞吐量不能直接比較，差距就是當機時可能遺失的保證
+
+執行：python -m benchmarks.bench_wal [交易筆數]
+"""
+
+import sys
+import tempfile
+import threading
+
+from benchmarks.common import load_definitions, print_table, silenced, timed
+
+encapsulation = load_definitions("02_encapsulation")
+WriteAheadLog = encapsulation.WriteAheadLog
+
+# (說明, 執行緒數, WriteAheadLog 參數)
+POLICIES = [
+    ("同步落盤", 1, {}),
+    ("同步落盤", 8, {}),
+    ("同步落盤", 32, {}),
+    ("非同步 group_size=256", 1, {"sync_commit": False, "group_size": 256}),
+    ("非同步 每 5 ms 背景 fsync", 1,
+     {"sync_commit": False, "group_size": 10 ** 9, "flush_interval": 0.005}),
+]
+
+
+def new_account(wal):
+    with silenced():
+        account = encapsulation.SecureBankAccount("量測", "1234", 1_000,
+                                                  thread_safe=True, wal=wal)
+        return account, account.open_session("1234")
+
+
+def deposits(account, session, count: int):
+    for _ in range(count):
+        account.deposit(10, session)
+
+
+def run_threads(account, session, threads: int, count: int):
+    workers = [threading.Thread(target=deposits,
+                                args=(account, session, count // threads))
+               for _ in range(threads)]
+    with silenced():
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+
+def recover(directory):
+    with silenced(), WriteAheadLog(directory) as wal:
+        return encapsulation.SecureBankAccount.recover(wal)
+
+
+def run(count: int):
+    rows = []
+    for label, threads, options in POLICIES:
+        with tempfile.TemporaryDirectory() as directory:
+            wal = WriteAheadLog(directory, snapshot_every=10 ** 9, **options)
+            account, session = new_account(wal)
+            wal.fsync_count = wal.records_written = 0  # 不計開戶時的快照
+            wal.total_latency_ns = wal.max_latency_ns = 0
+            _, seconds = timed(run_threads, account, session, threads, count)
+            unsynced = wal.last_seq - wal.durable_seq  # 回報成功但尚未落盤
+            wal.close()
+            done = count // threads * threads
+            rows.append((label, threads, f"{done / seconds:,.0f}",
+                         f"{wal.fsync_count:,}",
+                         f"{wal.records_written / wal.fsync_count:,.1f}",
+                         f"{wal.total_latency_ns / wal.records_written / 1e6:.3f}",
+                         f"{wal.max_latency_ns / 1e6:.2f}",
+                         f"{unsynced:,}"))
+    print_table(f"存款筆數：{count:,}",
+                ("寫入策略", "執行緒", "筆/秒", "fsync 次數", "每次 fsync 筆數",
+                 "平均落盤延遲 (ms)", "最長落盤延遲 (ms)", "結束時未落盤"), rows)
+    
+    rows = []
+    for snapshot_every in (10 ** 9, count // 10, count // 100):
+        with tempfile.TemporaryDirectory() as directory:
+            with WriteAheadLog(directory, sync_commit=False, group_size=4096,
+                               snapshot_every=max(1, snapshot_every)) as wal:
+                account, session = new_account(wal)
+                with silenced():
+                    deposits(account, session, count)
+            _, seconds = timed(recover, directory)
+        label = ("不寫快照" if snapshot_every >= count
+                 else f"每 {snapshot_every:,} 筆")
+        rows.append((label, f"{seconds:.3f}"))
+    print_table("復原時間（載入快照 + 重播日誌尾段）", ("快照頻率", "秒"), rows)
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,120 @@
+"""
+效能量測共用工具
+以檔案路徑載入案例模組，並遮蔽其示範輸出
+"""
+
+import ast
+import contextlib
+import importlib.util
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@contextlib.contextmanager
+def silenced():
+    """暫時把標準輸出導向 os.devnull"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield
+
+
+def load_example(stem: str):
+    """
+    載入案例模組，例如 load_example("05_comprehensive_zoo_system")
+    模組會登記在 sys.modules，重複載入只執行一次
+    """
+    module = sys.modules.get(stem)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(stem, ROOT / f"{stem}.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[stem] = module
+        try:
+            with silenced():
+                spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[stem]
+            raise
+    return module
+
+
+def _is_definition(node: ast.stmt) -> bool:
+    """import、函式、類別與常數（大寫或底線開頭的名稱）才算定義"""
+    if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef,
+                         ast.AsyncFunctionDef, ast.ClassDef)):
+        return True
+    if isinstance(node, ast.Try):  # 例如 try: import numpy except ImportError
+        return all(_is_definition(child) for child in node.body)
+    if isinstance(node, (ast.Assign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return all(isinstance(target, ast.Name)
+                   and (target.id.isupper() or target.id.startswith("_"))
+                   for target in targets)
+    return False
+
+
+def load_definitions(stem: str):
+    """
+    只載入案例中的定義，略過模組層級的示範程式
+    案例 01~04 在模組層級直接執行示範，用這個函式取得其中的類別；
+    案例 05 的示範位於 main()，直接使用 load_example()
+    """
+    name = f"{stem}__definitions"
+    module = sys.modules.get(name)
+    if module is None:
+        path = ROOT / f"{stem}.py"
+        tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+        tree.body = [node for node in tree.body if _is_definition(node)]
+        module = importlib.util.module_from_spec(
+            importlib.util.spec_from_loader(name, loader=None))
+        module.__file__ = str(path)
+        sys.modules[name] = module
+        try:
+            exec(compile(tree, str(path), "exec"), module.__dict__)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return module
+
+
+def timed(func, *args, **kwargs):
+    """執行一次並回傳 (結果, 秒數)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def traced_memory(func, *args, **kwargs):
+    """執行一次並回傳 (結果, 結果仍佔用的位元組數)"""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        current, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def traced_peak(func, *args, **kwargs):
+    """執行一次並回傳 (結果, 執行期間的最高記憶體用量)"""
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def print_table(title: str, header, rows):
+    """以固定欄寬輸出比較表"""
+    print(f"\n{title}")
+    widths = [max(len(str(cell)) for cell in column)
+              for column in zip(header, *rows)]
+    for row in (header, *rows):
+        print("  " + "  ".join(str(cell).rjust(width)
+                               for cell, width in zip(row, widths)))
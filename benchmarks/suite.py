@@ -0,0 +1,322 @@
+"""
+效能量測套件：各案例熱門操作在不同規模下的耗時，結果輸出為 JSON
+
+執行：python -m benchmarks [--sizes 1000 10000 ...] [--output 檔案]
+      python -m benchmarks --max-exponent 7   # 規模 10^3 ~ 10^7
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional
+
+from benchmarks.common import (load_definitions, load_example, silenced,
+                               timed)
+
+zoo_system = load_example("05_comprehensive_zoo_system")
+procedural_vs_oop = load_definitions("01_procedural_vs_oop")
+encapsulation = load_definitions("02_encapsulation")
+inheritance = load_definitions("03_inheritance")
+polymorphism = load_definitions("04_polymorphism")
+
+
+class Case(NamedTuple):
+    """
+    一項量測：setup(size) 準備狀態（不計時），run(state, size) 執行 size 次操作
+    max_ops 限制實際執行的次數（例如每次數十毫秒的密碼驗證），結果仍以每次操作計
+    """
+    name: str
+    setup: Callable
+    run: Callable
+    max_ops: Optional[int] = None
+
+
+# ---------- 動物園 ----------
+
+def _lions(count: int):
+    with silenced():
+        return [zoo_system.Lion(f"獅子{i}", i % 20, 190.0, "金色")
+                for i in range(count)]
+
+
+def _list_zoo(size: int):
+    """預設的動物物件清單"""
+    with silenced():
+        zoo = zoo_system.Zoo("量測")
+        zoo.add_animals(_lions(size))
+    return zoo
+
+
+def _columnar_zoo(size: int):
+    store = zoo_system.ColumnarAnimalStore()
+    for i in range(size):
+        store.append_row(zoo_system.Lion, f"獅子{i}", "獅子", i % 20, 190.0,
+                         extras={"fur_color": "金色", "pride_size": 3})
+    with silenced():
+        return zoo_system.Zoo("量測", store=store)
+
+
+def _empty_zoo(size: int):
+    with silenced():
+        return zoo_system.Zoo("量測"), _lions(size)
+
+
+def _add_animals(state, size: int):
+    zoo, lions = state
+    with silenced():
+        for lion in lions:
+            zoo.add_animal(lion)
+
+
+def _silenced_call(method_name: str):
+    def run(zoo, size: int):
+        with silenced():
+            getattr(zoo, method_name)()
+    return run
+
+
+# ---------- 過程式 vs OOP ----------
+
+ANIMAL_TYPES = ("lion", "parrot", "shark")
+
+
+def _animal_types(size: int):
+    return ANIMAL_TYPES
+
+
+def _procedural_sound(animal_types, size: int):
+    make_sound = procedural_vs_oop.make_sound
+    for i in range(size):
+        make_sound(animal_types[i % 3])
+
+
+def _oop_animals(size: int):
+    return (procedural_vs_oop.Lion("Simba", 5, "肉類", "金色"),
+            procedural_vs_oop.Parrot("Polly", 2, "種子", "綠色"),
+            procedural_vs_oop.Shark("Jaws", 10, "魚類", "背鰭"))
+
+
+def _oop_sound(animals, size: int):
+    for i in range(size):
+        animals[i % 3].make_sound()
+
+
+def _oop_show_info(animals, size: int):
+    for i in range(size):
+        animals[i % 3].show_info()
+
+
+# ---------- 繼承 ----------
+
+def _service_dog(size: int):
+    with silenced():
+        return inheritance.ServiceDog("Lucy", 4, "拉布拉多", "導盲犬")
+
+
+def _service_dog_info(dog, size: int):
+    for _ in range(size):
+        dog.get_info()
+
+
+def _create_service_dogs(state, size: int):
+    with silenced():
+        for _ in range(size):
+            inheritance.ServiceDog("Lucy", 4, "拉布拉多", "導盲犬")
+
+
+# ---------- 向量 ----------
+
+def _vector_add(vectors, size: int):
+    a, b = vectors
+    for _ in range(size):
+        a + b
+
+
+def _vector_mul(vectors, size: int):
+    a, _b = vectors
+    for _ in range(size):
+        a * 3
+
+
+def _vector_len(vectors, size: int):
+    a, _b = vectors
+    for _ in range(size):
+        len(a)
+
+
+def _vector_array(size: int):
+    """size 個向量的 VectorArray；每項量測只執行一次整批運算"""
+    return polymorphism.VectorArray(range(size), range(size))
+
+
+def _array_add(vectors, size: int):
+    vectors + polymorphism.Vector(1, 2)
+
+
+def _array_mul(vectors, size: int):
+    vectors * 3
+
+
+def _array_lengths(vectors, size: int):
+    vectors.lengths()
+
+
+# ---------- 銀行帳戶 ----------
+
+def _account(size: int):
+    with silenced():
+        return encapsulation.BankAccount("量測", 1_000)
+
+
+def _deposit_withdraw(account, size: int):
+    with silenced():
+        for _ in range(size // 2):
+            account.deposit(10)
+            account.withdraw(10)
+
+
+def _account_and_batch(size: int):
+    """size 筆正負交錯、不會透支的交易；每項量測只執行一次 apply_batch"""
+    return _account(size), [10, -10] * (size // 2)
+
+
+def _apply_batch(state, size: int):
+    account, amounts = state
+    account.apply_batch(amounts)
+
+
+# 密碼以刻意很慢的 PBKDF2 驗證（每次數十毫秒），每次帶密碼的操作最多執行這麼多次
+PIN_OPS = 16
+
+
+def _secure_account(size: int):
+    with silenced():
+        return encapsulation.SecureBankAccount("量測", "1234", 1_000)
+
+
+def _secure_pin_deposit_withdraw(account, size: int):
+    with silenced():
+        for _ in range(size // 2):
+            account.deposit(10, "1234")
+            account.withdraw(10, "1234")
+
+
+def _secure_session(size: int):
+    """驗證一次密碼之後，以工作階段進行的操作"""
+    with silenced():
+        account = encapsulation.SecureBankAccount("量測", "1234", 1_000)
+        return account, account.open_session("1234")
+
+
+def _secure_deposit_withdraw(state, size: int):
+    account, session = state
+    with silenced():
+        for _ in range(size // 2):
+            account.deposit(10, session)
+            account.withdraw(10, session)
+
+
+def _secure_forged_session(state, size: int):
+    account, session = state
+    forged = encapsulation.AccountSession(session.session_id, bytes(32),
+                                          session.expires_at)
+    with silenced():
+        for _ in range(size):
+            account.withdraw(10, forged)
+
+
+CASES = [
+    Case("make_sound（過程式 if-else）", _animal_types, _procedural_sound),
+    Case("Animal.make_sound（多型）", _oop_animals, _oop_sound),
+    Case("Animal.show_info（super）", _oop_animals, _oop_show_info),
+    Case("ServiceDog.get_info（三層 super）", _service_dog, _service_dog_info),
+    Case("ServiceDog()", lambda size: None, _create_service_dogs),
+    Case("zoo.add_animal", _empty_zoo, _add_animals),
+    Case("zoo.daily_feeding", _list_zoo, _silenced_call("daily_feeding")),
+    Case("zoo.daily_feeding（欄式）", _columnar_zoo,
+         _silenced_call("daily_feeding")),
+    Case("zoo.get_statistics", _list_zoo, _silenced_call("get_statistics")),
+    Case("zoo.get_statistics（欄式）", _columnar_zoo,
+         _silenced_call("get_statistics")),
+    Case("Vector.__add__", lambda size: (polymorphism.Vector(3, 4),
+                                         polymorphism.Vector(1, 2)),
+         _vector_add),
+    Case("Vector.__mul__", lambda size: (polymorphism.Vector(3, 4), None),
+         _vector_mul),
+    Case("Vector.__len__", lambda size: (polymorphism.Vector(3, 4), None),
+         _vector_len),
+    *([Case("VectorArray.__add__", _vector_array, _array_add),
+       Case("VectorArray.__mul__", _vector_array, _array_mul),
+       Case("VectorArray.lengths", _vector_array, _array_lengths)]
+      if polymorphism.np is not None else []),
+    Case("BankAccount.deposit+withdraw", _account, _deposit_withdraw),
+    Case("BankAccount.apply_batch", _account_and_batch, _apply_batch),
+    Case("SecureBankAccount.deposit+withdraw（密碼）", _secure_account,
+         _secure_pin_deposit_withdraw, max_ops=PIN_OPS),
+    Case("SecureBankAccount.deposit+withdraw（session）", _secure_session,
+         _secure_deposit_withdraw),
+    Case("SecureBankAccount.withdraw（偽造 session）", _secure_session,
+         _secure_forged_session),
+]
+
+
+def measure(case: Case, size: int, repeat: int) -> dict:
+    """執行 repeat 次，取最短時間"""
+    ops = size if case.max_ops is None else min(size, case.max_ops)
+    best = None
+    for _ in range(repeat):
+        state = case.setup(ops)
+        _, seconds = timed(case.run, state, ops)
+        del state
+        best = seconds if best is None else min(best, seconds)
+    return {"case": case.name, "size": size, "ops": ops, "repeat": repeat,
+            "seconds": best, "ns_per_op": best / ops * 1e9}
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="量測各案例的熱門操作")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help="操作次數，預設為 10^3 到 10^max-exponent")
+    parser.add_argument("--max-exponent", type=int, default=5,
+                        help="未指定 --sizes 時的最大規模（預設 5，即 10^5）")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="每項量測重複次數，取最短時間")
+    parser.add_argument("--cases", nargs="+",
+                        help="只執行名稱包含這些字串的量測")
+    parser.add_argument("--output", help="JSON 輸出檔；省略時寫到標準輸出")
+    args = parser.parse_args(argv)
+    
+    sizes = args.sizes or [10 ** exponent
+                           for exponent in range(3, args.max_exponent + 1)]
+    cases = [case for case in CASES
+             if not args.cases or any(part in case.name for part in args.cases)]
+    results = []
+    for case in cases:
+        for size in sizes:
+            result = measure(case, size, args.repeat)
+            results.append(result)
+            print(f"{case.name:<40} {size:>10,}  {result['ns_per_op']:>10.1f} ns/op",
+                  file=sys.stderr)
+    
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return report